@@ -8,6 +8,7 @@ Contains:
 - AuthContext: Immutable tenant boundary context with subscription state
 - require_auth_context: FastAPI dependency for auth enforcement
 - get_db: Database connection helper
+- get_rw_conn / get_ro_conn: Shared, pre-configured connections for hot endpoints
 - verify_token: JWT token verification
 
 This module MUST NOT import backend.main to avoid circular dependencies.
@@ -16,8 +17,10 @@ This module MUST NOT import backend.main to avoid circular dependencies.
 from __future__ import annotations
 
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path as FsPath
-from typing import Optional, Set
+from typing import Iterator, List, Optional, Set
 
 import jwt
 from fastapi import Depends, HTTPException
@@ -73,16 +76,113 @@ def row_to_dict(row) -> dict:
 # ---------------------------------------------------------
 # DB Helper
 # ---------------------------------------------------------
-def get_db() -> sqlite3.Connection:
+def get_db(check_same_thread: bool = True) -> sqlite3.Connection:
     """
     Create and return a SQLite connection with Row factory.
     Used by auth dependencies and endpoints.
+
+    Pass check_same_thread=False when the connection is handed to a
+    StreamingResponse generator, which Starlette iterates on worker threads.
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(DB_PATH, check_same_thread=check_same_thread, cached_statements=256)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+# ---------------------------------------------------------
+# Shared connections
+# ---------------------------------------------------------
+# Applied once per connection instead of paying open/close (and WAL/SHM
+# file opens) on every request.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    # Read pages through a shared memory map instead of read() syscalls; the
+    # mapping only grows to the file's size and is shared across connections
+    "PRAGMA mmap_size=1073741824",
+)
+
+_rw_conn: Optional[sqlite3.Connection] = None
+_rw_lock = threading.Lock()
+_ro_local = threading.local()
+_ro_conns: List[sqlite3.Connection] = []
+_ro_conns_lock = threading.Lock()
+_ro_generation = 0  # bumped by close_shared_connections() so threads reopen
+
+
+def _open_shared_connection() -> sqlite3.Connection:
+    # Long-lived, so the statement cache actually pays off across requests
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, cached_statements=256)
     conn.row_factory = sqlite3.Row
+    for pragma in SQLITE_PRAGMAS:
+        conn.execute(pragma)
     return conn
 
 
+@contextmanager
+def get_rw_conn() -> Iterator[sqlite3.Connection]:
+    """
+    Yield the process-wide read/write connection.
+
+    The block runs as one explicit BEGIN IMMEDIATE ... COMMIT transaction
+    (a single WAL sync however many statements it issues) and is rolled back
+    if it raises. Writers are serialized by a lock, so transactions never
+    interleave. Do NOT call commit() or close() on the yielded connection.
+    """
+    global _rw_conn
+    with _rw_lock:
+        if _rw_conn is None:
+            _rw_conn = _open_shared_connection()
+            _rw_conn.isolation_level = None  # transactions are managed here
+        conn = _rw_conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            # COMMIT itself can fail (deferred FK violation, SQLITE_BUSY, disk
+            # full) and leave the transaction open - roll back whenever one is
+            # still open, or every later writer fails on BEGIN. A COMMIT that
+            # already ended the transaction needs no ROLLBACK, and issuing one
+            # would replace the original error.
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+
+
+def get_ro_conn() -> sqlite3.Connection:
+    """
+    Return this worker thread's long-lived read connection.
+
+    WAL lets readers run alongside the writer. Do NOT close the returned
+    connection; it is reused by later requests on the same thread.
+    """
+    conn = getattr(_ro_local, "conn", None)
+    if conn is None or getattr(_ro_local, "generation", None) != _ro_generation:
+        conn = _open_shared_connection()
+        with _ro_conns_lock:
+            _ro_conns.append(conn)
+            _ro_local.conn = conn
+            _ro_local.generation = _ro_generation
+    return conn
+
+
+def close_shared_connections() -> None:
+    """Close the shared RW connection and all per-thread RO connections (app shutdown)."""
+    global _rw_conn, _ro_generation
+    with _rw_lock:
+        if _rw_conn is not None:
+            _rw_conn.close()
+            _rw_conn = None
+    with _ro_conns_lock:
+        for conn in _ro_conns:
+            conn.close()
+        _ro_conns.clear()
+        _ro_generation += 1
+
+
 # ---------------------------------------------------------
 # JWT Token Verification
 # ---------------------------------------------------------
@@ -177,8 +277,11 @@ def require_auth_context(
         print("[AUTH] Missing user_id in token payload")
         raise HTTPException(status_code=401, detail="Invalid token payload")
     
-    # Get user and account info from database (backend is source of truth)
-    conn = get_db()
+    # Get user and account info from database (backend is source of truth).
+    # Read fresh on every request - a role change, deactivation or plan change
+    # must apply immediately - but over this thread's long-lived read
+    # connection instead of opening (and PRAGMA-configuring) a new one.
+    conn = get_ro_conn()
     cur = conn.cursor()
     cur.execute(
         "SELECT id, email, role, account_id, is_active FROM users WHERE id = ?",
@@ -187,17 +290,14 @@ def require_auth_context(
     user_row = cur.fetchone()
     
     if not user_row:
-        conn.close()
         print(f"[AUTH] User not found: user_id={user_id}")
         raise HTTPException(status_code=401, detail="User not found")
     
     if not user_row["is_active"]:
-        conn.close()
         print(f"[AUTH] Inactive user attempted access: user_id={user_id}")
         raise HTTPException(status_code=403, detail="Account inactive")
     
     if not user_row["account_id"]:
-        conn.close()
         print(f"[AUTH] User has no account_id: user_id={user_id}")
         raise HTTPException(status_code=403, detail="No account associated")
     
@@ -207,7 +307,6 @@ def require_auth_context(
     
     # Fetch subscription state (source of truth for entitlements)
     subscription = get_subscription(conn, account_id)
-    conn.close()
     
     # Import here to avoid circular dependency
     try:
@@ -127,6 +127,26 @@ ROLE_HIERARCHY = {
 }
 
 
+# Bound once; .get (not a defaultdict) so unknown roles never grow the dict
+_role_level_get = ROLE_HIERARCHY.get
+
+
+def role_level(role: str) -> int:
+    """
+    Get numeric level for a role.
+    
+    Stored roles are already lowercase, so the name is matched exactly first
+    and only casefolded on a miss.
+    
+    Args:
+        role: Role name
+    
+    Returns:
+        Numeric level (higher = more privileged), 0 if unknown
+    """
+    return _role_level_get(role) or (_role_level_get(role.casefold(), 0) if role else 0)
+
+
 def role_at_least(user_role: str, required_role: str) -> bool:
     """
     Check if user_role meets the required role level.
@@ -144,9 +164,7 @@ def role_at_least(user_role: str, required_role: str) -> bool:
         role_at_least("admin", "member") -> True
         role_at_least("member", "admin") -> False
     """
-    user_level = ROLE_HIERARCHY.get(user_role.lower(), 0)
-    required_level = ROLE_HIERARCHY.get(required_role.lower(), 0)
-    return user_level >= required_level
+    return role_level(user_role) >= role_level(required_role)
 
 
 # ============================================================================
@@ -3,8 +3,9 @@
 
 import os
 import sqlite3
+import threading
 from contextlib import contextmanager
-from typing import Generator, Union, Any
+from typing import Dict, FrozenSet, Generator, Tuple, Union, Any
 from urllib.parse import urlparse
 
 try:
@@ -28,6 +29,12 @@ IS_SQLITE = not IS_POSTGRES
 # Global engine (SQLAlchemy) or None for SQLite
 _engine: Union[Engine, None] = None
 
+# SQLite has no handshake to pool, but opening the file (and its WAL/SHM) per
+# step still adds up across migrations and seeding; keep one connection.
+_sqlite_conn: Union[sqlite3.Connection, None] = None
+_sqlite_lock = threading.RLock()
+_sqlite_depth = 0
+
 
 def init_engine() -> None:
     """Initialize SQLAlchemy engine for PostgreSQL if DATABASE_URL is set."""
@@ -67,6 +74,9 @@ def get_db_connection() -> Generator[Union[sqlite3.Connection, Connection], None
     """
     Context manager for database connections.
     Returns sqlite3.Connection for SQLite or sqlalchemy.Connection for Postgres.
+    
+    Postgres connections come from the engine's QueuePool; SQLite reuses one
+    process-wide connection. Either way, do not close the yielded connection.
     """
     if IS_POSTGRES:
         if _engine is None:
@@ -76,15 +86,65 @@ def get_db_connection() -> Generator[Union[sqlite3.Connection, Connection], None
         with _engine.connect() as conn:
             yield conn
     else:
-        # SQLite connection
-        from pathlib import Path as FsPath
-        db_path = str(FsPath(__file__).resolve().parent / DATABASE_PATH)
-        conn = sqlite3.connect(db_path, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-        finally:
-            conn.close()
+        # Shared SQLite connection, handed out to one holder at a time
+        # (re-entrant, so nested helpers on the same thread share it)
+        global _sqlite_conn, _sqlite_depth
+        with _sqlite_lock:
+            if _sqlite_conn is None:
+                from pathlib import Path as FsPath
+                db_path = str(FsPath(__file__).resolve().parent / DATABASE_PATH)
+                _sqlite_conn = sqlite3.connect(db_path, check_same_thread=False)
+                _sqlite_conn.row_factory = sqlite3.Row
+            conn = _sqlite_conn
+            _sqlite_depth += 1
+            try:
+                yield conn
+            finally:
+                _sqlite_depth -= 1
+                # Never leak an uncommitted transaction to the next holder
+                if _sqlite_depth == 0 and conn.in_transaction:
+                    conn.rollback()
+
+
+def close_db_connections() -> None:
+    """Close the shared SQLite connection and dispose the Postgres pool."""
+    global _sqlite_conn
+    with _sqlite_lock:
+        if _sqlite_conn is not None:
+            _sqlite_conn.close()
+            _sqlite_conn = None
+        # Connection ids can be reused once closed
+        _table_columns_cache.clear()
+    if _engine is not None:
+        _engine.dispose()
+
+
+# (id(conn), table) -> column names; shared by migrate.py and migrate_accounts.py
+_table_columns_cache: Dict[Tuple[int, str], FrozenSet[str]] = {}
+
+
+def sqlite_table_columns(conn: sqlite3.Connection, table: str) -> FrozenSet[str]:
+    """
+    Column names of a SQLite table (empty if the table does not exist).
+    
+    Cached per connection so repeated schema checks skip PRAGMA table_info.
+    Call invalidate_table_columns() after any DDL that changes the table.
+    """
+    key = (id(conn), table)
+    columns = _table_columns_cache.get(key)
+    if columns is None:
+        columns = frozenset(row[1] for row in conn.execute(f"PRAGMA table_info({table})"))
+        _table_columns_cache[key] = columns
+    return columns
+
+
+def invalidate_table_columns(table: Union[str, None] = None) -> None:
+    """Drop cached columns for a table (or all tables) after CREATE/ALTER/DROP."""
+    if table is None:
+        _table_columns_cache.clear()
+        return
+    for key in [k for k in _table_columns_cache if k[1] == table]:
+        del _table_columns_cache[key]
 
 
 def execute_query(
@@ -19,10 +19,11 @@ Source of truth: subscriptions table in SQLite
 
 from __future__ import annotations
 
+import functools
 import sqlite3
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, Set
+from typing import FrozenSet, Optional
 
 # Import existing RBAC and authz
 try:
@@ -39,7 +40,11 @@ except ModuleNotFoundError:
 # Subscription Data Model
 # ============================================================================
 
-@dataclass
+# Statuses that grant the subscribed plan; anything else downgrades to free
+ACTIVE_STATUSES = ("active", "trialing")
+
+
+@dataclass(slots=True)
 class Subscription:
     """
     Subscription state from database.
@@ -61,7 +66,7 @@ class Subscription:
     @property
     def is_active(self) -> bool:
         """Check if subscription grants paid features."""
-        return self.status in ("active", "trialing")
+        return self.status in ACTIVE_STATUSES
     
     @property
     def is_past_due(self) -> bool:
@@ -78,6 +83,18 @@ class Subscription:
 # Subscription Queries
 # ============================================================================
 
+_SQL_GET_SUBSCRIPTION = """
+    SELECT 
+        id, account_id, status, plan_name, provider,
+        provider_customer_id, provider_subscription_id,
+        current_period_end, cancel_at_period_end,
+        created_at, updated_at
+    FROM subscriptions
+    WHERE account_id = ?
+    LIMIT 1
+"""
+
+
 def get_subscription(conn: sqlite3.Connection, account_id: int) -> Subscription:
     """
     Fetch subscription for an account.
@@ -86,41 +103,33 @@ def get_subscription(conn: sqlite3.Connection, account_id: int) -> Subscription:
     This ensures every account always has a subscription state.
     
     Args:
-        conn: SQLite connection with row_factory set
+        conn: SQLite connection (any row_factory)
         account_id: Account ID to query
     
     Returns:
         Subscription object (never None)
     """
     cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT 
-            id, account_id, status, plan_name, provider,
-            provider_customer_id, provider_subscription_id,
-            current_period_end, cancel_at_period_end,
-            created_at, updated_at
-        FROM subscriptions
-        WHERE account_id = ?
-        LIMIT 1
-        """,
-        (account_id,)
-    )
-    row = cur.fetchone()
+    cur.row_factory = None  # plain tuple; this runs on every authenticated request
+    row = cur.execute(_SQL_GET_SUBSCRIPTION, (account_id,)).fetchone()
     
     if row:
+        (sub_id, sub_account_id, status, plan_name, provider,
+         provider_customer_id, provider_subscription_id,
+         current_period_end, cancel_at_period_end,
+         created_at, updated_at) = row
         return Subscription(
-            id=row["id"],
-            account_id=row["account_id"],
-            status=row["status"] or "active",
-            plan_name=row["plan_name"] or "free",
-            provider=row["provider"] or "manual",
-            provider_customer_id=row["provider_customer_id"],
-            provider_subscription_id=row["provider_subscription_id"],
-            current_period_end=row["current_period_end"],
-            cancel_at_period_end=bool(row["cancel_at_period_end"]),
-            created_at=row["created_at"],
-            updated_at=row["updated_at"],
+            id=sub_id,
+            account_id=sub_account_id,
+            status=status or "active",
+            plan_name=plan_name or "free",
+            provider=provider or "manual",
+            provider_customer_id=provider_customer_id,
+            provider_subscription_id=provider_subscription_id,
+            current_period_end=current_period_end,
+            cancel_at_period_end=bool(cancel_at_period_end),
+            created_at=created_at,
+            updated_at=updated_at,
         )
     
     # Fallback: return default free subscription
@@ -154,9 +163,14 @@ def get_effective_plan(subscription: Subscription) -> str:
     Returns:
         Effective plan name ("free", "pro", "team", "enterprise")
     """
-    if subscription.is_active:
+    return _effective_plan(subscription.plan_name, subscription.status)
+
+
+def _effective_plan(plan_name: str, status: str) -> str:
+    """The downgrade rule shared by get_effective_plan and _entitlements_for."""
+    if status in ACTIVE_STATUSES:
         # Active or trialing: use subscribed plan
-        return subscription.plan_name
+        return plan_name
     
     # Past due, canceled, or unknown: downgrade to free
     return "free"
@@ -166,7 +180,20 @@ def get_effective_plan(subscription: Subscription) -> str:
 # Entitlements Calculation
 # ============================================================================
 
-def get_entitlements(role: str, subscription: Subscription) -> Set[str]:
+@functools.lru_cache(maxsize=256)
+def _entitlements_for(role: str, plan_name: str, status: str) -> FrozenSet[str]:
+    """
+    Cached capability set for one (role, plan, status) combination.
+    
+    Only a few dozen combinations exist, so every request after the first
+    is a dict lookup; the bound keeps unexpected role/status values read from
+    the database from growing the cache. The result is frozen because it is
+    shared by callers.
+    """
+    return frozenset(rbac_effective_capabilities(_effective_plan(plan_name, status), role))
+
+
+def get_entitlements(role: str, subscription: Subscription) -> FrozenSet[str]:
     """
     Compute effective capabilities from (role + subscription).
     
@@ -180,13 +207,10 @@ def get_entitlements(role: str, subscription: Subscription) -> Set[str]:
         subscription: Subscription object
     
     Returns:
-        Set of capability strings allowed by BOTH role AND subscription
+        Frozen set of capability strings allowed by BOTH role AND subscription
     """
-    # Get effective plan (respects subscription status)
-    effective_plan = get_effective_plan(subscription)
-    
-    # Use existing RBAC logic to intersect plan + role capabilities
-    return rbac_effective_capabilities(effective_plan, role)
+    # Subscription itself is a mutable dataclass, so cache on the fields that matter
+    return _entitlements_for(role, subscription.plan_name, subscription.status)
 
 
 def has_entitlement(role: str, subscription: Subscription, capability: str) -> bool:
@@ -0,0 +1,44 @@
+"""
+backend/json_codec.py
+
+JSON encode/decode helpers shared by the API modules.
+
+Uses orjson when it is installed (it encodes straight to bytes and is several
+times faster than the stdlib on our list payloads) and falls back to the
+stdlib json module otherwise, so callers never branch on which one is active.
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional speedup - stdlib json is always available
+    orjson = None
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize obj to compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str)
+    return json.dumps(obj, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def loads(data: str | bytes) -> Any:
+    """Parse JSON from str or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_compressed(obj: Any) -> bytes:
+    """Serialize obj to zlib-compressed JSON bytes (for BLOB columns)."""
+    return zlib.compress(dumps(obj))
+
+
+def loads_compressed(blob: bytes) -> Any:
+    """Parse a value written by dumps_compressed()."""
+    return loads(zlib.decompress(blob))
@@ -16,15 +16,23 @@
 
 from __future__ import annotations
 
+import functools
 import json
+from contextlib import asynccontextmanager
 import math
+from bisect import bisect_right
+from collections import defaultdict
+from operator import attrgetter
 import sqlite3
 from datetime import datetime, timedelta
 from pathlib import Path as FsPath
 from typing import Any, Dict, List, Optional
+import zlib
 
 from fastapi import FastAPI, HTTPException, Path, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
+from starlette.background import BackgroundTask
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel
 
@@ -61,9 +69,9 @@ try:
         IS_PROD,
     )
     # Import auth context primitives (breaks circular import with dependencies.py)
-    from backend.auth_context import AuthContext, require_auth_context, get_db, security, verify_token
+    from backend.auth_context import AuthContext, require_auth_context, get_db, get_rw_conn, get_ro_conn, close_shared_connections, security, verify_token
     # Phase 2: Tenant Guardrails
-    from backend.tenant import require_account_id, assert_rows_scoped, assert_row_scoped, execute_scoped
+    from backend.tenant import require_account_id, assert_rows_scoped, assert_row_scoped, execute_scoped, execute_scoped_many
     # Phase 3: RBAC + Entitlements
     from backend.authz import (
         require_write_access,
@@ -79,6 +87,8 @@ try:
     from backend.dependencies import require_capability
     # Phase 3: RBAC capability introspection
     from backend.rbac import effective_capabilities
+    from backend.schemas_assets import MAX_BULK_ASSETS
+    from backend import json_codec
 except ModuleNotFoundError:
     from models import (
         User,
@@ -104,9 +114,9 @@ except ModuleNotFoundError:
         IS_PROD,
     )
     # Import auth context primitives (breaks circular import with dependencies.py)
-    from auth_context import AuthContext, require_auth_context, get_db, security, verify_token
+    from auth_context import AuthContext, require_auth_context, get_db, get_rw_conn, get_ro_conn, close_shared_connections, security, verify_token
     # Phase 2: Tenant Guardrails
-    from tenant import require_account_id, assert_rows_scoped, assert_row_scoped, execute_scoped
+    from tenant import require_account_id, assert_rows_scoped, assert_row_scoped, execute_scoped, execute_scoped_many
     # Phase 3: RBAC + Entitlements
     from authz import (
         require_write_access,
@@ -122,6 +132,8 @@ except ModuleNotFoundError:
     from dependencies import require_capability
     # Phase 3: RBAC capability introspection
     from rbac import effective_capabilities
+    from schemas_assets import MAX_BULK_ASSETS
+    import json_codec
 
 # --------------------------------------------------------------------
 # Token Utilities (for refresh tokens)
@@ -210,6 +222,11 @@ DB_PATH = str(FsPath(__file__).resolve().parent / DATABASE_PATH)
 # Note: security, get_db, verify_token, AuthContext, and require_auth_context
 # are now imported from backend.auth_context to break circular import
 
+# Repeated per-request lookups. Reuse the same SQL text so sqlite3's
+# per-connection statement cache hits instead of re-preparing.
+_SQL_GET_ACCOUNT = "SELECT id, plan FROM accounts WHERE id = ?"
+_SQL_GET_USER_ROLE = "SELECT id, role, is_active FROM users WHERE id = ?"
+
 # ---------------------------------------------------------
 # DB helpers
 # ---------------------------------------------------------
@@ -282,6 +299,37 @@ def ensure_saved_properties_columns(conn, cur) -> None:
     print("[MIGRATION] Ensured indexes on saved_properties(account_id, created_at)")
 
 
+# saved_properties columns returned by /property/saved, in SELECT order.
+# tags_json is selected last and decoded into "tags".
+SAVED_PROPERTY_COLUMNS = (
+    "account_id", "user_id", "property_name", "city", "state", "zip_code", "strategy", "investor_profile",
+    "purchase_price", "rehab_budget", "monthly_rent", "hold_years",
+    "estimated_roi", "cashflow_per_month", "cap_rate", "coc_return", "noi", "dscr", "total_investment",
+    "irr_unlevered", "npv_unlevered",
+    "arv", "rehab_months", "holding_months", "holding_costs_monthly", "selling_costs_pct", "flip_profit", "profit_per_month",
+    "deal_grade", "risk_level", "created_at",
+)
+_SAVED_PROPERTY_FIELDS = ("id",) + SAVED_PROPERTY_COLUMNS + ("tags",)
+_SQL_LIST_SAVED_PROPERTIES = (
+    "SELECT rowid, " + ", ".join(SAVED_PROPERTY_COLUMNS) + ", tags_json "
+    "FROM saved_properties WHERE account_id = ? ORDER BY rowid DESC"
+)
+
+# trashed_properties mirrors these saved_properties columns (account_id is
+# already on the trash table) so delete/restore are plain INSERT ... SELECTs.
+TRASH_MIRROR_COLUMNS = tuple(c for c in SAVED_PROPERTY_COLUMNS if c != "account_id") + ("tags_json",)
+_TRASH_MIRROR_SQL = ", ".join(TRASH_MIRROR_COLUMNS)
+_SQL_TRASH_SAVED_PROPERTY = (
+    "INSERT INTO trashed_properties (saved_id, " + _TRASH_MIRROR_SQL + ", deleted_at, account_id) "
+    "SELECT rowid, " + _TRASH_MIRROR_SQL + ", ?, account_id FROM saved_properties WHERE rowid = ? AND account_id = ?"
+)
+_SQL_RESTORE_TRASHED_PROPERTY = (
+    "INSERT INTO saved_properties (" + _TRASH_MIRROR_SQL + ", account_id) "
+    "SELECT " + ", ".join("COALESCE(created_at, ?)" if c == "created_at" else c for c in TRASH_MIRROR_COLUMNS)
+    + ", account_id FROM trashed_properties WHERE trash_id = ? AND account_id = ?"
+)
+
+
 def init_db() -> None:
     conn = get_db()
     cur = conn.cursor()
@@ -365,6 +413,34 @@ def init_db() -> None:
         print(f"[MIGRATION] Backfilled {len(legacy_trash)} trashed_properties rows with account_id")
         conn.commit()
     
+    # Mirror saved_properties columns on the trash table (same declared types)
+    saved_types = {row["name"]: row["type"] for row in cur.execute("PRAGMA table_info(saved_properties)").fetchall()}
+    trash_columns = get_table_columns(conn, "trashed_properties")
+    ensure_column(conn, "trashed_properties", "saved_id", "INTEGER")
+    for column in TRASH_MIRROR_COLUMNS:
+        if column not in trash_columns:
+            ensure_column(conn, "trashed_properties", column, saved_types.get(column) or "TEXT")
+
+    # Move legacy saved_row_json payloads into the mirrored columns (one-time)
+    cur.execute("SELECT trash_id, saved_row_json FROM trashed_properties WHERE saved_row_json IS NOT NULL")
+    legacy_payloads = cur.fetchall()
+    if legacy_payloads:
+        updates = []
+        for row in legacy_payloads:
+            try:
+                saved = json.loads(row["saved_row_json"] or "{}")
+            except Exception:
+                saved = {}
+            updates.append((saved.get("rowid"), *(saved.get(c) for c in TRASH_MIRROR_COLUMNS), row["trash_id"]))
+        cur.executemany(
+            "UPDATE trashed_properties SET saved_id = ?, "
+            + ", ".join(f"{c} = ?" for c in TRASH_MIRROR_COLUMNS)
+            + ", saved_row_json = NULL WHERE trash_id = ?",
+            updates,
+        )
+        conn.commit()
+        print(f"[MIGRATION] Moved {len(updates)} trashed_properties rows off saved_row_json")
+
     # Create indexes for efficient tenant filtering
     cur.execute("CREATE INDEX IF NOT EXISTS idx_trashed_properties_account_id ON trashed_properties(account_id)")
     print("[MIGRATION] Ensured indexes on trashed_properties(account_id)")
@@ -385,6 +461,8 @@ def init_db() -> None:
         """
     )
     
+    ensure_column(conn, "scenarios", "metrics_blob", "BLOB")
+    
     # TASK 2: Multi-tenancy indexes for scenarios
     cur.execute("CREATE INDEX IF NOT EXISTS idx_scenarios_account_property ON scenarios(account_id, property_id)")
     print("[MIGRATION] Ensured indexes on scenarios(account_id, property_id)")
@@ -601,7 +679,17 @@ def init_db() -> None:
         )
         """
     )
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_assets_account_id ON assets(account_id)")
+    # No (account_id, id) composite needed: id is the rowid, so ownership checks
+    # (WHERE id = ? AND account_id = ?) are already a primary-key SEARCH, and every
+    # secondary index implicitly carries the rowid as its trailing column.
+    # /assets/list orders by created_at, /api/assets by (created_at, id) with a
+    # keyset cursor; lets SQLite walk the index instead of sorting. The explicit
+    # id DESC matters: the implicit trailing rowid is ascending. It leads with
+    # account_id, so it also serves plain tenant filters - the old (account_id)
+    # and (account_id, created_at) indexes are left prefixes of it.
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_assets_account_created_id ON assets(account_id, created_at DESC, id DESC)")
+    cur.execute("DROP INDEX IF EXISTS idx_assets_account_id")
+    cur.execute("DROP INDEX IF EXISTS idx_assets_account_created")
     print("[MIGRATION] Ensured assets table and indexes")
 
     # Search properties cache (for MVP: stores property search results)
@@ -625,6 +713,50 @@ def init_db() -> None:
     cur.execute("CREATE INDEX IF NOT EXISTS idx_search_cache_zip ON search_properties_cache(zip_code)")
     print("[MIGRATION] Ensured search_properties_cache table and indexes")
 
+    # Full-text index over address/city for free-text `q` search (a leading-wildcard
+    # LIKE cannot use an index). External-content table kept in sync by triggers.
+    try:
+        cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_properties_fts'")
+        fts_existed = cur.fetchone() is not None
+        cur.execute(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS search_properties_fts USING fts5(
+                address, city, content='search_properties_cache', content_rowid='id'
+            )
+            """
+        )
+        cur.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS search_properties_cache_ai AFTER INSERT ON search_properties_cache BEGIN
+                INSERT INTO search_properties_fts(rowid, address, city) VALUES (new.id, new.address, new.city);
+            END
+            """
+        )
+        cur.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS search_properties_cache_ad AFTER DELETE ON search_properties_cache BEGIN
+                INSERT INTO search_properties_fts(search_properties_fts, rowid, address, city)
+                VALUES ('delete', old.id, old.address, old.city);
+            END
+            """
+        )
+        cur.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS search_properties_cache_au AFTER UPDATE ON search_properties_cache BEGIN
+                INSERT INTO search_properties_fts(search_properties_fts, rowid, address, city)
+                VALUES ('delete', old.id, old.address, old.city);
+                INSERT INTO search_properties_fts(rowid, address, city) VALUES (new.id, new.address, new.city);
+            END
+            """
+        )
+        if not fts_existed:
+            # Index rows cached before the FTS table existed
+            cur.execute("INSERT INTO search_properties_fts(search_properties_fts) VALUES ('rebuild')")
+        print("[MIGRATION] Ensured search_properties_fts index and sync triggers")
+    except sqlite3.OperationalError as e:
+        # SQLite built without FTS5 - search_properties falls back to LIKE
+        print(f"[MIGRATION] Warning: FTS5 unavailable, property search will use LIKE: {e}")
+
     conn.commit()
     conn.close()
 
@@ -632,7 +764,14 @@ def init_db() -> None:
 # ---------------------------------------------------------
 # FastAPI app
 # ---------------------------------------------------------
-app = FastAPI(title="Brinkadata Backend", version="0.1")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Shared RW/RO connections live for the whole process
+    close_shared_connections()
+
+
+app = FastAPI(title="Brinkadata Backend", version="0.1", lifespan=lifespan)
 
 # CORS configuration from config module
 app.add_middleware(
@@ -727,6 +866,54 @@ def require_row_owned(cur: sqlite3.Cursor, table: str, row_id: int, account_id:
     return row
 
 
+# ---------------------------------------------------------
+# Streaming list responses
+# ---------------------------------------------------------
+def stream_json_rows(
+    conn: sqlite3.Connection,
+    cur: sqlite3.Cursor,
+    to_item,
+    account_id: int,
+    label: str,
+    batch_size: int = 500,
+) -> StreamingResponse:
+    """
+    Stream cursor rows as a JSON array without materializing the result set.
+
+    The first batch is fetched and tenant-checked before the response starts,
+    so a scoping violation or a query error still surfaces as a real 500
+    instead of a 200 with a truncated body. Later batches are checked as they
+    are pulled; a failure there aborts the stream. The connection is closed
+    when the stream finishes (or by the background task if it never starts),
+    so it must be opened with get_db(check_same_thread=False).
+    """
+    try:
+        rows = cur.fetchmany(batch_size)
+        # Phase 2: Assert all rows belong to this tenant (before any byte is sent)
+        assert_rows_scoped(rows, account_id, label=label)
+    except BaseException:
+        conn.close()
+        raise
+
+    def _gen(rows):
+        try:
+            yield b"["
+            first = True
+            while rows:
+                chunk = b",".join(json_codec.dumps(to_item(row)) for row in rows)
+                yield chunk if first else b"," + chunk
+                first = False
+                rows = cur.fetchmany(batch_size)
+                # Mid-stream batches: a mismatch aborts the (already started) stream
+                assert_rows_scoped(rows, account_id, label=label)
+            yield b"]"
+        finally:
+            conn.close()
+
+    # close() is idempotent; this covers a response whose body is never iterated
+    return StreamingResponse(_gen(rows), media_type="application/json", background=BackgroundTask(conn.close))
+
+
 # ---------------------------------------------------------
 # Pydantic models
 # ---------------------------------------------------------
@@ -1617,44 +1804,54 @@ def admin_list_accounts():
     return {"accounts": accounts}
 
 
-@app.post("/property/analyze", response_model=AnalyzeResponse)
-def analyze_property(req: AnalyzeRequest, ctx: AuthContext = Depends(require_auth_context)):
-    # TASK 3: Use AuthContext for tenant boundary (never trust request body)
-    account_id = ctx.account_id
-
-    # Phase 3: Get account for authorization checks
-    conn = get_db()
-    cur = conn.cursor()
-    cur.execute("SELECT id, plan FROM accounts WHERE id = ?", (account_id,))
-    account = cur.fetchone()
-    cur.execute("SELECT id, role, is_active FROM users WHERE id = ?", (ctx.user_id,))
-    user = cur.fetchone()
-    conn.close()
-
-    if not account:
-        raise HTTPException(status_code=500, detail="Account not found")
-    if not user:
-        raise HTTPException(status_code=500, detail="User not found")
+# Deal grading: lower ROI bound for D, C, B, A (grades/risks indexed by bisect_right)
+_GRADE_ROI_THRESHOLDS = (0.08, 0.12, 0.18, 0.25)
+_GRADES = ("F", "D", "C", "B", "A")
+_GRADE_RISKS = ("High", "Medium", "Low", "Low", "Low")
+
+
+@functools.lru_cache(maxsize=4096)
+def _analyze_deal(
+    purchase_price: Any,
+    rehab_budget: Any,
+    monthly_rent: Any,
+    hold_years: Any,
+    strategy: Optional[str],
+    vacancy_rate: Any,
+    op_ex_pct_of_rent: Any,
+    op_ex_fixed_monthly: Any,
+    capex_reserves_pct: Any,
+    down_payment_pct: Any,
+    interest_rate_annual: Any,
+    loan_term_years: Any,
+    allow_irr_npv: bool,
+) -> Dict[str, Any]:
+    """
+    Pure deal-analysis kernel behind /property/analyze.
 
-    # TASK 5: Check plan access for IRR/NPV; Free gets basic analysis without IRR/NPV
-    # Phase 3: Use authz module for plan feature checking
-    allow_irr_npv = check_feature_access(account_id, "irr_npv")
+    Takes raw request values (coerced/clamped here) and returns every
+    AnalyzeResponse field. No DB, auth or pydantic work happens here, so
+    batch/portfolio analysis can call it once per deal.
 
+    Memoized on its arguments: the frontend replays identical payloads while
+    users tweak scenarios. Callers must not mutate the returned dict (tags is
+    a tuple for that reason).
+    """
     # Core values
-    purchase_price = max(0.0, safe_float(req.purchase_price))
-    rehab_budget = max(0.0, safe_float(req.rehab_budget))
-    monthly_rent = max(0.0, safe_float(req.monthly_rent))
-    hold_years = max(0.0, safe_float(req.hold_years))
+    purchase_price = max(0.0, safe_float(purchase_price))
+    rehab_budget = max(0.0, safe_float(rehab_budget))
+    monthly_rent = max(0.0, safe_float(monthly_rent))
+    hold_years = max(0.0, safe_float(hold_years))
 
-    strategy = (req.strategy or "rental").lower()
+    strategy = (strategy or "rental").lower()
 
     total_investment = purchase_price + rehab_budget
 
     # Operating assumptions
-    vacancy_rate = min(max(safe_float(req.vacancy_rate), 0.0), 0.5)
-    op_ex_pct = min(max(safe_float(req.op_ex_pct_of_rent), 0.0), 0.95)
-    op_ex_fixed_monthly = max(0.0, safe_float(req.op_ex_fixed_monthly))
-    capex_reserves_pct = min(max(safe_float(req.capex_reserves_pct), 0.0), 0.5)
+    vacancy_rate = min(max(safe_float(vacancy_rate), 0.0), 0.5)
+    op_ex_pct = min(max(safe_float(op_ex_pct_of_rent), 0.0), 0.95)
+    op_ex_fixed_monthly = max(0.0, safe_float(op_ex_fixed_monthly))
+    capex_reserves_pct = min(max(safe_float(capex_reserves_pct), 0.0), 0.5)
 
     gross_rent_annual = monthly_rent * 12.0
     vacancy_loss_annual = gross_rent_annual * vacancy_rate
@@ -1673,10 +1870,10 @@ def analyze_property(req: AnalyzeRequest, ctx: AuthContext = Depends(require_aut
     dscr = None
     break_even_occupancy = None
 
-    if req.down_payment_pct is not None and req.interest_rate_annual is not None and req.loan_term_years is not None:
-        down_payment_pct = min(max(safe_float(req.down_payment_pct), 0.0), 1.0)
-        interest_rate_annual = max(0.0, safe_float(req.interest_rate_annual))
-        loan_term_years = max(1.0, safe_float(req.loan_term_years))
+    if down_payment_pct is not None and interest_rate_annual is not None and loan_term_years is not None:
+        down_payment_pct = min(max(safe_float(down_payment_pct), 0.0), 1.0)
+        interest_rate_annual = max(0.0, safe_float(interest_rate_annual))
+        loan_term_years = max(1.0, safe_float(loan_term_years))
 
         loan_amount = max(0.0, purchase_price * (1.0 - down_payment_pct))
         monthly_rate = (interest_rate_annual / 100.0) / 12.0
@@ -1778,21 +1975,13 @@ def analyze_property(req: AnalyzeRequest, ctx: AuthContext = Depends(require_aut
             flip_profit = arv - total_investment - selling_costs - holding_costs
             profit_per_month = flip_profit / max(1.0, holding_months)
 
-    # Grade & risk (simple)
-    risk_level = "Low"
-    grade = "C"
-    if estimated_roi >= 0.25 and (cashflow_per_month >= 200):
-        grade = "A"
-    elif estimated_roi >= 0.18:
-        grade = "B"
-    elif estimated_roi >= 0.12:
-        grade = "C"
-    elif estimated_roi >= 0.08:
-        grade = "D"
-        risk_level = "Medium"
-    else:
-        grade = "F"
-        risk_level = "High"
+    # Grade & risk (simple): table lookup on the ROI thresholds.
+    # NaN compares false everywhere, so it stays an F.
+    grade_idx = bisect_right(_GRADE_ROI_THRESHOLDS, estimated_roi) if estimated_roi == estimated_roi else 0
+    if grade_idx == 4 and cashflow_per_month < 200:
+        grade_idx = 3  # A also requires $200+/mo cashflow; otherwise B
+    grade = _GRADES[grade_idx]
+    risk_level = _GRADE_RISKS[grade_idx]
 
     tags: List[str] = []
     if cashflow_per_month < 0:
@@ -1805,7 +1994,7 @@ def analyze_property(req: AnalyzeRequest, ctx: AuthContext = Depends(require_aut
 
     summary = f"{grade} grade deal with {risk_level.lower()} risk. Estimated ROI {estimated_roi*100:.1f}%, cashflow ${cashflow_per_month:,.0f}/mo."
 
-    return AnalyzeResponse(
+    return dict(
         deal_grade=grade,
         risk_level=risk_level,
         summary=summary,
@@ -1832,10 +2021,53 @@ def analyze_property(req: AnalyzeRequest, ctx: AuthContext = Depends(require_aut
         selling_costs_pct=selling_costs_pct,
         flip_profit=flip_profit,
         profit_per_month=profit_per_month,
-        tags=tags,
+        tags=tuple(tags),
     )
 
 
+@app.post("/property/analyze", response_model=AnalyzeResponse)
+def analyze_property(req: AnalyzeRequest, ctx: AuthContext = Depends(require_auth_context)):
+    # TASK 3: Use AuthContext for tenant boundary (never trust request body)
+    account_id = ctx.account_id
+
+    # Phase 3: Get account for authorization checks
+    conn = get_db()
+    cur = conn.cursor()
+    cur.execute(_SQL_GET_ACCOUNT, (account_id,))
+    account = cur.fetchone()
+    cur.execute(_SQL_GET_USER_ROLE, (ctx.user_id,))
+    user = cur.fetchone()
+    conn.close()
+
+    if not account:
+        raise HTTPException(status_code=500, detail="Account not found")
+    if not user:
+        raise HTTPException(status_code=500, detail="User not found")
+
+    # TASK 5: Check plan access for IRR/NPV; Free gets basic analysis without IRR/NPV
+    # Phase 3: Use authz module for plan feature checking
+    allow_irr_npv = check_feature_access(account_id, "irr_npv")
+
+    metrics = _analyze_deal(
+        req.purchase_price,
+        req.rehab_budget,
+        req.monthly_rent,
+        req.hold_years,
+        req.strategy,
+        req.vacancy_rate,
+        req.op_ex_pct_of_rent,
+        req.op_ex_fixed_monthly,
+        req.capex_reserves_pct,
+        req.down_payment_pct,
+        req.interest_rate_annual,
+        req.loan_term_years,
+        allow_irr_npv,
+    )
+
+    # Values are computed here, not user input - skip re-validating them
+    return AnalyzeResponse.model_construct(**{**metrics, "tags": list(metrics["tags"])})
+
+
 # ---------------------------------------------------------
 # RBAC Enforcement: /property/save
 # ---------------------------------------------------------
@@ -1883,9 +2115,9 @@ def save_property(payload: Dict[str, Any], ctx: AuthContext = Depends(require_au
     # Phase 3: Get user and account for RBAC
     conn = get_db()
     cur = conn.cursor()
-    cur.execute("SELECT id, plan FROM accounts WHERE id = ?", (account_id,))
+    cur.execute(_SQL_GET_ACCOUNT, (account_id,))
     account = cur.fetchone()
-    cur.execute("SELECT id, role, is_active FROM users WHERE id = ?", (user_id,))
+    cur.execute(_SQL_GET_USER_ROLE, (user_id,))
     user = cur.fetchone()
     
     # Phase 3: Require write access (member role or higher)
@@ -2017,36 +2249,25 @@ def list_saved_properties(ctx: AuthContext = Depends(require_auth_context)):
     # Phase 2: Apply tenant guardrails
     account_id = require_account_id(ctx.account_id)
 
-    conn = get_db()
+    conn = get_db(check_same_thread=False)
     cur = execute_scoped(
         conn,
-        "SELECT rowid, * FROM saved_properties WHERE account_id = ? ORDER BY rowid DESC",
+        _SQL_LIST_SAVED_PROPERTIES,
         (account_id,),
         account_id,
         label="/property/saved"
     )
-    rows = cur.fetchall()
-    conn.close()
-
-    # Phase 2: Assert all rows belong to this tenant
-    assert_rows_scoped(rows, account_id, label="/property/saved")
-
-    results: List[Dict[str, Any]] = []
-    for row in rows:
-        d = dict(row)
-        d["id"] = d.get("rowid")
-        d.pop("rowid", None)
 
+    def to_item(row: sqlite3.Row) -> Dict[str, Any]:
         # tags_json -> list
+        tags_json = row[-1]
         try:
-            d["tags"] = json.loads(d.get("tags_json") or "[]")
+            tags = json_codec.loads(tags_json) if tags_json else []
         except Exception:
-            d["tags"] = []
-        d.pop("tags_json", None)
-
-        results.append(d)
+            tags = []
+        return dict(zip(_SAVED_PROPERTY_FIELDS, (*row[:-1], tags)))
 
-    return results
+    return stream_json_rows(conn, cur, to_item, account_id, label="/property/saved")
 
 
 @app.post("/property/delete", dependencies=[Depends(require_capability(Capability.ASSET_MANAGE))])
@@ -2059,9 +2280,9 @@ def delete_property(payload: Dict[str, Any], ctx: AuthContext = Depends(require_
     # Phase 3: Require write access (member role or higher)
     conn = get_db()
     cur = conn.cursor()
-    cur.execute("SELECT id, plan FROM accounts WHERE id = ?", (account_id,))
+    cur.execute(_SQL_GET_ACCOUNT, (account_id,))
     account = cur.fetchone()
-    cur.execute("SELECT id, role, is_active FROM users WHERE id = ?", (ctx.user_id,))
+    cur.execute(_SQL_GET_USER_ROLE, (ctx.user_id,))
     user = cur.fetchone()
     conn.close()
     
@@ -2072,24 +2293,23 @@ def delete_property(payload: Dict[str, Any], ctx: AuthContext = Depends(require_
         raise HTTPException(status_code=400, detail="Invalid id")
 
     conn = get_db()
-    cur = conn.cursor()
 
-    # TASK 3: Enforce tenant isolation - row must belong to account
-    row = require_row_owned(cur, "saved_properties", row_id, account_id)
-    # Phase 2: Validate the row belongs to this tenant
-    assert_row_scoped(row, account_id, label="/property/delete")
-
-    saved = dict(row)
-    saved["rowid"] = saved.get("rowid") or row_id
-    saved_json = json.dumps(saved)
-
-    cur.execute("DELETE FROM saved_properties WHERE rowid = ? AND account_id = ?", (row_id, account_id))
-    cur.execute(
-        "INSERT INTO trashed_properties (saved_row_json, deleted_at, account_id) VALUES (?, ?, ?)",
-        (saved_json, now_iso(), account_id)
+    # TASK 3: Enforce tenant isolation - copy only succeeds if the row belongs to account
+    cur = execute_scoped(
+        conn,
+        _SQL_TRASH_SAVED_PROPERTY,
+        (now_iso(), row_id, account_id),
+        account_id,
+        label="/property/delete"
     )
+    if cur.rowcount == 0:
+        conn.close()
+        print(f"[SECURITY] Row access denied: table=saved_properties, rowid={row_id}, account_id={account_id}")
+        raise HTTPException(status_code=404, detail="Not found")
     trash_id = cur.lastrowid  # Capture the autoincremented trash_id
 
+    cur.execute("DELETE FROM saved_properties WHERE rowid = ? AND account_id = ?", (row_id, account_id))
+
     conn.commit()
     conn.close()
 
@@ -2102,11 +2322,11 @@ def get_trash(ctx: AuthContext = Depends(require_auth_context)):
     # Phase 2: Apply tenant guardrails
     account_id = require_account_id(ctx.account_id)
 
-    conn = get_db()
+    conn = get_db(check_same_thread=False)
     # TASK 3: Strict WHERE filter - no cross-tenant access
     cur = execute_scoped(
         conn,
-        """SELECT trash_id, saved_row_json, deleted_at, account_id 
+        """SELECT trash_id, property_name, city, state, deal_grade, strategy, deleted_at, account_id 
            FROM trashed_properties 
            WHERE account_id = ?
            ORDER BY trash_id DESC""",
@@ -2114,34 +2334,19 @@ def get_trash(ctx: AuthContext = Depends(require_auth_context)):
         account_id,
         label="/property/trash"
     )
-    rows = cur.fetchall()
-    conn.close()
-
-    # Phase 2: Assert all rows belong to this tenant
-    assert_rows_scoped(rows, account_id, label="/property/trash")
-
-    trash_list: List[Dict[str, Any]] = []
-    for row in rows:
-        base = dict(row)
-        saved_json = base.get("saved_row_json") or "{}"
-        try:
-            saved = json.loads(saved_json)
-        except Exception:
-            saved = {}
 
-        trash_list.append(
-            {
-                "trash_id": base.get("trash_id"),
-                "property_name": saved.get("property_name"),
-                "city": saved.get("city"),
-                "state": saved.get("state"),
-                "deal_grade": saved.get("deal_grade"),
-                "strategy": saved.get("strategy"),
-                "deleted_at": base.get("deleted_at"),
-            }
-        )
+    def to_item(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "trash_id": row[0],
+            "property_name": row[1],
+            "city": row[2],
+            "state": row[3],
+            "deal_grade": row[4],
+            "strategy": row[5],
+            "deleted_at": row[6],
+        }
 
-    return trash_list
+    return stream_json_rows(conn, cur, to_item, account_id, label="/property/trash")
 
 
 @app.post("/property/trash/restore", dependencies=[Depends(require_capability(Capability.ASSET_MANAGE))])
@@ -2154,9 +2359,9 @@ def restore_from_trash(payload: Dict[str, Any], ctx: AuthContext = Depends(requi
     # Phase 3: Require write access (member role or higher)
     conn = get_db()
     cur = conn.cursor()
-    cur.execute("SELECT id, plan FROM accounts WHERE id = ?", (account_id,))
+    cur.execute(_SQL_GET_ACCOUNT, (account_id,))
     account = cur.fetchone()
-    cur.execute("SELECT id, role, is_active FROM users WHERE id = ?", (ctx.user_id,))
+    cur.execute(_SQL_GET_USER_ROLE, (ctx.user_id,))
     user = cur.fetchone()
     conn.close()
     
@@ -2167,84 +2372,21 @@ def restore_from_trash(payload: Dict[str, Any], ctx: AuthContext = Depends(requi
         raise HTTPException(status_code=400, detail="Invalid trash_id")
 
     conn = get_db()
-    cur = conn.cursor()
-    # TASK 3: Enforce account scoping - only return rows owned by this account
-    cur.execute(
-        """SELECT trash_id, saved_row_json, account_id 
-           FROM trashed_properties 
-           WHERE trash_id = ? AND account_id = ?""",
-        (trash_id, account_id)
+    # TASK 3: Enforce account scoping - only rows owned by this account are copied back
+    cur = execute_scoped(
+        conn,
+        _SQL_RESTORE_TRASHED_PROPERTY,
+        (now_iso(), trash_id, account_id),
+        account_id,
+        label="/property/trash/restore"
     )
-    row = cur.fetchone()
-    if row is None:
+    if cur.rowcount == 0:
         conn.close()
         # TASK 3: Return 404 for cross-tenant attempts (don't leak existence)
         raise HTTPException(status_code=404, detail="Not found")
-    
-    # Phase 2: Validate the row belongs to this tenant
-    assert_row_scoped(row, account_id, label="/property/trash/restore")
-
-    saved_json = row["saved_row_json"] or "{}"
-    try:
-        saved = json.loads(saved_json)
-    except Exception:
-        saved = {}
-
-    # TASK 3: Row already validated by SQL WHERE clause (no need to double-check)
-
-    # Reinsert into saved_properties matching actual DB schema (26 columns)
-    cur.execute(
-        """
-        INSERT INTO saved_properties (
-            property_name, city, state, zip_code, deal_grade,
-            estimated_roi, cashflow_per_month, strategy, investor_profile,
-            cap_rate, coc_return, noi, dscr, total_investment,
-            irr_unlevered, npv_unlevered, created_at,
-            arv, rehab_months, holding_months, holding_costs_monthly, selling_costs_pct,
-            flip_profit, profit_per_month,
-            account_id, user_id
-        ) VALUES (
-            ?,?,?,?,?,
-            ?,?,?,?,
-            ?,?,?,?,?,
-            ?,?,?,
-            ?,?,?,?,?,
-            ?,?,
-            ?,?
-        )
-        """,
-        (
-            saved.get("property_name"),
-            saved.get("city"),
-            saved.get("state"),
-            saved.get("zip_code"),
-            saved.get("deal_grade"),
-            saved.get("estimated_roi"),
-            saved.get("cashflow_per_month"),
-            saved.get("strategy"),
-            saved.get("investor_profile"),
-            saved.get("cap_rate"),
-            saved.get("coc_return"),
-            saved.get("noi"),
-            saved.get("dscr"),
-            saved.get("total_investment"),
-            saved.get("irr_unlevered"),
-            saved.get("npv_unlevered"),
-            saved.get("created_at") or now_iso(),
-            saved.get("arv"),
-            saved.get("rehab_months"),
-            saved.get("holding_months"),
-            saved.get("holding_costs_monthly"),
-            saved.get("selling_costs_pct"),
-            saved.get("flip_profit"),
-            saved.get("profit_per_month"),
-            account_id,
-            None,  # user_id
-        ),
-    )
 
     # Remove from trash
-    cur.execute("DELETE FROM trashed_properties WHERE trash_id = ?", (trash_id,))
+    cur.execute("DELETE FROM trashed_properties WHERE trash_id = ? AND account_id = ?", (trash_id, account_id))
     conn.commit()
     conn.close()
 
@@ -2275,15 +2417,19 @@ def save_scenario(req: ScenarioSaveRequest, ctx: AuthContext = Depends(require_a
         # Return 404 to prevent cross-tenant enumeration
         raise HTTPException(status_code=404, detail="Property not found")
     
-    metrics_json = json.dumps(req.metrics)
+    # Readers prefer the compressed metrics_blob; metrics_json is still written
+    # alongside it until nothing reads the text column any more. One
+    # serialization feeds both (blob = json_codec.dumps_compressed format)
+    metrics_bytes = json_codec.dumps(req.metrics)
     
     # Upsert: insert or replace
     cur.execute(
         """
-        INSERT OR REPLACE INTO scenarios (account_id, property_id, slot, label, metrics_json, created_at)
-        VALUES (?, ?, ?, ?, ?, ?)
+        INSERT OR REPLACE INTO scenarios (account_id, property_id, slot, label, metrics_json, metrics_blob, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
         """,
-        (account_id, req.property_id, req.slot, req.label, metrics_json, now_iso())
+        (account_id, req.property_id, req.slot, req.label,
+         metrics_bytes.decode("utf-8"), zlib.compress(metrics_bytes), now_iso())
     )
     
     conn.commit()
@@ -2298,31 +2444,29 @@ def list_scenarios(property_id: int, ctx: AuthContext = Depends(require_auth_con
     # Phase 2: Apply tenant guardrails
     account_id = require_account_id(ctx.account_id)
     
-    conn = get_db()
+    conn = get_db(check_same_thread=False)
     cur = execute_scoped(
         conn,
-        "SELECT id, slot, label, metrics_json, created_at FROM scenarios WHERE account_id = ? AND property_id = ? ORDER BY slot",
+        "SELECT id, account_id, slot, label, metrics_json, metrics_blob, created_at FROM scenarios WHERE account_id = ? AND property_id = ? ORDER BY slot",
         (account_id, property_id),
         account_id,
         label="/scenario/list"
     )
-    rows = cur.fetchall()
-    conn.close()
-    
-    # Phase 2: Assert all rows belong to this tenant
-    assert_rows_scoped(rows, account_id, label="/scenario/list")
-    
-    scenarios = []
-    for row in rows:
-        scenarios.append({
+
+    def to_item(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
             "id": row["id"],
             "slot": row["slot"],
             "label": row["label"],
-            "metrics": json.loads(row["metrics_json"]),
+            "metrics": (
+                json_codec.loads_compressed(row["metrics_blob"])
+                if row["metrics_blob"] is not None
+                else json_codec.loads(row["metrics_json"])
+            ),
             "created_at": row["created_at"]
-        })
-    
-    return scenarios
+        }
+
+    return stream_json_rows(conn, cur, to_item, account_id, label="/scenario/list")
 
 
 @app.post("/scenario/clear", dependencies=[Depends(require_capability(Capability.ASSET_MANAGE))])
@@ -2359,6 +2503,55 @@ def clear_scenario(req: ScenarioClearRequest, ctx: AuthContext = Depends(require
 # Property Search endpoints
 # ---------------------------------------------------------
 
+# MVP sample data returned while search_properties_cache is empty
+SAMPLE_PROPERTIES: List[Dict[str, Any]] = [
+    {
+        "property_id": 1,
+        "address": "123 Main St",
+        "city": "Atlanta",
+        "state": "GA",
+        "zip": "30301",
+        "beds": 3,
+        "baths": 2.0,
+        "sqft": 1500,
+        "est_price": 250000
+    },
+    {
+        "property_id": 2,
+        "address": "456 Oak Ave",
+        "city": "Atlanta",
+        "state": "GA",
+        "zip": "30302",
+        "beds": 4,
+        "baths": 2.5,
+        "sqft": 2000,
+        "est_price": 325000
+    },
+    {
+        "property_id": 3,
+        "address": "789 Pine Rd",
+        "city": "Decatur",
+        "state": "GA",
+        "zip": "30030",
+        "beds": 2,
+        "baths": 1.0,
+        "sqft": 1100,
+        "est_price": 175000
+    },
+]
+
+# Filter indexes over SAMPLE_PROPERTIES (value -> set of list positions), built once
+_SAMPLE_BY_CITY: Dict[str, set] = defaultdict(set)
+_SAMPLE_BY_STATE: Dict[str, set] = defaultdict(set)
+_SAMPLE_BY_ZIP: Dict[str, set] = defaultdict(set)
+for _i, _p in enumerate(SAMPLE_PROPERTIES):
+    _SAMPLE_BY_CITY[_p["city"].lower()].add(_i)
+    _SAMPLE_BY_STATE[_p["state"].lower()].add(_i)
+    _SAMPLE_BY_ZIP[_p["zip"]].add(_i)
+_SAMPLE_SEARCH_TEXT = [(p["address"].lower(), p["city"].lower()) for p in SAMPLE_PROPERTIES]
+_EMPTY_SET: frozenset = frozenset()
+
+
 @app.get("/search/properties")
 def search_properties(
     q: Optional[str] = None,
@@ -2388,78 +2581,56 @@ def search_properties(
     if not has_cache:
         # Return sample data for MVP
         conn.close()
-        sample_properties = [
-            {
-                "property_id": 1,
-                "address": "123 Main St",
-                "city": "Atlanta",
-                "state": "GA",
-                "zip": "30301",
-                "beds": 3,
-                "baths": 2.0,
-                "sqft": 1500,
-                "est_price": 250000
-            },
-            {
-                "property_id": 2,
-                "address": "456 Oak Ave",
-                "city": "Atlanta",
-                "state": "GA",
-                "zip": "30302",
-                "beds": 4,
-                "baths": 2.5,
-                "sqft": 2000,
-                "est_price": 325000
-            },
-            {
-                "property_id": 3,
-                "address": "789 Pine Rd",
-                "city": "Decatur",
-                "state": "GA",
-                "zip": "30030",
-                "beds": 2,
-                "baths": 1.0,
-                "sqft": 1100,
-                "est_price": 175000
-            },
-        ]
-        
-        # Filter based on query params
-        results = sample_properties
-        if city:
-            results = [p for p in results if p["city"].lower() == city.lower()]
-        if state:
-            results = [p for p in results if p["state"].lower() == state.lower()]
-        if zip:
-            results = [p for p in results if p["zip"] == zip]
+        # Intersect precomputed filter indexes; only survivors are scanned for q
+        matches = None
+        for index, key in ((_SAMPLE_BY_CITY, city and city.lower()), (_SAMPLE_BY_STATE, state and state.lower()), (_SAMPLE_BY_ZIP, zip)):
+            if key:
+                hits = index.get(key, _EMPTY_SET)
+                matches = hits if matches is None else matches & hits
+        indices = range(len(SAMPLE_PROPERTIES)) if matches is None else sorted(matches)
         if q:
             q_lower = q.lower()
-            results = [p for p in results if q_lower in p["address"].lower() or q_lower in p["city"].lower()]
-        
-        return results[:limit]
+            indices = [i for i in indices if q_lower in _SAMPLE_SEARCH_TEXT[i][0] or q_lower in _SAMPLE_SEARCH_TEXT[i][1]]
+
+        return [SAMPLE_PROPERTIES[i] for i in indices][:limit]
     
     # Build query from cache
-    query = "SELECT id as property_id, address, city, state, zip_code as zip, beds, baths, sqft, est_price FROM search_properties_cache WHERE 1=1"
-    params = []
-    
-    if q:
-        query += " AND (address LIKE ? OR city LIKE ?)"
-        params.extend([f"%{q}%", f"%{q}%"])
+    filters = ""
+    params: list = []
     if city:
-        query += " AND city = ?"
+        filters += " AND c.city = ?"
         params.append(city)
     if state:
-        query += " AND state = ?"
+        filters += " AND c.state = ?"
         params.append(state)
     if zip:
-        query += " AND zip_code = ?"
+        filters += " AND c.zip_code = ?"
         params.append(zip)
-    
-    query += f" LIMIT ?"
-    params.append(limit)
-    
-    cur.execute(query, params)
-    rows = cur.fetchall()
+
+    select = "SELECT c.id as property_id, c.address, c.city, c.state, c.zip_code as zip, c.beds, c.baths, c.sqft, c.est_price FROM search_properties_cache c"
+    rows = None
+    if q:
+        # Prefix phrase match on the FTS index; quote the term so user input
+        # cannot inject FTS query syntax.
+        match_term = '"' + q.replace('"', '""') + '"*'
+        try:
+            cur.execute(
+                select + " JOIN search_properties_fts f ON f.rowid = c.id WHERE search_properties_fts MATCH ?" + filters + " LIMIT ?",
+                [match_term, *params, limit],
+            )
+            rows = cur.fetchall()
+        except sqlite3.OperationalError as e:
+            print(f"[SEARCH] FTS query failed, falling back to LIKE: {e}")
+
+    if rows is None:
+        like_filter = ""
+        like_params: list = []
+        if q:
+            pattern = f"%{q}%"
+            like_filter = " AND (c.address LIKE ? OR c.city LIKE ?)"
+            like_params = [pattern, pattern]
+        cur.execute(select + " WHERE 1=1" + like_filter + filters + " LIMIT ?", [*like_params, *params, limit])
+        rows = cur.fetchall()
     conn.close()
     
     results = []
@@ -2483,6 +2654,36 @@ def search_properties(
 # Assets endpoints
 # ---------------------------------------------------------
 
+# Asset statements, kept as constants so the shared connections' statement
+# cache compiles each query shape once.
+_SQL_INSERT_ASSET = (
+    "INSERT INTO assets (account_id, name, address, city, state, zip_code, notes, created_at, updated_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+# Single-row variant; executemany() can't consume RETURNING rows, so bulk keeps the plain INSERT
+_SQL_INSERT_ASSET_RETURNING = _SQL_INSERT_ASSET + " RETURNING id"
+_SQL_ASSET_OWNED = "SELECT id FROM assets WHERE id = ? AND account_id = ?"
+_SQL_GET_ASSET = (
+    "SELECT id, account_id, name, address, city, state, zip_code, notes, created_at, updated_at "
+    "FROM assets WHERE id = ? AND account_id = ?"
+)
+_SQL_ASSET_RELATED_DEALS = """
+    SELECT rowid, property_name, city, state, zip_code, strategy, deal_grade, created_at
+    FROM saved_properties
+    WHERE account_id = ?
+      AND city = ? AND state = ? AND zip_code = ?
+    ORDER BY created_at DESC
+    LIMIT 10
+"""
+_SQL_DELETE_ASSET = "DELETE FROM assets WHERE id = ? AND account_id = ?"
+# Single UPDATE shape: absent (None) fields keep their current value
+_SQL_UPDATE_ASSET = (
+    "UPDATE assets SET name = COALESCE(?, name), address = COALESCE(?, address), city = COALESCE(?, city), "
+    "state = COALESCE(?, state), zip_code = COALESCE(?, zip_code), notes = COALESCE(?, notes), updated_at = ? "
+    "WHERE id = ? AND account_id = ?"
+)
+
+
 class AssetCreateRequest(BaseModel):
     name: Optional[str] = None
     address: Optional[str] = None
@@ -2492,6 +2693,10 @@ class AssetCreateRequest(BaseModel):
     notes: Optional[str] = None
 
 
+# Pulls the user-supplied INSERT columns off a request in one C-level call
+_asset_insert_fields = attrgetter("name", "address", "city", "state", "zip_code", "notes")
+
+
 class AssetUpdateRequest(BaseModel):
     asset_id: int
     name: Optional[str] = None
@@ -2511,7 +2716,7 @@ def list_assets(ctx: AuthContext = Depends(require_auth_context)):
     """List all assets for current account."""
     account_id = require_account_id(ctx.account_id)
     
-    conn = get_db()
+    conn = get_db(check_same_thread=False)
     cur = execute_scoped(
         conn,
         "SELECT id, account_id, name, address, city, state, zip_code, notes, created_at, updated_at FROM assets WHERE account_id = ? ORDER BY created_at DESC",
@@ -2519,14 +2724,9 @@ def list_assets(ctx: AuthContext = Depends(require_auth_context)):
         account_id,
         label="/assets/list"
     )
-    rows = cur.fetchall()
-    conn.close()
-    
-    assert_rows_scoped(rows, account_id, label="/assets/list")
-    
-    assets = []
-    for row in rows:
-        assets.append({
+
+    def to_item(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
             "asset_id": row["id"],
             "name": row["name"],
             "address": row["address"],
@@ -2536,9 +2736,9 @@ def list_assets(ctx: AuthContext = Depends(require_auth_context)):
             "notes": row["notes"],
             "created_at": row["created_at"],
             "updated_at": row["updated_at"]
-        })
-    
-    return assets
+        }
+
+    return stream_json_rows(conn, cur, to_item, account_id, label="/assets/list")
 
 
 @app.get("/assets/get")
@@ -2546,122 +2746,106 @@ def get_asset(asset_id: int, ctx: AuthContext = Depends(require_auth_context)):
     """Get single asset detail."""
     account_id = require_account_id(ctx.account_id)
     
-    conn = get_db()
+    conn = get_ro_conn()
     cur = conn.cursor()
-    cur.execute(
-        "SELECT id, name, address, city, state, zip_code, notes, created_at, updated_at FROM assets WHERE id = ? AND account_id = ?",
-        (asset_id, account_id)
-    )
+    cur.execute(_SQL_GET_ASSET, (asset_id, account_id))
     row = cur.fetchone()
-    conn.close()
     
     if not row:
         raise HTTPException(status_code=404, detail="Asset not found")
     
     assert_row_scoped(row, account_id, label="/assets/get")
     
-    # Optionally, fetch related saved deals
-    conn2 = get_db()
-    cur2 = conn2.cursor()
-    cur2.execute(
-        """
-        SELECT id, property_name, city, state, zip_code, strategy, deal_grade, created_at
-        FROM saved_properties
-        WHERE account_id = ?
-          AND (address = ? OR (city = ? AND state = ? AND zip_code = ?))
-        ORDER BY created_at DESC
-        LIMIT 10
-        """,
-        (account_id, row["address"], row["city"], row["state"], row["zip_code"])
-    )
-    related_deals = cur2.fetchall()
-    conn2.close()
-    
-    return {
-        "asset_id": row["id"],
-        "name": row["name"],
-        "address": row["address"],
-        "city": row["city"],
-        "state": row["state"],
-        "zip_code": row["zip_code"],
-        "notes": row["notes"],
-        "created_at": row["created_at"],
-        "updated_at": row["updated_at"],
-        "related_deals": [dict(d) for d in related_deals]
+    # Optionally, fetch related saved deals (same connection)
+    cur.execute(_SQL_ASSET_RELATED_DEALS, (account_id, row[4], row[5], row[6]))
+    related_deals = cur.fetchall()
+    
+    result = {
+        "asset_id": row[0],
+        "name": row[2],
+        "address": row[3],
+        "city": row[4],
+        "state": row[5],
+        "zip_code": row[6],
+        "notes": row[7],
+        "created_at": row[8],
+        "updated_at": row[9],
+        "related_deals": [
+            {
+                "id": d[0],
+                "property_name": d[1],
+                "city": d[2],
+                "state": d[3],
+                "zip_code": d[4],
+                "strategy": d[5],
+                "deal_grade": d[6],
+                "created_at": d[7],
+            }
+            for d in related_deals
+        ],
     }
+    # Plain str/number payload - encode once, skipping jsonable_encoder
+    return Response(content=json_codec.dumps(result), media_type="application/json")
 
 
 @app.post("/assets/create", dependencies=[Depends(require_capability(Capability.ASSET_MANAGE))])
 def create_asset(req: AssetCreateRequest, ctx: AuthContext = Depends(require_auth_context)):
     """Create new asset. Requires asset:manage capability."""
     account_id = require_account_id(ctx.account_id)
+    now = now_iso()
     
-    conn = get_db()
-    cur = conn.cursor()
-    
-    cur.execute(
-        """
-        INSERT INTO assets (account_id, name, address, city, state, zip_code, notes, created_at, updated_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (account_id, req.name, req.address, req.city, req.state, req.zip_code, req.notes, now_iso(), now_iso())
-    )
-    asset_id = cur.lastrowid
-    conn.commit()
-    conn.close()
+    with get_rw_conn() as conn:
+        asset_id = conn.execute(
+            _SQL_INSERT_ASSET_RETURNING,
+            (account_id, *_asset_insert_fields(req), now, now)
+        ).fetchone()[0]
     
     return {"success": True, "asset_id": asset_id}
 
 
+@app.post("/assets/create_bulk", dependencies=[Depends(require_capability(Capability.ASSET_MANAGE))])
+def create_assets_bulk(reqs: List[AssetCreateRequest], ctx: AuthContext = Depends(require_auth_context)):
+    """Create many assets in one transaction. Requires asset:manage capability."""
+    account_id = require_account_id(ctx.account_id)
+    
+    if len(reqs) > MAX_BULK_ASSETS:
+        raise HTTPException(status_code=400, detail=f"Too many assets (max {MAX_BULK_ASSETS} per request)")
+    if not reqs:
+        return {"success": True, "created": 0}
+    
+    now = now_iso()
+    with get_rw_conn() as conn:
+        execute_scoped_many(
+            conn,
+            _SQL_INSERT_ASSET,
+            [(account_id, *_asset_insert_fields(r), now, now) for r in reqs],
+            account_id,
+            label="/assets/create_bulk"
+        )
+    
+    return {"success": True, "created": len(reqs)}
+
+
 @app.post("/assets/update", dependencies=[Depends(require_capability(Capability.ASSET_MANAGE))])
 def update_asset(req: AssetUpdateRequest, ctx: AuthContext = Depends(require_auth_context)):
     """Update existing asset. Requires asset:manage capability."""
     account_id = require_account_id(ctx.account_id)
     
-    conn = get_db()
-    cur = conn.cursor()
-    
-    # Verify ownership
-    cur.execute("SELECT id FROM assets WHERE id = ? AND account_id = ?", (req.asset_id, account_id))
-    row = cur.fetchone()
-    if not row:
-        conn.close()
-        raise HTTPException(status_code=404, detail="Asset not found")
-    
-    # Build update query dynamically for only provided fields
-    fields = []
-    params = []
-    if req.name is not None:
-        fields.append("name = ?")
-        params.append(req.name)
-    if req.address is not None:
-        fields.append("address = ?")
-        params.append(req.address)
-    if req.city is not None:
-        fields.append("city = ?")
-        params.append(req.city)
-    if req.state is not None:
-        fields.append("state = ?")
-        params.append(req.state)
-    if req.zip_code is not None:
-        fields.append("zip_code = ?")
-        params.append(req.zip_code)
-    if req.notes is not None:
-        fields.append("notes = ?")
-        params.append(req.notes)
-    
-    if not fields:
-        conn.close()
-        return {"success": True, "message": "No fields to update"}
-    
-    fields.append("updated_at = ?")
-    params.append(now_iso())
-    params.extend([req.asset_id, account_id])
-    
-    query = f"UPDATE assets SET {', '.join(fields)} WHERE id = ? AND account_id = ?"
-    cur.execute(query, params)
-    conn.commit()
-    conn.close()
+    with get_rw_conn() as conn:
+        cur = conn.cursor()
+        
+        values = (req.name, req.address, req.city, req.state, req.zip_code, req.notes)
+        if all(v is None for v in values):
+            # Nothing to write - still 404 for assets this account doesn't own
+            cur.execute(_SQL_ASSET_OWNED, (req.asset_id, account_id))
+            if not cur.fetchone():
+                raise HTTPException(status_code=404, detail="Asset not found")
+            return {"success": True, "message": "No fields to update"}
+        
+        # Ownership is enforced by the WHERE clause; 0 rows -> not found
+        cur.execute(_SQL_UPDATE_ASSET, (*values, now_iso(), req.asset_id, account_id))
+        if cur.rowcount == 0:
+            raise HTTPException(status_code=404, detail="Asset not found")
     
     return {"success": True}
 
@@ -2671,18 +2855,12 @@ def delete_asset(req: AssetDeleteRequest, ctx: AuthContext = Depends(require_aut
     """Delete asset. Requires asset:manage capability."""
     account_id = require_account_id(ctx.account_id)
     
-    conn = get_db()
-    cur = conn.cursor()
-    
-    # Verify ownership
-    cur.execute("SELECT id FROM assets WHERE id = ? AND account_id = ?", (req.asset_id, account_id))
-    row = cur.fetchone()
-    if not row:
-        conn.close()
-        raise HTTPException(status_code=404, detail="Asset not found")
-    
-    cur.execute("DELETE FROM assets WHERE id = ? AND account_id = ?", (req.asset_id, account_id))
-    conn.commit()
-    conn.close()
+    with get_rw_conn() as conn:
+        cur = conn.cursor()
+        
+        # Ownership is enforced by the WHERE clause; 0 rows -> not found
+        cur.execute(_SQL_DELETE_ASSET, (req.asset_id, account_id))
+        if cur.rowcount == 0:
+            raise HTTPException(status_code=404, detail="Asset not found")
     
-    return {"success": True}
\ No newline at end of file
+    return {"success": True}
@@ -2,14 +2,501 @@
 # Database migration module for PostgreSQL and SQLite
 # Run: python -m backend.migrate
 
+import functools
+import hashlib
 import os
 import sys
+from collections import defaultdict
 from pathlib import Path
+from typing import Final
 
-# Add project root to path for imports
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+try:
+    from backend.models import PlanName
+    from backend.db import IS_POSTGRES, get_db_connection, commit, sqlite_table_columns, invalidate_table_columns
+except ModuleNotFoundError:
+    # Run as a script (python backend/migrate.py): add project root to path.
+    # Package imports, the normal case, never pay for the path resolve.
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from backend.models import PlanName
+    from backend.db import IS_POSTGRES, get_db_connection, commit, sqlite_table_columns, invalidate_table_columns
 
-from backend.db import IS_POSTGRES, get_db_connection, commit
+
+# ---------------------------------------------------------
+# Schema
+# ---------------------------------------------------------
+# The schema is defined once as data and rendered to each backend's DDL at
+# import (see _emit_ddl). Column specs may use these placeholders:
+#   {pk}   -> SERIAL PRIMARY KEY | INTEGER PRIMARY KEY AUTOINCREMENT
+#   {ts}   -> TIMESTAMP | TEXT
+#   {true} -> TRUE | 1
+#   {blob} -> BYTEA | BLOB
+# A spec given as {"postgres": ..., "sqlite": ...} differs per backend.
+# fks are (column, referenced table[, only this dialect]); indexes are
+# (name, columns, unique).
+
+# Tables, in dependency order (referenced tables first)
+SCHEMA = (
+    {
+        "name": "users",
+        "cols": (
+            ("id", "{pk}"),
+            ("email", "TEXT UNIQUE NOT NULL"),
+            ("password_hash", "TEXT NOT NULL"),
+            ("account_id", "INTEGER"),
+            ("role", "TEXT DEFAULT 'member'"),
+            ("is_active", "BOOLEAN DEFAULT {true}"),
+            ("created_at", "{ts} DEFAULT CURRENT_TIMESTAMP"),
+        ),
+        "indexes": (
+            ("idx_users_email_unique", "email", True),
+        ),
+    },
+    {
+        "name": "accounts",
+        "cols": (
+            ("id", "{pk}"),
+            ("name", "TEXT NOT NULL"),
+            ("owner_id", "INTEGER"),
+            ("plan", "TEXT DEFAULT 'free'"),
+            ("stripe_customer_id", "TEXT"),
+            ("stripe_subscription_id", "TEXT"),
+            ("created_at", "{ts} DEFAULT CURRENT_TIMESTAMP"),
+        ),
+        "fks": (("owner_id", "users"),),
+    },
+    {
+        "name": "account_memberships",
+        "cols": (
+            ("id", "{pk}"),
+            ("account_id", "INTEGER NOT NULL"),
+            ("user_id", "INTEGER NOT NULL"),
+            ("role", "TEXT DEFAULT 'member'"),
+            ("created_at", "{ts} DEFAULT CURRENT_TIMESTAMP"),
+        ),
+        "fks": (("account_id", "accounts"), ("user_id", "users")),
+        "constraints": ("UNIQUE(account_id, user_id)",),
+    },
+    {
+        "name": "plans",
+        "cols": (
+            ("id", "{pk}"),
+            ("name", "TEXT UNIQUE NOT NULL"),
+            ("price_monthly", "REAL NOT NULL"),
+            ("max_saved_deals", "INTEGER DEFAULT 10"),
+            ("max_scenarios", "INTEGER DEFAULT 3"),
+            ("features_json", "TEXT"),
+            ("created_at", "{ts} DEFAULT CURRENT_TIMESTAMP"),
+        ),
+    },
+    {
+        "name": "subscriptions",
+        "cols": (
+            ("id", "{pk}"),
+            ("account_id", "INTEGER NOT NULL"),
+            ("plan_id", "INTEGER NOT NULL"),
+            ("status", "TEXT DEFAULT 'active'"),
+            ("plan_name", "TEXT DEFAULT 'free'"),
+            ("provider", "TEXT DEFAULT 'manual'"),
+            ("provider_customer_id", "TEXT"),
+            ("provider_subscription_id", "TEXT"),
+            ("stripe_subscription_id", "TEXT"),
+            ("cancel_at_period_end", "INTEGER DEFAULT 0"),
+            ("current_period_start", "{ts}"),
+            ("current_period_end", "{ts}"),
+            ("created_at", "{ts} DEFAULT CURRENT_TIMESTAMP"),
+            ("updated_at", "{ts}"),
+        ),
+        # Rows are created with plan_id 0 until real plan ids are wired up,
+        # which Postgres would reject; SQLite does not enforce foreign keys
+        "fks": (("account_id", "accounts"), ("plan_id", "plans", "sqlite")),
+        "indexes": (
+            ("idx_subscriptions_account_unique", "account_id", True),
+        ),
+    },
+    {
+        "name": "saved_properties",
+        "cols": (
+            ("id", "{pk}"),
+            ("account_id", {"postgres": "INTEGER NOT NULL DEFAULT 1", "sqlite": "INTEGER DEFAULT 1"}),
+            ("user_id", "INTEGER"),
+            ("property_name", "TEXT"),
+            ("city", "TEXT"),
+            ("state", "TEXT"),
+            ("zip_code", "TEXT"),
+            ("strategy", "TEXT"),
+            ("investor_profile", "TEXT"),
+            ("purchase_price", "REAL"),
+            ("rehab_budget", "REAL"),
+            ("monthly_rent", "REAL"),
+            ("hold_years", "REAL"),
+            ("estimated_roi", "REAL"),
+            ("cashflow_per_month", "REAL"),
+            ("cap_rate", "REAL"),
+            ("coc_return", "REAL"),
+            ("noi", "REAL"),
+            ("dscr", "REAL"),
+            ("total_investment", "REAL"),
+            ("irr_unlevered", "REAL"),
+            ("npv_unlevered", "REAL"),
+            ("arv", "REAL"),
+            ("rehab_months", "REAL"),
+            ("holding_months", "REAL"),
+            ("holding_costs_monthly", "REAL"),
+            ("selling_costs_pct", "REAL"),
+            ("flip_profit", "REAL"),
+            ("profit_per_month", "REAL"),
+            ("deal_grade", "TEXT"),
+            ("risk_level", "TEXT"),
+            ("tags_json", "TEXT"),
+            ("created_at", {"postgres": "TIMESTAMP DEFAULT CURRENT_TIMESTAMP", "sqlite": "TEXT"}),
+        ),
+        "indexes": (
+            ("idx_saved_properties_account_id", "account_id", False),
+            ("idx_saved_properties_account_created", "account_id, created_at", False),
+            ("idx_saved_properties_user_created", "user_id, created_at DESC", False),
+        ),
+    },
+    {
+        "name": "trashed_properties",
+        "cols": (
+            ("trash_id", "{pk}"),
+            ("account_id", "INTEGER"),
+            ("saved_row_json", "TEXT"),
+            ("deleted_at", {"postgres": "TIMESTAMP DEFAULT CURRENT_TIMESTAMP", "sqlite": "TEXT"}),
+        ),
+        "indexes": (
+            ("idx_trashed_properties_account_id", "account_id", False),
+        ),
+    },
+    {
+        "name": "scenarios",
+        "cols": (
+            ("id", "{pk}"),
+            ("account_id", "INTEGER NOT NULL"),
+            ("property_id", "INTEGER NOT NULL"),
+            ("slot", "TEXT NOT NULL CHECK (slot IN ('A', 'B', 'C'))"),
+            ("label", "TEXT"),
+            ("metrics_json", "TEXT NOT NULL"),
+            ("metrics_blob", "{blob}"),
+            ("created_at", "{ts} DEFAULT CURRENT_TIMESTAMP"),
+        ),
+        "constraints": ("UNIQUE(account_id, property_id, slot)",),
+        "indexes": (
+            ("idx_scenarios_account_property", "account_id, property_id", False),
+            ("idx_scenarios_account_slot", "account_id, slot", False),
+        ),
+    },
+    {
+        "name": "auth_sessions",
+        "cols": (
+            ("id", "TEXT PRIMARY KEY"),
+            ("user_id", "INTEGER NOT NULL"),
+            ("account_id", "INTEGER NOT NULL"),
+            ("refresh_token_hash", "TEXT NOT NULL"),
+            ("created_at", "{ts} NOT NULL"),
+            ("expires_at", "{ts} NOT NULL"),
+            ("revoked_at", "{ts} NULL"),
+            ("user_agent", "TEXT NULL"),
+            ("ip", "TEXT NULL"),
+        ),
+        "fks": (("user_id", "users"),),
+        "indexes": (
+            ("idx_auth_sessions_user_id", "user_id", False),
+            ("idx_auth_sessions_account_id", "account_id", False),
+            ("idx_auth_sessions_expires_at", "expires_at", False),
+            ("idx_auth_sessions_user_active", "user_id, revoked_at, expires_at", False),
+        ),
+    },
+    {
+        "name": "resume_codes",
+        "cols": (
+            ("code", "TEXT PRIMARY KEY"),
+            ("session_id", "TEXT NOT NULL"),
+            ("refresh_token_hash", "TEXT NOT NULL"),
+            ("created_at", "{ts} NOT NULL"),
+            ("expires_at", "{ts} NOT NULL"),
+            ("used_at", "{ts} NULL"),
+        ),
+        "fks": (("session_id", "auth_sessions"),),
+        "indexes": (
+            ("idx_resume_codes_expires_at", "expires_at", False),
+        ),
+    },
+    {
+        "name": "affiliates",
+        "cols": (
+            ("id", "{pk}"),
+            ("user_id", "INTEGER NOT NULL"),
+            ("referral_code", "TEXT UNIQUE NOT NULL"),
+            ("commission_rate", "REAL DEFAULT 0.1"),
+            ("total_earned", "REAL DEFAULT 0.0"),
+            ("created_at", "{ts} DEFAULT CURRENT_TIMESTAMP"),
+        ),
+        "fks": (("user_id", "users"),),
+    },
+    {
+        "name": "referrals",
+        "cols": (
+            ("id", "{pk}"),
+            ("affiliate_id", "INTEGER NOT NULL"),
+            ("referred_user_id", "INTEGER NOT NULL"),
+            ("referred_account_id", "INTEGER NOT NULL"),
+            ("commission_amount", "REAL DEFAULT 0.0"),
+            ("created_at", "{ts} DEFAULT CURRENT_TIMESTAMP"),
+        ),
+        "fks": (
+            ("affiliate_id", "affiliates"),
+            ("referred_user_id", "users"),
+            ("referred_account_id", "accounts"),
+        ),
+    },
+    # Property Search + Assets
+    {
+        "name": "assets",
+        "cols": (
+            ("id", "{pk}"),
+            ("account_id", "INTEGER NOT NULL"),
+            ("name", "TEXT"),
+            ("address", "TEXT"),
+            ("city", "TEXT"),
+            ("state", "TEXT"),
+            ("zip_code", "TEXT"),
+            ("notes", "TEXT"),
+            ("created_at", "{ts} DEFAULT CURRENT_TIMESTAMP"),
+            ("updated_at", "{ts} DEFAULT CURRENT_TIMESTAMP"),
+        ),
+        "indexes": (
+            # Leads with account_id, so it also serves plain tenant filters;
+            # a separate (account_id) index would only be pruned again by
+            # migrate_property_search_assets
+            ("idx_assets_account_created_id", "account_id, created_at DESC, id DESC", False),
+        ),
+    },
+    {
+        "name": "property_index",
+        "cols": (
+            ("id", "{pk}"),
+            ("account_id", "INTEGER NOT NULL"),
+            ("asset_id", "INTEGER"),
+            ("address", "TEXT"),
+            ("city", "TEXT"),
+            ("state", "TEXT"),
+            ("zip_code", "TEXT"),
+            ("county", "TEXT"),
+            ("property_type", "TEXT"),
+            ("bedrooms", "INTEGER"),
+            ("bathrooms", "REAL"),
+            ("sqft", "INTEGER"),
+            ("lot_size", "REAL"),
+            ("year_built", "INTEGER"),
+            ("zoning", "TEXT"),
+            ("last_sale_date", "TEXT"),
+            ("last_sale_price", "REAL"),
+            ("assessed_value", "REAL"),
+            ("market_value", "REAL"),
+            ("owner_name", "TEXT"),
+            ("owner_type", "TEXT"),
+            ("occupancy_status", "TEXT"),
+            ("rental_estimate", "REAL"),
+            ("notes", "TEXT"),
+            ("created_at", "{ts} DEFAULT CURRENT_TIMESTAMP"),
+            ("updated_at", "{ts} DEFAULT CURRENT_TIMESTAMP"),
+        ),
+        "fks": (("asset_id", "assets"),),
+        "indexes": (
+            ("idx_property_index_asset_id", "asset_id", False),
+            ("idx_property_index_city_state", "city, state", False),
+            ("idx_property_index_account_city_state", "account_id, city, state", False),
+        ),
+    },
+)
+
+_DIALECT_TYPES = {
+    "postgres": {"pk": "SERIAL PRIMARY KEY", "ts": "TIMESTAMP", "true": "TRUE", "blob": "BYTEA"},
+    "sqlite": {"pk": "INTEGER PRIMARY KEY AUTOINCREMENT", "ts": "TEXT", "true": "1", "blob": "BLOB"},
+}
+
+
+def _emit_ddl(schema, dialect: str):
+    """
+    Render schema to (tables, unique indexes, lookup indexes) DDL for dialect.
+
+    Postgres gets inline REFERENCES; SQLite gets trailing FOREIGN KEY clauses.
+    """
+    types = _DIALECT_TYPES[dialect]
+    tables, unique_indexes, indexes = [], [], []
+    for table in schema:
+        name = table["name"]
+        refs = {
+            fk[0]: fk[1] for fk in table.get("fks", ())
+            if len(fk) == 2 or fk[2] == dialect
+        }
+        lines = []
+        for column, spec in table["cols"]:
+            if isinstance(spec, dict):
+                spec = spec[dialect]
+            line = f"{column} {spec.format(**types)}"
+            if dialect == "postgres" and column in refs:
+                line += f" REFERENCES {refs[column]}(id)"
+            lines.append(line)
+        if dialect == "sqlite":
+            lines += [f"FOREIGN KEY ({column}) REFERENCES {ref} (id)" for column, ref in refs.items()]
+        lines += table.get("constraints", ())
+        body = ",\n    ".join(lines)
+        tables.append(f"CREATE TABLE IF NOT EXISTS {name} (\n    {body}\n)")
+
+        for index_name, columns, unique in table.get("indexes", ()):
+            if unique:
+                unique_indexes.append(f"CREATE UNIQUE INDEX IF NOT EXISTS {index_name} ON {name}({columns})")
+            else:
+                indexes.append(f"CREATE INDEX IF NOT EXISTS {index_name} ON {name}({columns})")
+    return tuple(tables), tuple(unique_indexes), tuple(indexes)
+
+
+# Rendered once per dialect at import
+_DDL = {dialect: _emit_ddl(SCHEMA, dialect) for dialect in _DIALECT_TYPES}
+
+# Each backend's DDL is joined into one script and sent in a single call
+# instead of ~30 separate round-trips. All CREATE TABLEs run before any
+# CREATE INDEX, so indexes never reference a table or column that does not
+# exist yet.
+# On Postgres, unique indexes back constraints and are applied in their own
+# phase; lookup indexes are built CONCURRENTLY after the tables phase
+# commits, so a deploy never holds a write-blocking lock on a live table.
+_PG_TABLES, _PG_UNIQUE_INDEXES, _PG_INDEXES = _DDL["postgres"]
+
+# SQLite indexes run after tables and added columns exist
+_SQLITE_TABLES, _sqlite_unique_indexes, _sqlite_indexes = _DDL["sqlite"]
+_SQLITE_INDEXES = _sqlite_unique_indexes + _sqlite_indexes
+
+# Postgres columns that are always populated in practice; backfilled and made
+# NOT NULL so the planner can drop NULL handling: (table, column, backfill expr)
+_PG_NOT_NULL_COLUMNS = (
+    ("saved_properties", "account_id", "1"),
+    ("trashed_properties", "account_id", "1"),
+    ("assets", "updated_at", "COALESCE(created_at, CURRENT_TIMESTAMP)"),
+    ("property_index", "updated_at", "COALESCE(created_at, CURRENT_TIMESTAMP)"),
+)
+
+_PLAN_NAMES_SQL = ", ".join(f"'{plan.value}'" for plan in PlanName)
+
+# Postgres CHECK constraints: (table, constraint name, expression)
+_PG_CHECKS = (
+    ("accounts", "accounts_plan_check", f"plan IN ({_PLAN_NAMES_SQL})"),
+    ("subscriptions", "subscriptions_plan_name_check", f"plan_name IN ({_PLAN_NAMES_SQL})"),
+)
+
+# Added NOT VALID (no table scan under lock), then validated separately. If
+# existing rows violate it, the constraint still guards new writes and the
+# migration carries on with a warning instead of aborting.
+_PG_CHECK_TEMPLATE = """
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = '{name}') THEN
+        ALTER TABLE {table} ADD CONSTRAINT {name} CHECK ({expr}) NOT VALID;
+    END IF;
+    BEGIN
+        ALTER TABLE {table} VALIDATE CONSTRAINT {name};
+    EXCEPTION WHEN check_violation THEN
+        RAISE WARNING '{name} not validated: existing rows violate it';
+    END;
+END $$
+"""
+PG_CHECKS_SCRIPT = ";\n".join(
+    _PG_CHECK_TEMPLATE.format(table=table, name=name, expr=expr).strip()
+    for table, name, expr in _PG_CHECKS
+) + ";\n"
+
+# Columns added after the original CREATE TABLE shipped: (table, column, ddl)
+_SQLITE_COLUMNS = (
+    ("accounts", "plan", "TEXT DEFAULT 'free'"),
+    ("accounts", "stripe_customer_id", "TEXT"),
+    ("accounts", "stripe_subscription_id", "TEXT"),
+    ("subscriptions", "plan_name", "TEXT DEFAULT 'free'"),
+    ("subscriptions", "provider", "TEXT DEFAULT 'manual'"),
+    ("subscriptions", "provider_customer_id", "TEXT"),
+    ("subscriptions", "provider_subscription_id", "TEXT"),
+    ("subscriptions", "cancel_at_period_end", "INTEGER DEFAULT 0"),
+    ("subscriptions", "updated_at", "TEXT"),
+    ("saved_properties", "user_id", "INTEGER"),
+    ("trashed_properties", "account_id", "INTEGER"),
+    ("scenarios", "metrics_blob", "BLOB"),
+)
+
+# Default plans, seeded idempotently after tables exist:
+# (name, price_monthly, max_saved_deals, features_json)
+_DEFAULT_PLANS = (
+    ("free", 0.0, 5, '{"can_export_csv": false, "can_use_irr": false}'),
+    ("pro", 29.99, 50, '{"can_export_csv": true, "can_use_irr": true}'),
+)
+_SQL_SEED_PLAN = (
+    "INSERT INTO plans (name, price_monthly, max_saved_deals, features_json) "
+    "VALUES (:name, :price_monthly, :max_saved_deals, :features_json) "
+    "ON CONFLICT (name) DO NOTHING"
+)
+_DEFAULT_PLAN_ROWS = [
+    {"name": name, "price_monthly": price, "max_saved_deals": max_saved, "features_json": features}
+    for name, price, max_saved, features in _DEFAULT_PLANS
+]
+
+
+def _join_script(statements) -> str:
+    return ";\n".join(s.strip() for s in statements) + ";\n"
+
+
+PG_TABLES_SCRIPT = _join_script(_PG_TABLES)
+PG_UNIQUE_INDEXES_SCRIPT = _join_script(_PG_UNIQUE_INDEXES)
+# Name -> DDL, so a warm database only gets DDL for what is actually missing
+_PG_TABLES_BY_NAME = {ddl.split()[5]: ddl for ddl in _PG_TABLES}
+_PG_UNIQUE_INDEXES_BY_NAME = {ddl.split()[6]: ddl for ddl in _PG_UNIQUE_INDEXES}
+_SQL_PG_EXISTING_TABLES = "SELECT tablename FROM pg_catalog.pg_tables WHERE schemaname = current_schema()"
+_SQL_PG_EXISTING_INDEXES = "SELECT indexname FROM pg_catalog.pg_indexes WHERE schemaname = current_schema()"
+_SQL_PG_NOT_NULL_COLUMNS = (
+    "SELECT table_name || '.' || column_name FROM information_schema.columns "
+    "WHERE table_schema = current_schema() AND is_nullable = 'NO'"
+)
+# (index name, concurrent DDL) pairs for the post-commit build pass
+_PG_CONCURRENT_INDEXES = tuple(
+    (ddl.split()[5], ddl.replace("CREATE INDEX", "CREATE INDEX CONCURRENTLY", 1))
+    for ddl in _PG_INDEXES
+)
+SQLITE_TABLES_SCRIPT = _join_script(_SQLITE_TABLES)
+SQLITE_INDEXES_SCRIPT = _join_script(_SQLITE_INDEXES)
+# Complete executescript() payloads, transaction included, so a run is one
+# driver call per phase with no string building
+_SQLITE_TABLES_TXN: Final[str] = "BEGIN;\n" + SQLITE_TABLES_SCRIPT + "COMMIT;"
+_SQLITE_INDEXES_TXN: Final[str] = "BEGIN;\n" + SQLITE_INDEXES_SCRIPT + "COMMIT;"
+
+# WAL + synchronous=NORMAL: each migration commit no longer waits on a full fsync
+_SQLITE_MIGRATION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+)
+
+# Fingerprint of everything run_migrations() would apply on this backend.
+# Stored in schema_meta after a successful run; an unchanged digest on the
+# next boot means there is nothing to do.
+if IS_POSTGRES:
+    _SCHEMA_SOURCE = (
+        PG_TABLES_SCRIPT + PG_UNIQUE_INDEXES_SCRIPT + "".join(_PG_INDEXES)
+        + repr(_PG_NOT_NULL_COLUMNS) + PG_CHECKS_SCRIPT
+    )
+else:
+    _SCHEMA_SOURCE = SQLITE_TABLES_SCRIPT + repr(_SQLITE_COLUMNS) + SQLITE_INDEXES_SCRIPT
+_SCHEMA_SOURCE += repr(_DEFAULT_PLANS)
+SCHEMA_DIGEST = hashlib.sha256(_SCHEMA_SOURCE.encode("utf-8")).hexdigest()
+
+# Set to force a full run even when the stored digest matches
+SKIP_MIGRATION_CHECK = os.environ.get("SKIP_MIGRATION_CHECK", "").lower() in ("1", "true", "yes")
+
+_SQL_CREATE_SCHEMA_META = "CREATE TABLE IF NOT EXISTS schema_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+_SQL_GET_SCHEMA_DIGEST = "SELECT value FROM schema_meta WHERE key = 'ddl_digest'"
+_SQL_SET_SCHEMA_DIGEST = (
+    "INSERT INTO schema_meta (key, value) VALUES ('ddl_digest', :digest) "
+    "ON CONFLICT(key) DO UPDATE SET value = excluded.value"
+)
 
 
 def run_migrations() -> None:
@@ -21,568 +508,212 @@ def run_migrations() -> None:
     print("[MIGRATE] Starting database migrations...")
     
     with get_db_connection() as conn:
+        _execute(conn, _SQL_CREATE_SCHEMA_META)
+        row = _execute(conn, _SQL_GET_SCHEMA_DIGEST).fetchone()
+        if row and row[0] == SCHEMA_DIGEST and not SKIP_MIGRATION_CHECK:
+            commit(conn)
+            print("[MIGRATE] Schema up-to-date, nothing to do")
+            return
+        
         if IS_POSTGRES:
-            _run_postgres_migrations(conn)
+            complete = _run_postgres_migrations(conn)
         else:
             _run_sqlite_migrations(conn)
+            complete = True
+        _seed_default_plans(conn)
+        commit(conn)
         
+        # Only record the digest once everything, including deferred index
+        # builds, has landed; otherwise the next start retries
+        if not complete:
+            print("[MIGRATE] Some indexes were not built; will retry on next start")
+            return
+        
+        _execute(conn, _SQL_SET_SCHEMA_DIGEST, {"digest": SCHEMA_DIGEST})
         commit(conn)
     
     print("[MIGRATE] All migrations complete!")
 
 
-def _run_postgres_migrations(conn) -> None:
-    """PostgreSQL-specific migrations using SQLAlchemy."""
+def _execute(conn, sql: str, params: dict = None):
+    """Run one statement with :named params on either backend."""
+    if IS_POSTGRES:
+        return conn.execute(_text(sql), params or {})
+    return conn.execute(sql, params or {})
+
+
+def _executemany(conn, sql: str, rows: list):
+    """Run one statement for many :named param dicts in a single driver call."""
+    if IS_POSTGRES:
+        # A list of dicts makes SQLAlchemy use the driver's executemany
+        return conn.execute(_text(sql), rows)
+    return conn.executemany(sql, rows)
+
+
+@functools.lru_cache(maxsize=None)
+def _text(sql: str):
+    """SQLAlchemy TextClause for a constant statement, built once per process."""
     from sqlalchemy import text
+    return text(sql)
+
+
+def _seed_default_plans(conn) -> None:
+    """Insert the default plans if missing (ON CONFLICT works on Postgres and SQLite 3.24+)."""
+    _executemany(conn, _SQL_SEED_PLAN, _DEFAULT_PLAN_ROWS)
+
+
+def _run_postgres_migrations(conn) -> bool:
+    """
+    PostgreSQL-specific migrations using SQLAlchemy.
     
+    Runs in three phases, each committed on its own so no single transaction
+    holds locks across tables, index builds and constraints at once.
+    Returns False if any index build failed.
+    """
     print("[MIGRATE] Running PostgreSQL migrations...")
     
-    # Users table
-    conn.execute(text("""
-        CREATE TABLE IF NOT EXISTS users (
-            id SERIAL PRIMARY KEY,
-            email TEXT UNIQUE NOT NULL,
-            password_hash TEXT NOT NULL,
-            account_id INTEGER,
-            role TEXT DEFAULT 'member',
-            is_active BOOLEAN DEFAULT TRUE,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """))
-    conn.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS idx_users_email_unique ON users(email)"))
-    
-    # Accounts table
-    conn.execute(text("""
-        CREATE TABLE IF NOT EXISTS accounts (
-            id SERIAL PRIMARY KEY,
-            name TEXT NOT NULL,
-            owner_id INTEGER REFERENCES users(id),
-            plan TEXT DEFAULT 'free',
-            stripe_customer_id TEXT,
-            stripe_subscription_id TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """))
+    _pg_phase1_tables(conn)
+    commit(conn)
     
-    # Account memberships table
-    conn.execute(text("""
-        CREATE TABLE IF NOT EXISTS account_memberships (
-            id SERIAL PRIMARY KEY,
-            account_id INTEGER NOT NULL REFERENCES accounts(id),
-            user_id INTEGER NOT NULL REFERENCES users(id),
-            role TEXT DEFAULT 'member',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            UNIQUE(account_id, user_id)
-        )
-    """))
+    # One catalog read replaces an IF NOT EXISTS round-trip per index
+    existing_indexes = _pg_existing(conn, _SQL_PG_EXISTING_INDEXES)
+    indexes_ok = _pg_phase2_indexes(existing_indexes)
     
-    # Plans table
-    conn.execute(text("""
-        CREATE TABLE IF NOT EXISTS plans (
-            id SERIAL PRIMARY KEY,
-            name TEXT UNIQUE NOT NULL,
-            price_monthly REAL NOT NULL,
-            max_saved_deals INTEGER DEFAULT 10,
-            max_scenarios INTEGER DEFAULT 3,
-            features_json TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """))
-    
-    # Subscriptions table
-    conn.execute(text("""
-        CREATE TABLE IF NOT EXISTS subscriptions (
-            id SERIAL PRIMARY KEY,
-            account_id INTEGER NOT NULL REFERENCES accounts(id),
-            plan_id INTEGER NOT NULL,
-            status TEXT DEFAULT 'active',
-            plan_name TEXT DEFAULT 'free',
-            provider TEXT DEFAULT 'manual',
-            provider_customer_id TEXT,
-            provider_subscription_id TEXT,
-            stripe_subscription_id TEXT,
-            cancel_at_period_end INTEGER DEFAULT 0,
-            current_period_start TIMESTAMP,
-            current_period_end TIMESTAMP,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP
-        )
-    """))
-    conn.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS idx_subscriptions_account_unique ON subscriptions(account_id)"))
-    
-    # Saved properties table
-    conn.execute(text("""
-        CREATE TABLE IF NOT EXISTS saved_properties (
-            id SERIAL PRIMARY KEY,
-            account_id INTEGER NOT NULL DEFAULT 1,
-            user_id INTEGER,
-            property_name TEXT,
-            city TEXT,
-            state TEXT,
-            zip_code TEXT,
-            strategy TEXT,
-            investor_profile TEXT,
-            purchase_price REAL,
-            rehab_budget REAL,
-            monthly_rent REAL,
-            hold_years REAL,
-            estimated_roi REAL,
-            cashflow_per_month REAL,
-            cap_rate REAL,
-            coc_return REAL,
-            noi REAL,
-            dscr REAL,
-            total_investment REAL,
-            irr_unlevered REAL,
-            npv_unlevered REAL,
-            arv REAL,
-            rehab_months REAL,
-            holding_months REAL,
-            holding_costs_monthly REAL,
-            selling_costs_pct REAL,
-            flip_profit REAL,
-            profit_per_month REAL,
-            deal_grade TEXT,
-            risk_level TEXT,
-            tags_json TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """))
-    conn.execute(text("CREATE INDEX IF NOT EXISTS idx_saved_properties_account_id ON saved_properties(account_id)"))
-    conn.execute(text("CREATE INDEX IF NOT EXISTS idx_saved_properties_account_created ON saved_properties(account_id, created_at)"))
-    
-    # Trashed properties table
-    conn.execute(text("""
-        CREATE TABLE IF NOT EXISTS trashed_properties (
-            trash_id SERIAL PRIMARY KEY,
-            account_id INTEGER,
-            saved_row_json TEXT,
-            deleted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """))
-    conn.execute(text("CREATE INDEX IF NOT EXISTS idx_trashed_properties_account_id ON trashed_properties(account_id)"))
-    
-    # Scenarios table
-    conn.execute(text("""
-        CREATE TABLE IF NOT EXISTS scenarios (
-            id SERIAL PRIMARY KEY,
-            account_id INTEGER NOT NULL,
-            property_id INTEGER NOT NULL,
-            slot TEXT NOT NULL CHECK (slot IN ('A', 'B', 'C')),
-            label TEXT,
-            metrics_json TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            UNIQUE(account_id, property_id, slot)
-        )
-    """))
-    conn.execute(text("CREATE INDEX IF NOT EXISTS idx_scenarios_account_property ON scenarios(account_id, property_id)"))
-    
-    # Auth sessions table
-    conn.execute(text("""
-        CREATE TABLE IF NOT EXISTS auth_sessions (
-            id TEXT PRIMARY KEY,
-            user_id INTEGER NOT NULL REFERENCES users(id),
-            account_id INTEGER NOT NULL,
-            refresh_token_hash TEXT NOT NULL,
-            created_at TIMESTAMP NOT NULL,
-            expires_at TIMESTAMP NOT NULL,
-            revoked_at TIMESTAMP NULL,
-            user_agent TEXT NULL,
-            ip TEXT NULL
-        )
-    """))
-    conn.execute(text("CREATE INDEX IF NOT EXISTS idx_auth_sessions_user_id ON auth_sessions(user_id)"))
-    conn.execute(text("CREATE INDEX IF NOT EXISTS idx_auth_sessions_account_id ON auth_sessions(account_id)"))
-    conn.execute(text("CREATE INDEX IF NOT EXISTS idx_auth_sessions_expires_at ON auth_sessions(expires_at)"))
-    
-    # Resume codes table
-    conn.execute(text("""
-        CREATE TABLE IF NOT EXISTS resume_codes (
-            code TEXT PRIMARY KEY,
-            session_id TEXT NOT NULL REFERENCES auth_sessions(id),
-            refresh_token_hash TEXT NOT NULL,
-            created_at TIMESTAMP NOT NULL,
-            expires_at TIMESTAMP NOT NULL,
-            used_at TIMESTAMP NULL
-        )
-    """))
-    conn.execute(text("CREATE INDEX IF NOT EXISTS idx_resume_codes_expires_at ON resume_codes(expires_at)"))
-    
-    # Affiliates table
-    conn.execute(text("""
-        CREATE TABLE IF NOT EXISTS affiliates (
-            id SERIAL PRIMARY KEY,
-            user_id INTEGER NOT NULL REFERENCES users(id),
-            referral_code TEXT UNIQUE NOT NULL,
-            commission_rate REAL DEFAULT 0.1,
-            total_earned REAL DEFAULT 0.0,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """))
-    
-    # Referrals table
-    conn.execute(text("""
-        CREATE TABLE IF NOT EXISTS referrals (
-            id SERIAL PRIMARY KEY,
-            affiliate_id INTEGER NOT NULL REFERENCES affiliates(id),
-            referred_user_id INTEGER NOT NULL REFERENCES users(id),
-            referred_account_id INTEGER NOT NULL REFERENCES accounts(id),
-            commission_amount REAL DEFAULT 0.0,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """))
-    
-    # Assets table (Property Search + Assets)
-    conn.execute(text("""
-        CREATE TABLE IF NOT EXISTS assets (
-            id SERIAL PRIMARY KEY,
-            account_id INTEGER NOT NULL,
-            name TEXT,
-            address TEXT,
-            city TEXT,
-            state TEXT,
-            zip_code TEXT,
-            notes TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """))
-    conn.execute(text("CREATE INDEX IF NOT EXISTS idx_assets_account_id ON assets(account_id)"))
-    
-    # Property index table (Property Search)
-    conn.execute(text("""
-        CREATE TABLE IF NOT EXISTS property_index (
-            id SERIAL PRIMARY KEY,
-            account_id INTEGER NOT NULL,
-            asset_id INTEGER REFERENCES assets(id),
-            address TEXT,
-            city TEXT,
-            state TEXT,
-            zip_code TEXT,
-            county TEXT,
-            property_type TEXT,
-            bedrooms INTEGER,
-            bathrooms REAL,
-            sqft INTEGER,
-            lot_size REAL,
-            year_built INTEGER,
-            zoning TEXT,
-            last_sale_date TEXT,
-            last_sale_price REAL,
-            assessed_value REAL,
-            market_value REAL,
-            owner_name TEXT,
-            owner_type TEXT,
-            occupancy_status TEXT,
-            rental_estimate REAL,
-            notes TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """))
-    conn.execute(text("CREATE INDEX IF NOT EXISTS idx_property_index_account_id ON property_index(account_id)"))
-    conn.execute(text("CREATE INDEX IF NOT EXISTS idx_property_index_asset_id ON property_index(asset_id)"))
-    conn.execute(text("CREATE INDEX IF NOT EXISTS idx_property_index_city_state ON property_index(city, state)"))
+    _pg_phase3_constraints(conn, existing_indexes)
+    commit(conn)
     
     print("[MIGRATE] PostgreSQL migrations complete")
+    return indexes_ok
+
+
+def _pg_existing(conn, sql: str) -> set:
+    """Names from a single-column pg_catalog query."""
+    return {row[0] for row in conn.exec_driver_sql(sql)}
+
+
+def _pg_phase1_tables(conn) -> None:
+    """Phase 1: create missing tables (one multi-statement script)."""
+    existing = _pg_existing(conn, _SQL_PG_EXISTING_TABLES)
+    missing = [ddl for name, ddl in _PG_TABLES_BY_NAME.items() if name not in existing]
+    if missing:
+        # Dict order keeps referenced tables ahead of the tables that reference them
+        conn.exec_driver_sql(_join_script(missing))
+
+
+def _pg_phase2_indexes(existing_indexes: set) -> bool:
+    """
+    Phase 2: build lookup indexes with CREATE INDEX CONCURRENTLY, one each.
+    
+    CONCURRENTLY cannot run inside a transaction block, so this uses its own
+    autocommit connection. Returns False if any build failed.
+    """
+    ok = True
+    with get_db_connection() as conn:
+        conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+        for index_name, ddl in _PG_CONCURRENT_INDEXES:
+            if index_name in existing_indexes:
+                continue
+            try:
+                conn.exec_driver_sql(ddl)
+            except Exception as e:
+                ok = False
+                # A failed concurrent build leaves an INVALID index that
+                # IF NOT EXISTS would skip forever; drop it so a later run retries
+                print(f"[MIGRATE] Warning: Could not build index {index_name}: {e}")
+                try:
+                    conn.exec_driver_sql(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
+                except Exception as drop_error:
+                    print(f"[MIGRATE] Warning: Could not drop invalid index {index_name}: {drop_error}")
+    return ok
+
+
+def _pg_phase3_constraints(conn, existing_indexes: set) -> None:
+    """Phase 3: unique indexes, NOT NULL and CHECK constraints."""
+    missing = [ddl for name, ddl in _PG_UNIQUE_INDEXES_BY_NAME.items() if name not in existing_indexes]
+    if missing:
+        conn.exec_driver_sql(_join_script(missing))
+    not_null = _pg_existing(conn, _SQL_PG_NOT_NULL_COLUMNS)
+    for table, column, backfill in _PG_NOT_NULL_COLUMNS:
+        if f"{table}.{column}" not in not_null:
+            _ensure_not_null(conn, table, column, backfill)
+    conn.exec_driver_sql(PG_CHECKS_SCRIPT)
+
+
+def _ensure_not_null(conn, table: str, column: str, backfill: str) -> None:
+    """
+    Backfill NULLs, then SET NOT NULL without scanning under an exclusive lock.
+    
+    A bare SET NOT NULL scans the whole table while holding ACCESS EXCLUSIVE.
+    Instead a CHECK (column IS NOT NULL) is added NOT VALID (no scan), then
+    validated under SHARE UPDATE EXCLUSIVE, which lets reads and writes
+    continue. SET NOT NULL then trusts the valid check instead of scanning
+    (Postgres 12+), and the helper check is dropped. Each step commits, so
+    no lock is held past its own step.
+    """
+    check = f"{table}_{column}_not_null"
+    conn.exec_driver_sql(f"UPDATE {table} SET {column} = {backfill} WHERE {column} IS NULL")
+    commit(conn)
+    # A crashed earlier run may have left the helper check behind
+    conn.exec_driver_sql(
+        f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {check}, "
+        f"ADD CONSTRAINT {check} CHECK ({column} IS NOT NULL) NOT VALID"
+    )
+    commit(conn)
+    conn.exec_driver_sql(f"ALTER TABLE {table} VALIDATE CONSTRAINT {check}")
+    commit(conn)
+    conn.exec_driver_sql(f"ALTER TABLE {table} ALTER COLUMN {column} SET NOT NULL")
+    conn.exec_driver_sql(f"ALTER TABLE {table} DROP CONSTRAINT {check}")
+    commit(conn)
 
 
 def _run_sqlite_migrations(conn) -> None:
     """SQLite-specific migrations using sqlite3."""
     print("[MIGRATE] Running SQLite migrations...")
     
-    cur = conn.cursor()
-    
-    # Users table
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            email TEXT UNIQUE NOT NULL,
-            password_hash TEXT NOT NULL,
-            account_id INTEGER,
-            role TEXT DEFAULT 'member',
-            is_active BOOLEAN DEFAULT 1,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_users_email_unique ON users(email)")
-    
-    # Accounts table
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS accounts (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            owner_id INTEGER,
-            plan TEXT DEFAULT 'free',
-            stripe_customer_id TEXT,
-            stripe_subscription_id TEXT,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (owner_id) REFERENCES users (id)
-        )
-    """)
-    
-    # Add plan columns if missing (idempotent)
-    _ensure_sqlite_column(cur, conn, "accounts", "plan", "TEXT DEFAULT 'free'")
-    _ensure_sqlite_column(cur, conn, "accounts", "stripe_customer_id", "TEXT")
-    _ensure_sqlite_column(cur, conn, "accounts", "stripe_subscription_id", "TEXT")
-    
-    # Account memberships table
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS account_memberships (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            account_id INTEGER NOT NULL,
-            user_id INTEGER NOT NULL,
-            role TEXT DEFAULT 'member',
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (account_id) REFERENCES accounts (id),
-            FOREIGN KEY (user_id) REFERENCES users (id),
-            UNIQUE(account_id, user_id)
-        )
-    """)
-    
-    # Plans table
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS plans (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT UNIQUE NOT NULL,
-            price_monthly REAL NOT NULL,
-            max_saved_deals INTEGER DEFAULT 10,
-            max_scenarios INTEGER DEFAULT 3,
-            features_json TEXT,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
+    for pragma in _SQLITE_MIGRATION_PRAGMAS:
+        conn.execute(pragma)
     
-    # Subscriptions table
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS subscriptions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            account_id INTEGER NOT NULL,
-            plan_id INTEGER NOT NULL,
-            status TEXT DEFAULT 'active',
-            plan_name TEXT DEFAULT 'free',
-            provider TEXT DEFAULT 'manual',
-            provider_customer_id TEXT,
-            provider_subscription_id TEXT,
-            stripe_subscription_id TEXT,
-            cancel_at_period_end INTEGER DEFAULT 0,
-            current_period_start TEXT,
-            current_period_end TEXT,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            updated_at TEXT,
-            FOREIGN KEY (account_id) REFERENCES accounts (id),
-            FOREIGN KEY (plan_id) REFERENCES plans (id)
-        )
-    """)
-    cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_subscriptions_account_unique ON subscriptions(account_id)")
+    conn.executescript(_SQLITE_TABLES_TXN)
+    invalidate_table_columns()  # the script may have created tables
     
-    # Add subscription columns if missing (idempotent)
-    _ensure_sqlite_column(cur, conn, "subscriptions", "plan_name", "TEXT DEFAULT 'free'")
-    _ensure_sqlite_column(cur, conn, "subscriptions", "provider", "TEXT DEFAULT 'manual'")
-    _ensure_sqlite_column(cur, conn, "subscriptions", "provider_customer_id", "TEXT")
-    _ensure_sqlite_column(cur, conn, "subscriptions", "provider_subscription_id", "TEXT")
-    _ensure_sqlite_column(cur, conn, "subscriptions", "cancel_at_period_end", "INTEGER DEFAULT 0")
-    _ensure_sqlite_column(cur, conn, "subscriptions", "updated_at", "TEXT")
+    # ALTERs must see the committed tables; indexes may depend on added columns
+    _ensure_sqlite_columns(conn.cursor(), conn, _SQLITE_COLUMNS)
     
-    # Saved properties table
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS saved_properties (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            account_id INTEGER DEFAULT 1,
-            user_id INTEGER,
-            property_name TEXT,
-            city TEXT,
-            state TEXT,
-            zip_code TEXT,
-            strategy TEXT,
-            investor_profile TEXT,
-            purchase_price REAL,
-            rehab_budget REAL,
-            monthly_rent REAL,
-            hold_years REAL,
-            estimated_roi REAL,
-            cashflow_per_month REAL,
-            cap_rate REAL,
-            coc_return REAL,
-            noi REAL,
-            dscr REAL,
-            total_investment REAL,
-            irr_unlevered REAL,
-            npv_unlevered REAL,
-            arv REAL,
-            rehab_months REAL,
-            holding_months REAL,
-            holding_costs_monthly REAL,
-            selling_costs_pct REAL,
-            flip_profit REAL,
-            profit_per_month REAL,
-            deal_grade TEXT,
-            risk_level TEXT,
-            tags_json TEXT,
-            created_at TEXT
-        )
-    """)
-    _ensure_sqlite_column(cur, conn, "saved_properties", "user_id", "INTEGER")
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_saved_properties_account_id ON saved_properties(account_id)")
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_saved_properties_account_created ON saved_properties(account_id, created_at)")
-    
-    # Trashed properties table
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS trashed_properties (
-            trash_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            account_id INTEGER,
-            saved_row_json TEXT,
-            deleted_at TEXT
-        )
-    """)
-    _ensure_sqlite_column(cur, conn, "trashed_properties", "account_id", "INTEGER")
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_trashed_properties_account_id ON trashed_properties(account_id)")
-    
-    # Scenarios table
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS scenarios (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            account_id INTEGER NOT NULL,
-            property_id INTEGER NOT NULL,
-            slot TEXT NOT NULL CHECK (slot IN ('A', 'B', 'C')),
-            label TEXT,
-            metrics_json TEXT NOT NULL,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            UNIQUE(account_id, property_id, slot)
-        )
-    """)
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_scenarios_account_property ON scenarios(account_id, property_id)")
-    
-    # Auth sessions table
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS auth_sessions (
-            id TEXT PRIMARY KEY,
-            user_id INTEGER NOT NULL,
-            account_id INTEGER NOT NULL,
-            refresh_token_hash TEXT NOT NULL,
-            created_at TEXT NOT NULL,
-            expires_at TEXT NOT NULL,
-            revoked_at TEXT NULL,
-            user_agent TEXT NULL,
-            ip TEXT NULL,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-    """)
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_auth_sessions_user_id ON auth_sessions(user_id)")
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_auth_sessions_account_id ON auth_sessions(account_id)")
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_auth_sessions_expires_at ON auth_sessions(expires_at)")
-    
-    # Resume codes table
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS resume_codes (
-            code TEXT PRIMARY KEY,
-            session_id TEXT NOT NULL,
-            refresh_token_hash TEXT NOT NULL,
-            created_at TEXT NOT NULL,
-            expires_at TEXT NOT NULL,
-            used_at TEXT NULL,
-            FOREIGN KEY (session_id) REFERENCES auth_sessions (id)
-        )
-    """)
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_resume_codes_expires_at ON resume_codes(expires_at)")
-    
-    # Affiliates table
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS affiliates (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            referral_code TEXT UNIQUE NOT NULL,
-            commission_rate REAL DEFAULT 0.1,
-            total_earned REAL DEFAULT 0.0,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-    """)
-    
-    # Referrals table
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS referrals (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            affiliate_id INTEGER NOT NULL,
-            referred_user_id INTEGER NOT NULL,
-            referred_account_id INTEGER NOT NULL,
-            commission_amount REAL DEFAULT 0.0,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (affiliate_id) REFERENCES affiliates (id),
-            FOREIGN KEY (referred_user_id) REFERENCES users (id),
-            FOREIGN KEY (referred_account_id) REFERENCES accounts (id)
-        )
-    """)
-    
-    # Assets table
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS assets (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            account_id INTEGER NOT NULL,
-            name TEXT,
-            address TEXT,
-            city TEXT,
-            state TEXT,
-            zip_code TEXT,
-            notes TEXT,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            updated_at TEXT DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_assets_account_id ON assets(account_id)")
-    
-    # Property index table
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS property_index (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            account_id INTEGER NOT NULL,
-            asset_id INTEGER,
-            address TEXT,
-            city TEXT,
-            state TEXT,
-            zip_code TEXT,
-            county TEXT,
-            property_type TEXT,
-            bedrooms INTEGER,
-            bathrooms REAL,
-            sqft INTEGER,
-            lot_size REAL,
-            year_built INTEGER,
-            zoning TEXT,
-            last_sale_date TEXT,
-            last_sale_price REAL,
-            assessed_value REAL,
-            market_value REAL,
-            owner_name TEXT,
-            owner_type TEXT,
-            occupancy_status TEXT,
-            rental_estimate REAL,
-            notes TEXT,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (asset_id) REFERENCES assets (id)
-        )
-    """)
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_property_index_account_id ON property_index(account_id)")
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_property_index_asset_id ON property_index(asset_id)")
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_property_index_city_state ON property_index(city, state)")
+    conn.executescript(_SQLITE_INDEXES_TXN)
     
     print("[MIGRATE] SQLite migrations complete")
 
 
-def _ensure_sqlite_column(cur, conn, table: str, column: str, ddl: str) -> None:
-    """Add column to SQLite table if missing (idempotent)."""
-    cur.execute(f"PRAGMA table_info({table})")
-    columns = {row[1] for row in cur.fetchall()}
+def _ensure_sqlite_columns(cur, conn, specs) -> None:
+    """
+    Add missing SQLite columns (idempotent).
     
-    if column not in columns:
-        try:
-            cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
-            conn.commit()
-            print(f"[MIGRATE] Added column {table}.{column}")
-        except Exception as e:
-            if "duplicate column" not in str(e).lower():
-                print(f"[MIGRATE] Warning: Could not add {table}.{column}: {e}")
+    specs is a sequence of (table, column, ddl). Each table is introspected
+    once, and all ALTERs share a single transaction (one commit, one fsync).
+    """
+    by_table = defaultdict(list)
+    for table, column, ddl in specs:
+        by_table[table].append((column, ddl))
+    
+    cur.execute("BEGIN")
+    try:
+        for table, columns_to_add in by_table.items():
+            existing = sqlite_table_columns(conn, table)
+            
+            for column, ddl in columns_to_add:
+                if column in existing:
+                    continue
+                try:
+                    cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+                    invalidate_table_columns(table)
+                    print(f"[MIGRATE] Added column {table}.{column}")
+                except Exception as e:
+                    if "duplicate column" not in str(e).lower():
+                        print(f"[MIGRATE] Warning: Could not add {table}.{column}: {e}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
 
 
 if __name__ == "__main__":
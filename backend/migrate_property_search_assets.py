@@ -13,14 +13,161 @@ Run: python -m backend.migrate_property_search_assets
 
 from __future__ import annotations
 
+import re
 import sqlite3
+import zlib
 from pathlib import Path as FsPath
 
 # Import config
 try:
-    from backend.config import DATABASE_PATH
+    from backend.config import DATABASE_PATH, IS_DEV
+    from backend.db import sqlite_table_columns, invalidate_table_columns
 except ModuleNotFoundError:
-    from config import DATABASE_PATH
+    from config import DATABASE_PATH, IS_DEV
+    from db import sqlite_table_columns, invalidate_table_columns
+
+
+# One-shot migration window: nothing else is writing and every step is
+# idempotent (IF NOT EXISTS, column-existence checks), so a crashed run is
+# simply re-run. synchronous=OFF drops the fsync on commit; WAL (which the app
+# uses anyway, and which persists) keeps ROLLBACK working, which
+# journal_mode=OFF would not. The rest are per-connection and end with it.
+_MIGRATION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+)
+
+# Dev seed rows for account 1: (account_id, address_line1, city, state,
+# postal_code, country, display_address, data). Other tenants may already have
+# rows, so ids are assigned above the current MAX(id) at seed time.
+_SAMPLE_PROPERTIES = (
+    (1, "123 Main St", "Atlanta", "GA", "30301", "US", "123 Main St, Atlanta, GA 30301", '{"beds": 3, "baths": 2.0, "sqft": 1500, "est_price": 250000}'),
+    (1, "456 Oak Ave", "Atlanta", "GA", "30302", "US", "456 Oak Ave, Atlanta, GA 30302", '{"beds": 4, "baths": 2.5, "sqft": 2000, "est_price": 325000}'),
+    (1, "789 Pine Rd", "Decatur", "GA", "30030", "US", "789 Pine Rd, Decatur, GA 30030", '{"beds": 2, "baths": 1.0, "sqft": 1100, "est_price": 175000}'),
+    (1, "321 Elm St", "Atlanta", "GA", "30303", "US", "321 Elm St, Atlanta, GA 30303", '{"beds": 3, "baths": 2.0, "sqft": 1600, "est_price": 280000}'),
+    (1, "654 Maple Dr", "Marietta", "GA", "30060", "US", "654 Maple Dr, Marietta, GA 30060", '{"beds": 4, "baths": 3.0, "sqft": 2200, "est_price": 375000}'),
+)
+_SQL_SEED_PROPERTY = (
+    "INSERT INTO property_index (id, account_id, address_line1, city, state, postal_code, country, display_address, data) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+# FTS5 index for address search (MATCH instead of a LIKE '%q%' scan).
+# property_index ids are only unique per tenant (PRIMARY KEY (account_id, id)),
+# so they cannot serve as an external-content rowid; the FTS table keeps its
+# own copy of the two text columns plus the key as UNINDEXED columns. Search
+# joins back on (account_id, property_id). property_fts_rowid maps each key to
+# its FTS rowid, so the delete/update triggers find the FTS row by rowid
+# instead of scanning the UNINDEXED columns. Inside a trigger,
+# last_insert_rowid() is the rowid of the FTS row the trigger just inserted.
+_PROPERTY_FTS_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS property_fts USING fts5(
+        display_address,
+        city,
+        account_id UNINDEXED,
+        property_id UNINDEXED,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS property_fts_rowid (
+        account_id INTEGER NOT NULL,
+        property_id INTEGER NOT NULL,
+        fts_rowid INTEGER NOT NULL,
+        PRIMARY KEY (account_id, property_id)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS property_index_fts_insert AFTER INSERT ON property_index BEGIN
+        INSERT INTO property_fts (display_address, city, account_id, property_id)
+        VALUES (new.display_address, new.city, new.account_id, new.id);
+        INSERT INTO property_fts_rowid (account_id, property_id, fts_rowid)
+        VALUES (new.account_id, new.id, last_insert_rowid());
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS property_index_fts_delete AFTER DELETE ON property_index BEGIN
+        DELETE FROM property_fts WHERE rowid = (
+            SELECT fts_rowid FROM property_fts_rowid
+            WHERE account_id = old.account_id AND property_id = old.id
+        );
+        DELETE FROM property_fts_rowid WHERE account_id = old.account_id AND property_id = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS property_index_fts_update AFTER UPDATE ON property_index BEGIN
+        DELETE FROM property_fts WHERE rowid = (
+            SELECT fts_rowid FROM property_fts_rowid
+            WHERE account_id = old.account_id AND property_id = old.id
+        );
+        DELETE FROM property_fts_rowid WHERE account_id = old.account_id AND property_id = old.id;
+        INSERT INTO property_fts (display_address, city, account_id, property_id)
+        VALUES (new.display_address, new.city, new.account_id, new.id);
+        INSERT INTO property_fts_rowid (account_id, property_id, fts_rowid)
+        VALUES (new.account_id, new.id, last_insert_rowid());
+    END
+    """,
+)
+_PROPERTY_FTS_TRIGGERS = ("property_index_fts_insert", "property_index_fts_delete", "property_index_fts_update")
+
+# FTS5 index for asset search. assets.id is a real rowid, so this one is an
+# external-content table (no second copy of the text); the triggers follow
+# the FTS5 docs, passing the old values to the 'delete' command.
+_ASSETS_FTS_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS assets_fts USING fts5(
+        name,
+        address_line1,
+        city,
+        content = 'assets',
+        content_rowid = 'id',
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS assets_fts_insert AFTER INSERT ON assets BEGIN
+        INSERT INTO assets_fts (rowid, name, address_line1, city)
+        VALUES (new.id, new.name, new.address_line1, new.city);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS assets_fts_delete AFTER DELETE ON assets BEGIN
+        INSERT INTO assets_fts (assets_fts, rowid, name, address_line1, city)
+        VALUES ('delete', old.id, old.name, old.address_line1, old.city);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS assets_fts_update AFTER UPDATE ON assets BEGIN
+        INSERT INTO assets_fts (assets_fts, rowid, name, address_line1, city)
+        VALUES ('delete', old.id, old.name, old.address_line1, old.city);
+        INSERT INTO assets_fts (rowid, name, address_line1, city)
+        VALUES (new.id, new.name, new.address_line1, new.city);
+    END
+    """,
+)
+
+# Columns assets gained after it first shipped: (column, ddl). ADD COLUMN ...
+# DEFAULT is metadata-only and existing rows read the default, so only
+# postal_code needs a backfill.
+_ASSETS_COLUMNS = (
+    ("created_by", "INTEGER"),
+    ("address_line1", "TEXT"),  # structured addresses
+    ("address_line2", "TEXT"),
+    ("postal_code", "TEXT"),  # standardized name for zip_code
+    ("country", "TEXT DEFAULT 'US'"),
+    ("source", "TEXT DEFAULT 'property_search'"),
+    ("source_ref", "TEXT"),
+    ("property_data", "BLOB DEFAULT '{}'"),  # JSON bytes; older rows hold JSON text
+)
+
+# Rows per UPDATE when backfilling account_id on legacy rows
+BACKFILL_BATCH_SIZE = 5000
+
+# Scenarios per executemany when compressing metrics_json into metrics_blob
+SCENARIO_BATCH_SIZE = 1000
 
 
 def get_db_path() -> str:
@@ -36,83 +183,74 @@ def migrate() -> None:
     conn = sqlite3.connect(db_path)
     conn.row_factory = sqlite3.Row
     cur = conn.cursor()
+    for pragma in _MIGRATION_PRAGMAS:
+        cur.execute(pragma)
     
     print("[MIGRATION] Starting Property Search + Assets migration...")
     
+    # Every step runs in one transaction: a single commit (one fsync) instead
+    # of one per ALTER, and a failed run leaves the schema untouched.
+    # Statements go through cur.execute, not conn.executescript: executescript
+    # COMMITs any open transaction before it runs, which would split this one,
+    # and most steps branch on introspection done earlier in the same run.
+    cur.execute("BEGIN")
+    try:
+        _migrate(cur)
+        conn.commit()
+        # Data backfills run after the schema commit, in bounded batches
+        _backfill_account_ids(conn)
+        _compress_scenario_metrics(conn)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+        # Cache entries are keyed by id(conn), which a later connection may reuse
+        invalidate_table_columns()
+    
+    print("[MIGRATION] ✅ Migration completed successfully!")
+    print("[MIGRATION] Summary:")
+    print("[MIGRATION]   - assets table: hardened with created_by, structured addresses, tenant indexes")
+    print("[MIGRATION]   - property_index table: created/updated with tenant isolation")
+    print("[MIGRATION]   - Legacy data: backfilled with account_id=1 (dev)")
+    print("[MIGRATION]   - Sample data: seeded for account 1 if it had none (dev only)")
+
+
+def _migrate(cur) -> None:
+    """Schema evolution and seed data; the caller owns the transaction."""
+    
     # ========================================================================
     # STEP 1: Ensure assets table has proper schema
     # ========================================================================
     print("[MIGRATION] Checking assets table schema...")
     
-    # Check existing columns
-    cur.execute("PRAGMA table_info(assets)")
-    existing_cols = {row[1] for row in cur.fetchall()}
+    added = _add_missing_columns(cur, "assets", _ASSETS_COLUMNS)
     
-    # Add created_by column if missing
-    if "created_by" not in existing_cols:
-        print("[MIGRATION] Adding created_by column to assets...")
-        cur.execute("ALTER TABLE assets ADD COLUMN created_by INTEGER")
-        conn.commit()
-        print("[MIGRATION] ✅ Added assets.created_by")
-    else:
-        print("[MIGRATION] ✅ assets.created_by already exists")
+    # One-time copy from zip_code. Not a GENERATED column: the assets API
+    # writes postal_code directly. The column was just added (all NULL),
+    # so only rows that have a zip_code need rewriting.
+    if "postal_code" in added and "zip_code" in sqlite_table_columns(cur.connection, "assets"):
+        cur.execute("UPDATE assets SET postal_code = zip_code WHERE zip_code IS NOT NULL")
     
-    # Add address_line1, address_line2 if missing (for structured addresses)
-    if "address_line1" not in existing_cols:
-        print("[MIGRATION] Adding address_line1 column to assets...")
-        cur.execute("ALTER TABLE assets ADD COLUMN address_line1 TEXT")
-        conn.commit()
-        print("[MIGRATION] ✅ Added assets.address_line1")
-    
-    if "address_line2" not in existing_cols:
-        print("[MIGRATION] Adding address_line2 column to assets...")
-        cur.execute("ALTER TABLE assets ADD COLUMN address_line2 TEXT")
-        conn.commit()
-        print("[MIGRATION] ✅ Added assets.address_line2")
-    
-    # Add postal_code if missing (standardized name)
-    if "postal_code" not in existing_cols:
-        print("[MIGRATION] Adding postal_code column to assets...")
-        cur.execute("ALTER TABLE assets ADD COLUMN postal_code TEXT")
-        # Backfill from zip_code if it exists
-        if "zip_code" in existing_cols:
-            cur.execute("UPDATE assets SET postal_code = zip_code WHERE postal_code IS NULL")
-        conn.commit()
-        print("[MIGRATION] ✅ Added assets.postal_code")
-    
-    # Add country column if missing
-    if "country" not in existing_cols:
-        print("[MIGRATION] Adding country column to assets...")
-        cur.execute("ALTER TABLE assets ADD COLUMN country TEXT DEFAULT 'US'")
-        conn.commit()
-        print("[MIGRATION] ✅ Added assets.country")
-    
-    # Add source columns if missing
-    if "source" not in existing_cols:
-        print("[MIGRATION] Adding source column to assets...")
-        cur.execute("ALTER TABLE assets ADD COLUMN source TEXT DEFAULT 'property_search'")
-        conn.commit()
-        print("[MIGRATION] ✅ Added assets.source")
-    
-    if "source_ref" not in existing_cols:
-        print("[MIGRATION] Adding source_ref column to assets...")
-        cur.execute("ALTER TABLE assets ADD COLUMN source_ref TEXT")
-        conn.commit()
-        print("[MIGRATION] ✅ Added assets.source_ref")
-    
-    # Add property_data column if missing
-    if "property_data" not in existing_cols:
-        print("[MIGRATION] Adding property_data column to assets...")
-        cur.execute("ALTER TABLE assets ADD COLUMN property_data TEXT DEFAULT '{}'")
-        conn.commit()
-        print("[MIGRATION] ✅ Added assets.property_data")
+    # Declare assets.name NOCASE so plain comparisons can use the NOCASE index
+    _ensure_nocase_columns(cur, "assets", ("name",))
     
     # Ensure indexes for tenant filtering
     print("[MIGRATION] Creating indexes for assets...")
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_assets_account_created ON assets(account_id, created_at DESC)")
+    # (created_at, id) is the list keyset; this supersedes (account_id, created_at DESC)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_assets_account_created_id ON assets(account_id, created_at DESC, id DESC)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_assets_account_name ON assets(account_id, name COLLATE NOCASE)")
-    conn.commit()
     print("[MIGRATION] ✅ Created assets indexes")
+    _drop_prefix_indexes(cur, "assets")
+    
+    # Full-text index over name/address/city, kept in sync by triggers
+    cur.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='assets_fts'")
+    assets_fts_exists = cur.fetchone() is not None
+    for ddl in _ASSETS_FTS_DDL:
+        cur.execute(ddl)
+    if not assets_fts_exists:
+        cur.execute("INSERT INTO assets_fts (assets_fts) VALUES ('rebuild')")
+        print("[MIGRATION] ✅ Created assets_fts and indexed existing assets")
     
     # ========================================================================
     # STEP 2: Create or update property_index table (tenant-scoped search cache)
@@ -120,107 +258,280 @@ def migrate() -> None:
     print("[MIGRATION] Checking property_index table...")
     
     # Check if table exists
-    cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='property_index'")
-    table_exists = cur.fetchone() is not None
+    cur.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name='property_index'")
+    table_row = cur.fetchone()
+    table_exists = table_row is not None
     
     if not table_exists:
         print("[MIGRATION] Creating property_index table...")
+        # Clustered on (account_id, id): a tenant's rows share contiguous pages
+        # and tenant-scoped reads need no separate index -> rowid lookup
         cur.execute("""
             CREATE TABLE property_index (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                id INTEGER NOT NULL,
                 account_id INTEGER NOT NULL,
-                address_line1 TEXT,
-                city TEXT,
+                address_line1 TEXT COLLATE NOCASE,
+                city TEXT COLLATE NOCASE,
                 state TEXT,
                 postal_code TEXT,
                 country TEXT DEFAULT 'US',
-                display_address TEXT,
+                display_address TEXT COLLATE NOCASE,
                 data TEXT DEFAULT '{}',
                 created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
-            )
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (account_id, id)
+            ) WITHOUT ROWID
         """)
-        conn.commit()
+        clustered = True
         print("[MIGRATION] ✅ Created property_index table")
     else:
         print("[MIGRATION] ✅ property_index table already exists")
+        clustered = "WITHOUT ROWID" in (table_row[0] or "").upper()
         
         # Ensure account_id column exists
-        cur.execute("PRAGMA table_info(property_index)")
-        property_index_cols = {row[1] for row in cur.fetchall()}
-        
-        if "account_id" not in property_index_cols:
-            print("[MIGRATION] Adding account_id column to property_index...")
-            cur.execute("ALTER TABLE property_index ADD COLUMN account_id INTEGER NOT NULL DEFAULT 1")
-            conn.commit()
-            print("[MIGRATION] ✅ Added property_index.account_id")
+        _add_missing_columns(cur, "property_index", (("account_id", "INTEGER NOT NULL DEFAULT 1"),))
     
     # Create indexes for property_index
     print("[MIGRATION] Creating indexes for property_index...")
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_property_index_account_address ON property_index(account_id, display_address COLLATE NOCASE)")
+    if clustered:
+        # The primary key already leads with account_id
+        cur.execute("DROP INDEX IF EXISTS idx_property_index_account_address")
+    else:
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_property_index_account_address ON property_index(account_id, display_address COLLATE NOCASE)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_property_index_account_city ON property_index(account_id, city COLLATE NOCASE)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_property_index_account_postal ON property_index(account_id, postal_code)")
-    conn.commit()
+    # Serves search's ORDER BY created_at DESC LIMIT in index order (no temp
+    # B-tree sort). Not covering: the search also returns the data JSON,
+    # which is too large to duplicate into an index
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_property_index_account_created ON property_index(account_id, created_at DESC)")
     print("[MIGRATION] ✅ Created property_index indexes")
+    _drop_prefix_indexes(cur, "property_index")
     
-    # ========================================================================
-    # STEP 3: Backfill account_id for legacy data (DEV ONLY)
-    # ========================================================================
-    print("[MIGRATION] Checking for legacy data to backfill...")
+    # Full-text index over the searchable address fields, kept in sync by triggers
+    cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name IN ('property_fts', 'property_fts_rowid')")
+    fts_current = len(cur.fetchall()) == 2
+    if not fts_current:
+        # Missing, or built before property_fts_rowid (triggers that scan):
+        # rebuild the index, its rowid map and the triggers from property_index
+        for trigger in _PROPERTY_FTS_TRIGGERS:
+            cur.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        cur.execute("DROP TABLE IF EXISTS property_fts")
+        cur.execute("DROP TABLE IF EXISTS property_fts_rowid")
+    for ddl in _PROPERTY_FTS_DDL:
+        cur.execute(ddl)
+    if not fts_current:
+        cur.execute(
+            "INSERT INTO property_fts (display_address, city, account_id, property_id) "
+            "SELECT display_address, city, account_id, id FROM property_index"
+        )
+        indexed = cur.rowcount
+        cur.execute(
+            "INSERT INTO property_fts_rowid (account_id, property_id, fts_rowid) "
+            "SELECT account_id, property_id, rowid FROM property_fts"
+        )
+        print(f"[MIGRATION] ✅ Created property_fts and indexed {indexed} rows")
     
-    # Backfill assets.account_id if NULL (set to 1 for dev)
-    cur.execute("SELECT COUNT(*) FROM assets WHERE account_id IS NULL")
-    null_account_count = cur.fetchone()[0]
-    if null_account_count > 0:
-        print(f"[MIGRATION] Backfilling {null_account_count} assets with account_id=1...")
-        cur.execute("UPDATE assets SET account_id = 1 WHERE account_id IS NULL")
-        conn.commit()
-        print(f"[MIGRATION] ✅ Backfilled {null_account_count} assets")
-    
-    # Backfill property_index.account_id if NULL (set to 1 for dev)
-    cur.execute("SELECT COUNT(*) FROM property_index WHERE account_id IS NULL")
-    null_property_index_count = cur.fetchone()[0]
-    if null_property_index_count > 0:
-        print(f"[MIGRATION] Backfilling {null_property_index_count} property_index rows with account_id=1...")
-        cur.execute("UPDATE property_index SET account_id = 1 WHERE account_id IS NULL")
-        conn.commit()
-        print(f"[MIGRATION] ✅ Backfilled {null_property_index_count} property_index rows")
+    # Compressed scenario metrics (filled from metrics_json after the commit)
+    if sqlite_table_columns(cur.connection, "scenarios"):
+        _add_missing_columns(cur, "scenarios", (("metrics_blob", "BLOB"),))
     
     # ========================================================================
-    # STEP 4: Seed property_index with sample data for testing (if empty)
+    # STEP 4: Seed property_index with sample data for account 1 (dev only)
     # ========================================================================
-    cur.execute("SELECT COUNT(*) FROM property_index")
-    property_index_count = cur.fetchone()[0]
-    
-    if property_index_count == 0:
-        print("[MIGRATION] Seeding property_index with sample data...")
-        sample_properties = [
-            (1, "123 Main St", "Atlanta", "GA", "30301", "US", "123 Main St, Atlanta, GA 30301", '{"beds": 3, "baths": 2.0, "sqft": 1500, "est_price": 250000}'),
-            (1, "456 Oak Ave", "Atlanta", "GA", "30302", "US", "456 Oak Ave, Atlanta, GA 30302", '{"beds": 4, "baths": 2.5, "sqft": 2000, "est_price": 325000}'),
-            (1, "789 Pine Rd", "Decatur", "GA", "30030", "US", "789 Pine Rd, Decatur, GA 30030", '{"beds": 2, "baths": 1.0, "sqft": 1100, "est_price": 175000}'),
-            (1, "321 Elm St", "Atlanta", "GA", "30303", "US", "321 Elm St, Atlanta, GA 30303", '{"beds": 3, "baths": 2.0, "sqft": 1600, "est_price": 280000}'),
-            (1, "654 Maple Dr", "Marietta", "GA", "30060", "US", "654 Maple Dr, Marietta, GA 30060", '{"beds": 4, "baths": 3.0, "sqft": 2200, "est_price": 375000}'),
-        ]
-        
-        for prop in sample_properties:
-            cur.execute("""
-                INSERT INTO property_index (account_id, address_line1, city, state, postal_code, country, display_address, data)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, prop)
+    # Any existing account-1 row stops the check; no full-table COUNT(*)
+    if IS_DEV:
+        cur.execute("SELECT 1 FROM property_index WHERE account_id = 1 LIMIT 1")
+        if cur.fetchone() is None:
+            print("[MIGRATION] Seeding property_index with sample data...")
+            cur.execute("SELECT COALESCE(MAX(id), 0) FROM property_index")
+            next_id = cur.fetchone()[0] + 1
+            cur.executemany(
+                _SQL_SEED_PROPERTY,
+                [(next_id + i, *row) for i, row in enumerate(_SAMPLE_PROPERTIES)],
+            )
+            print(f"[MIGRATION] ✅ Seeded {len(_SAMPLE_PROPERTIES)} sample properties")
+
+
+
+def _add_missing_columns(cur, table: str, wanted) -> list:
+    """
+    Add each (column, ddl) in wanted that table lacks; returns the added names.
+    
+    Plain execute() calls, not executescript(): executescript() would COMMIT
+    the migration's open transaction first.
+    """
+    existing = sqlite_table_columns(cur.connection, table)
+    missing = [(column, ddl) for column, ddl in wanted if column not in existing]
+    for column, ddl in missing:
+        cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+        print(f"[MIGRATION] ✅ Added {table}.{column}")
+    if missing:
+        invalidate_table_columns(table)
+    return [column for column, _ in missing]
+
+
+def _backfill_account_ids(conn) -> None:
+    """
+    STEP 3: Backfill account_id for legacy data (DEV ONLY).
+    
+    Each table is updated BACKFILL_BATCH_SIZE rows at a time, committing per
+    batch, so a large table never builds one huge journal and an interrupted
+    run keeps its progress (the UPDATE is idempotent).
+    """
+    print("[MIGRATION] Checking for legacy data to backfill...")
+    cur = conn.cursor()
+    for table in ("assets", "property_index"):
+        cur.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (table,))
+        row = cur.fetchone()
+        if row is None or "WITHOUT ROWID" in (row[0] or "").upper():
+            continue  # account_id is part of the primary key there, never NULL
         
+        # Transient partial index holding only the NULL rows: each batch jumps
+        # straight to them instead of rescanning past already-fixed rows
+        null_index = f"idx_{table}_null_account"
+        cur.execute(f"CREATE INDEX IF NOT EXISTS {null_index} ON {table}(account_id) WHERE account_id IS NULL")
+        try:
+            backfilled = 0
+            while True:
+                cur.execute(
+                    f"UPDATE {table} SET account_id = 1 WHERE rowid IN "
+                    f"(SELECT rowid FROM {table} WHERE account_id IS NULL LIMIT ?)",
+                    (BACKFILL_BATCH_SIZE,),
+                )
+                if cur.rowcount <= 0:
+                    break
+                backfilled += cur.rowcount
+                conn.commit()
+                print(f"[MIGRATION] Backfilling {table} with account_id=1... {backfilled} rows")
+            if backfilled:
+                print(f"[MIGRATION] ✅ Backfilled {backfilled} {table} rows")
+        finally:
+            conn.commit()
+            cur.execute(f"DROP INDEX IF EXISTS {null_index}")
+
+
+def _compress_scenario_metrics(conn) -> None:
+    """
+    One-shot fill of the compressed metrics_blob from scenarios.metrics_json.
+    
+    The stored text is compressed as-is (no parse/re-serialize round trip), so
+    json_codec.loads_compressed() returns exactly what loads(metrics_json)
+    does. metrics_json is left in place: clearing it is a separate, later
+    step once nothing reads it. Runs SCENARIO_BATCH_SIZE rows per
+    executemany, committing per batch.
+    """
+    if "metrics_blob" not in sqlite_table_columns(conn, "scenarios"):
+        return
+    cur = conn.cursor()
+    converted = 0
+    while True:
+        cur.execute(
+            "SELECT id, metrics_json FROM scenarios WHERE metrics_blob IS NULL LIMIT ?",
+            (SCENARIO_BATCH_SIZE,),
+        )
+        rows = cur.fetchall()
+        if not rows:
+            break
+        cur.executemany(
+            "UPDATE scenarios SET metrics_blob = ? WHERE id = ?",
+            [(zlib.compress((row[1] or "null").encode("utf-8")), row[0]) for row in rows],
+        )
         conn.commit()
-        print(f"[MIGRATION] ✅ Seeded {len(sample_properties)} sample properties")
+        converted += len(rows)
+    if converted:
+        print(f"[MIGRATION] ✅ Compressed metrics for {converted} scenarios")
+
+
+def _ensure_nocase_columns(cur, table: str, columns) -> None:
+    """
+    Rebuild table so the given TEXT columns are declared COLLATE NOCASE.
     
-    # ========================================================================
-    # DONE
-    # ========================================================================
-    conn.close()
-    print("[MIGRATION] ✅ Migration completed successfully!")
-    print("[MIGRATION] Summary:")
-    print("[MIGRATION]   - assets table: hardened with created_by, structured addresses, tenant indexes")
-    print("[MIGRATION]   - property_index table: created/updated with tenant isolation")
-    print("[MIGRATION]   - Legacy data: backfilled with account_id=1 (dev)")
-    print("[MIGRATION]   - Sample data: seeded if property_index was empty")
+    SQLite cannot change a column's collation in place, so this uses the
+    documented shadow-table rebuild: create table_new from the current DDL
+    with the collation added, copy rows, drop, rename, then recreate the
+    table's indexes and triggers. A no-op once every column is already NOCASE, so it runs
+    once per database. The caller owns the transaction.
+    """
+    cur.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (table,))
+    row = cur.fetchone()
+    if row is None:
+        return
+    ddl = row[0]
+    
+    pending = []
+    for column in columns:
+        pattern = re.compile(rf"([(,]\s*){column}\s+TEXT\b(?!\s+COLLATE)", re.IGNORECASE)
+        if pattern.search(ddl):
+            ddl = pattern.sub(rf"\g<1>{column} TEXT COLLATE NOCASE", ddl, count=1)
+            pending.append(column)
+    if not pending:
+        return
+    
+    print(f"[MIGRATION] Rebuilding {table} with COLLATE NOCASE on {', '.join(pending)}...")
+    # DROP TABLE takes the table's indexes and triggers with it
+    cur.execute("SELECT sql FROM sqlite_master WHERE type IN ('index', 'trigger') AND tbl_name=? AND sql IS NOT NULL", (table,))
+    index_sqls = [r[0] for r in cur.fetchall()]
+    
+    # DROP TABLE also deletes the table's sqlite_sequence row, and the copy
+    # only re-seeds it from MAX(id); keep the high-water mark so AUTOINCREMENT
+    # never hands out the id of an already-deleted row again
+    seq = None
+    if "AUTOINCREMENT" in ddl.upper():
+        cur.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,))
+        seq_row = cur.fetchone()
+        seq = seq_row[0] if seq_row else None
+    
+    shadow = f"{table}_new"
+    shadow_ddl = re.sub(rf"^CREATE TABLE\s+(?:IF NOT EXISTS\s+)?(\"?){table}\1", f"CREATE TABLE {shadow}", ddl, count=1, flags=re.IGNORECASE)
+    cur.execute(f"DROP TABLE IF EXISTS {shadow}")
+    cur.execute(shadow_ddl)
+    # Same DDL, same column order, so a positional copy is exact
+    cur.execute(f"INSERT INTO {shadow} SELECT * FROM {table}")
+    cur.execute(f"DROP TABLE {table}")
+    cur.execute(f"ALTER TABLE {shadow} RENAME TO {table}")
+    if seq is not None:
+        # The copy creates the row only if it inserted anything
+        cur.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?", (seq, table))
+        if cur.rowcount == 0:
+            cur.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (table, seq))
+    invalidate_table_columns(table)
+    for index_sql in index_sqls:
+        cur.execute(index_sql)
+    print(f"[MIGRATION] ✅ Rebuilt {table} ({len(index_sqls)} indexes/triggers restored)")
+
+
+def _index_keys(cur, index_name: str) -> tuple:
+    """Key columns of an index as (column, collation, desc) tuples, in order."""
+    cur.execute(f"PRAGMA index_xinfo({index_name})")
+    return tuple((row[2], row[4].upper(), row[3]) for row in cur.fetchall() if row[5])
+
+
+def _drop_prefix_indexes(cur, table: str) -> None:
+    """
+    Drop plain indexes that are a left prefix of another index on table.
+    
+    SQLite can serve any query on (account_id) or (account_id, city) from an
+    index on (account_id, city, state), so the narrower index only costs
+    writes and pages. Every composite here leads with account_id: the tenant
+    filter is on every query, so it must be the first column for the rest of
+    the index to be usable at all. Unique, primary-key and partial indexes
+    are never dropped (they enforce or select something).
+    """
+    cur.execute(f"PRAGMA index_list({table})")
+    indexes = [(row[1], row[2], row[3], row[4]) for row in cur.fetchall()]
+    # Partial indexes cover only some rows, so they never cover another index
+    keys = {name: _index_keys(cur, name) for name, _, _, partial in indexes if not partial}
+    
+    for name, unique, origin, partial in indexes:
+        if unique or partial or origin != "c":
+            continue
+        prefix = keys[name]
+        if any(
+            other != name and len(other_keys) > len(prefix) and other_keys[:len(prefix)] == prefix
+            for other, other_keys in keys.items()
+        ):
+            cur.execute(f"DROP INDEX IF EXISTS {name}")
+            print(f"[MIGRATION] ✅ Dropped redundant index {name} (left prefix of a wider index)")
 
 
 if __name__ == "__main__":
@@ -2,6 +2,12 @@ from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
+from functools import cached_property
+
+try:
+    from backend import json_codec
+except ModuleNotFoundError:
+    import json_codec
 
 # Enums
 class UserRole(str, Enum):
@@ -73,5 +79,13 @@ class Scenario(BaseModel):
     property_id: int
     slot: str  # "A", "B", "C"
     label: Optional[str] = None
-    metrics_json: str  # JSON-serialized analysis output
-    created_at: datetime = Field(default_factory=datetime.utcnow)
\ No newline at end of file
+    metrics_json: str  # JSON-serialized analysis output (kept alongside metrics_blob)
+    metrics_blob: Optional[bytes] = None  # zlib-compressed JSON, see json_codec.dumps_compressed
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    @cached_property
+    def metrics(self) -> Dict[str, Any]:
+        """Decoded metrics, parsed on first access only."""
+        if self.metrics_blob is not None:
+            return json_codec.loads_compressed(self.metrics_blob)
+        return json_codec.loads(self.metrics_json)
\ No newline at end of file
@@ -9,15 +9,22 @@ Effective capabilities = intersection of plan capabilities AND role capabilities
 Key principle: A role can NEVER grant more than the plan allows (SaaS security).
 
 Pure Python logic - no FastAPI imports, no database access.
+
+Plan and role names are matched exactly first and only casefolded on a miss,
+so callers holding already-normalized (lowercase) strings, such as the Role
+constants or values read from the database, skip normalization entirely.
 """
 
-from typing import Set
+import functools
+from types import MappingProxyType
+from typing import FrozenSet, Mapping
 
-# Import capabilities and plan mapping from authz
+# Import capabilities, plan mapping and the role hierarchy from authz
+# (ROLE_HIERARCHY, role_level and role_at_least are re-exported here)
 try:
-    from backend.authz import Capability, PLAN_CAPABILITIES
+    from backend.authz import Capability, PLAN_CAPABILITIES, ROLE_HIERARCHY, role_at_least, role_level
 except ModuleNotFoundError:
-    from authz import Capability, PLAN_CAPABILITIES
+    from authz import Capability, PLAN_CAPABILITIES, ROLE_HIERARCHY, role_at_least, role_level
 
 
 # ============================================================================
@@ -36,8 +43,8 @@ class Role:
 # Role to Capabilities Mapping
 # ============================================================================
 
-ROLE_CAPABILITIES: dict[str, Set[str]] = {
-    "owner": {
+ROLE_CAPABILITIES: dict[str, FrozenSet[str]] = {
+    "owner": frozenset({
         # Owner has access to ALL capabilities (subject to plan limits)
         Capability.PROJECT_CREATE,
         Capability.PROJECT_VIEW,
@@ -48,8 +55,8 @@ ROLE_CAPABILITIES: dict[str, Set[str]] = {
         Capability.ANALYSIS_SINGLE_PROPERTY,
         Capability.ANALYSIS_PORTFOLIO,
         Capability.EXPORT_CSV,
-    },
-    "admin": {
+    }),
+    "admin": frozenset({
         # Admin has most capabilities except billing/ownership-level operations
         Capability.PROJECT_CREATE,
         Capability.PROJECT_VIEW,
@@ -60,8 +67,8 @@ ROLE_CAPABILITIES: dict[str, Set[str]] = {
         Capability.ANALYSIS_SINGLE_PROPERTY,
         Capability.ANALYSIS_PORTFOLIO,
         Capability.EXPORT_CSV,
-    },
-    "member": {
+    }),
+    "member": frozenset({
         # Member can perform normal operations (create, analyze, manage portfolio)
         Capability.PROJECT_CREATE,
         Capability.PROJECT_VIEW,
@@ -72,14 +79,14 @@ ROLE_CAPABILITIES: dict[str, Set[str]] = {
         Capability.ANALYSIS_SINGLE_PROPERTY,
         Capability.ANALYSIS_PORTFOLIO,
         Capability.EXPORT_CSV,
-    },
-    "read_only": {
+    }),
+    "read_only": frozenset({
         # Read-only can only view, no create/update/delete operations
         Capability.PROJECT_VIEW,
         Capability.ASSET_VIEW,
         Capability.SEARCH_BASIC,
         Capability.ANALYSIS_SINGLE_PROPERTY,
-    },
+    }),
 }
 
 
@@ -87,7 +94,20 @@ ROLE_CAPABILITIES: dict[str, Set[str]] = {
 # Effective Capability Calculation
 # ============================================================================
 
-def effective_capabilities(plan: str, role: str) -> Set[str]:
+# Every (plan, role) intersection, computed once: the matrix is static, so the
+# hot path is one dict lookup instead of a new set per authorization check.
+# Read-only view, so no caller can mutate the shared table.
+_EFFECTIVE_CAPS: Mapping[tuple[str, str], FrozenSet[str]] = MappingProxyType({
+    (plan, role): frozenset(plan_caps & role_caps)
+    for plan, plan_caps in PLAN_CAPABILITIES.items()
+    for role, role_caps in ROLE_CAPABILITIES.items()
+})
+
+_NO_CAPABILITIES: FrozenSet[str] = frozenset()
+
+
+@functools.lru_cache(maxsize=256)
+def effective_capabilities(plan: str, role: str) -> FrozenSet[str]:
     """
     Calculate effective capabilities by intersecting plan and role capabilities.
     
@@ -100,19 +120,16 @@ def effective_capabilities(plan: str, role: str) -> Set[str]:
         role: User role (e.g., "owner", "admin", "member", "read_only")
     
     Returns:
-        Set of capability strings that are allowed by BOTH plan AND role.
-        Returns empty set if plan or role is unknown.
+        Frozen set of capability strings that are allowed by BOTH plan AND role
+        (shared, do not mutate). Returns empty set if plan or role is unknown.
     """
-    # Normalize to lowercase
-    plan_lower = plan.lower() if plan else ""
-    role_lower = role.lower() if role else ""
-    
-    # Get capabilities from plan and role
-    plan_caps = PLAN_CAPABILITIES.get(plan_lower, set())
-    role_caps = ROLE_CAPABILITIES.get(role_lower, set())
-    
-    # Return intersection: only capabilities allowed by BOTH plan AND role
-    return plan_caps & role_caps
+    caps = _EFFECTIVE_CAPS.get((plan, role))
+    if caps is not None:
+        return caps
+    return _EFFECTIVE_CAPS.get(
+        (plan.casefold() if plan else "", role.casefold() if role else ""),
+        _NO_CAPABILITIES,
+    )
 
 
 def has_effective_capability(plan: str, role: str, capability: str) -> bool:
@@ -128,44 +145,5 @@ def has_effective_capability(plan: str, role: str, capability: str) -> bool:
         True if the capability is allowed by BOTH the plan AND the role.
         Returns False for unknown plans, roles, or capabilities.
     """
-    effective_caps = effective_capabilities(plan, role)
-    return capability in effective_caps
-
+    return capability in effective_capabilities(plan, role)
 
-# ============================================================================
-# Role Hierarchy Helpers
-# ============================================================================
-
-ROLE_HIERARCHY = {
-    "owner": 4,
-    "admin": 3,
-    "member": 2,
-    "read_only": 1,
-}
-
-
-def role_level(role: str) -> int:
-    """
-    Get numeric level for a role.
-    
-    Args:
-        role: Role name
-    
-    Returns:
-        Numeric level (higher = more privileged), 0 if unknown
-    """
-    return ROLE_HIERARCHY.get(role.lower() if role else "", 0)
-
-
-def role_at_least(user_role: str, required_role: str) -> bool:
-    """
-    Check if user_role meets or exceeds required_role in hierarchy.
-    
-    Args:
-        user_role: User's actual role
-        required_role: Minimum required role
-    
-    Returns:
-        True if user_role >= required_role in hierarchy
-    """
-    return role_level(user_role) >= role_level(required_role)
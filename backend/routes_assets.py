@@ -14,24 +14,27 @@ Security guarantees:
 
 from __future__ import annotations
 
-import json
+import base64
+import binascii
 import sqlite3
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Path
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Response
 
 # Import auth and capability dependencies
 try:
-    from backend.auth_context import AuthContext, require_auth_context, get_db
+    from backend.auth_context import AuthContext, require_auth_context, get_ro_conn, get_rw_conn
     from backend.dependencies import require_capability
-    from backend.schemas_assets import AssetCreateRequest, AssetResponse, AssetListResponse
+    from backend.schemas_assets import AssetCreateRequest, AssetResponse, AssetListResponse, AssetBulkCreateResponse, MAX_BULK_ASSETS
     from backend.config import IS_DEV
+    from backend import json_codec
 except ModuleNotFoundError:
-    from auth_context import AuthContext, require_auth_context, get_db
+    from auth_context import AuthContext, require_auth_context, get_ro_conn, get_rw_conn
     from dependencies import require_capability
-    from schemas_assets import AssetCreateRequest, AssetResponse, AssetListResponse
+    from schemas_assets import AssetCreateRequest, AssetResponse, AssetListResponse, AssetBulkCreateResponse, MAX_BULK_ASSETS
     from config import IS_DEV
+    import json_codec
 
 
 router = APIRouter(
@@ -40,6 +43,197 @@ router = APIRouter(
 )
 
 
+# SQL is built once at import: the connection's statement cache
+# (cached_statements=256) is keyed by SQL text, so every request reuses the
+# prepared statement instead of re-parsing a freshly concatenated string.
+# Security: account_id and created_by are always bound from the auth context.
+_SQL_INSERT_ASSET = """
+    INSERT INTO assets (
+        account_id,
+        created_by,
+        name,
+        address_line1,
+        address_line2,
+        city,
+        state,
+        postal_code,
+        country,
+        source,
+        source_ref,
+        property_data,
+        created_at,
+        updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_SELECT_ASSET = """
+    SELECT 
+        id,
+        name,
+        address_line1,
+        address_line2,
+        city,
+        state,
+        postal_code,
+        country,
+        source,
+        source_ref,
+        property_data,
+        created_at,
+        updated_at
+    FROM assets
+"""
+
+_SQL_GET_ASSET = _SQL_SELECT_ASSET + " WHERE id = ? AND account_id = ?"
+
+# RETURNING folds the existence check into the delete itself
+_SQL_DELETE_ASSET = "DELETE FROM assets WHERE id = ? AND account_id = ? RETURNING id"
+
+# list_assets search filters: prefix phrase match on the assets_fts index (a
+# leading-wildcard LIKE cannot use one), and the LIKE scan it falls back to.
+# No lower()-ed shadow columns: SQLite's lower() and LIKE only fold ASCII,
+# while the unicode61 tokenizer folds case and diacritics, so FTS is both the
+# indexed path and the more forgiving one. LIKE is already case-insensitive,
+# and with a leading % no collation lets it use an index anyway.
+# The search term is bound twice and may be NULL (no q): the `? IS NULL`
+# short-circuits the filter, so one statement per path also serves plain
+# listing, with the same plan (the account's created_at index walk).
+_LIST_FILTERS = {
+    "fts": " AND (? IS NULL OR id IN (SELECT rowid FROM assets_fts WHERE assets_fts MATCH ?))",
+    "like": """
+      AND (
+          ? IS NULL
+          OR name LIKE ? ESCAPE '\\'
+          OR address_line1 LIKE ? ESCAPE '\\'
+          OR city LIKE ? ESCAPE '\\'
+      )
+    """,
+}
+
+# (filter, has_cursor) -> statement; with a cursor the page seeks past the
+# previous page's last (created_at, id) instead of using OFFSET
+_SQL_LIST_ASSETS = {
+    (name, has_cursor): (
+        _SQL_SELECT_ASSET
+        + " WHERE account_id = ?"
+        + (" AND (created_at, id) < (?, ?)" if has_cursor else "")
+        + where
+        + " ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?"
+    )
+    for name, where in _LIST_FILTERS.items()
+    for has_cursor in (False, True)
+}
+
+
+def _encode_cursor(created_at: str, asset_id: int) -> str:
+    """Opaque list cursor for the (created_at, id) keyset of the last row on a page."""
+    return base64.urlsafe_b64encode(f"{created_at}|{asset_id}".encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> Tuple[str, int]:
+    """
+    Parse a cursor from _encode_cursor().
+    
+    Raises:
+        HTTPException(400): Malformed cursor
+    """
+    try:
+        created_at, _, asset_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").rpartition("|")
+        return created_at, int(asset_id)
+    except (binascii.Error, UnicodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") of the last timestamp; swapped as one
+# tuple so concurrent requests never pair a second with another's prefix
+_ts_cache = (-1, "")
+
+
+def _utc_now_iso() -> str:
+    """
+    Current UTC time as "YYYY-MM-DDTHH:MM:SS.ffffffZ".
+    
+    The date/time prefix is formatted once per second; each call only adds
+    the microseconds. Always six fraction digits (isoformat() drops them at
+    exactly .000000), so stored values sort correctly as text.
+    """
+    global _ts_cache
+    second, ns = divmod(time.time_ns(), 1_000_000_000)
+    cached = _ts_cache
+    if cached[0] != second:
+        cached = (second, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second)))
+        _ts_cache = cached
+    return f"{cached[1]}.{ns // 1000:06d}Z"
+
+
+def _asset_insert_params(
+    request: AssetCreateRequest, account_id: int, user_id: int, now: str
+) -> Tuple[Any, ...]:
+    """Bind parameters for _SQL_INSERT_ASSET (account_id/user_id from the auth context)."""
+    return (
+        account_id,
+        user_id,
+        request.name,
+        request.address_line1,
+        request.address_line2,
+        request.city,
+        request.state,
+        request.postal_code,
+        request.country,
+        "property_search",  # Default source
+        request.source_ref,
+        # property_data is stored as the encoder's UTF-8 bytes (a BLOB;
+        # SQLite never converts BLOBs, even in a TEXT-declared column)
+        json_codec.dumps(request.property_data),
+        now,
+        now,
+    )
+
+
+def _parse_property_data(value) -> Dict[str, Any]:
+    """
+    Decode a stored property_data value (empty dict if missing or invalid).
+    
+    New rows hold JSON bytes, older ones JSON text; the codec takes either.
+    """
+    try:
+        return json_codec.loads(value) if value else {}
+    except (ValueError, TypeError):
+        return {}
+
+
+def _asset_row_dicts(rows) -> List[Dict[str, Any]]:
+    """
+    Build AssetResponse-shaped dicts from plain-tuple rows of _SQL_SELECT_ASSET.
+    
+    Rows are unpacked by position and the values come from our own table,
+    so they go straight to the JSON encoder with no model in between.
+    """
+    return [
+        {
+            "id": str(id_),
+            "name": name or "",
+            "address_line1": address_line1,
+            "address_line2": address_line2,
+            "city": city,
+            "state": state,
+            "postal_code": postal_code,
+            "country": country or "US",
+            "source": source or "property_search",
+            "source_ref": source_ref,
+            "property_data": _parse_property_data(property_data),
+            "created_at": created_at or "",
+            "updated_at": updated_at or "",
+        }
+        for (id_, name, address_line1, address_line2, city, state, postal_code,
+             country, source, source_ref, property_data, created_at, updated_at) in rows
+    ]
+
+
+# Handlers are plain `def` on purpose: FastAPI runs them on its worker thread
+# pool, so DB reads and the JSON work in _asset_row_dicts never
+# block the event loop, and each worker thread keeps its own read connection
+# (get_ro_conn). An `async def` handler would run on the loop thread itself.
 @router.post("", response_model=AssetResponse, dependencies=[Depends(require_capability("assets:manage"))])
 def create_asset(
     request: AssetCreateRequest,
@@ -66,67 +260,29 @@ def create_asset(
         HTTPException(403): Missing capability (handled by dependency)
         HTTPException(500): Database error
     """
-    conn = get_db()
-    cur = conn.cursor()
-    
     # Security: account_id and user_id from auth context ONLY
     account_id = ctx.account_id
     user_id = ctx.user_id
     
     # Timestamps
-    now = datetime.utcnow().isoformat() + "Z"
-    
-    # Serialize property_data to JSON
-    property_data_json = json.dumps(request.property_data)
+    now = _utc_now_iso()
     
     try:
-        # Insert asset
+        # Insert asset (one BEGIN IMMEDIATE ... COMMIT on the shared writer)
         # Security: account_id and created_by from auth context
-        cur.execute(
-            """
-            INSERT INTO assets (
-                account_id,
-                created_by,
-                name,
-                address_line1,
-                address_line2,
-                city,
-                state,
-                postal_code,
-                country,
-                source,
-                source_ref,
-                property_data,
-                created_at,
-                updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                account_id,
-                user_id,
-                request.name,
-                request.address_line1,
-                request.address_line2,
-                request.city,
-                request.state,
-                request.postal_code,
-                request.country,
-                "property_search",  # Default source
-                request.source_ref,
-                property_data_json,
-                now,
-                now,
+        with get_rw_conn() as conn:
+            cur = conn.execute(
+                _SQL_INSERT_ASSET,
+                _asset_insert_params(request, account_id, user_id, now),
             )
-        )
-        
-        asset_id = cur.lastrowid
-        conn.commit()
+            asset_id = cur.lastrowid
         
         if IS_DEV:
             print(f"[ASSETS] Created asset_id={asset_id}, account_id={account_id}, user_id={user_id}")
         
-        # Return created asset
-        return AssetResponse(
+        # Return created asset. Every value was validated on the way in (or
+        # generated here), so skip re-validating them
+        return AssetResponse.model_construct(
             id=str(asset_id),
             name=request.name,
             address_line1=request.address_line1,
@@ -147,18 +303,79 @@ def create_asset(
         if IS_DEV:
             print(f"[ASSETS] DB error on create: {e}")
         raise HTTPException(status_code=500, detail="Database error")
+
+
+@router.post("/bulk", response_model=AssetBulkCreateResponse, dependencies=[Depends(require_capability("assets:manage"))])
+def create_assets_bulk(
+    requests: List[AssetCreateRequest],
+    ctx: AuthContext = Depends(require_auth_context),
+) -> AssetBulkCreateResponse:
+    """
+    Create many assets in a single transaction.
+    
+    One executemany inside one BEGIN IMMEDIATE ... COMMIT, so a bulk import
+    pays for one WAL commit instead of one per asset.
     
-    finally:
-        conn.close()
+    Security:
+    - Requires capability "assets:manage"
+    - account_id and created_by from auth context ONLY (never from client)
+    - Every item validated via Pydantic schema
+    
+    Args:
+        requests: List of AssetCreateRequest (max MAX_BULK_ASSETS)
+        ctx: Authenticated context with account_id and user_id
+    
+    Returns:
+        AssetBulkCreateResponse with the created count and id range
+    
+    Raises:
+        HTTPException(400): Too many assets in one request
+        HTTPException(403): Missing capability (handled by dependency)
+        HTTPException(500): Database error
+    """
+    if len(requests) > MAX_BULK_ASSETS:
+        raise HTTPException(status_code=400, detail=f"Too many assets (max {MAX_BULK_ASSETS} per request)")
+    if not requests:
+        return AssetBulkCreateResponse(created=0)
+    
+    account_id = ctx.account_id
+    user_id = ctx.user_id
+    now = _utc_now_iso()
+    
+    try:
+        with get_rw_conn() as conn:
+            cur = conn.executemany(
+                _SQL_INSERT_ASSET,
+                [_asset_insert_params(r, account_id, user_id, now) for r in requests],
+            )
+            created = cur.rowcount
+            # The write lock is held for the whole batch, so its ids are the
+            # contiguous run ending at the last inserted rowid
+            last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        
+        if IS_DEV:
+            print(f"[ASSETS] Bulk created {created} assets, account_id={account_id}, user_id={user_id}")
+        
+        return AssetBulkCreateResponse(
+            created=created,
+            first_id=str(last_id - created + 1),
+            last_id=str(last_id),
+        )
+    
+    except sqlite3.Error as e:
+        if IS_DEV:
+            print(f"[ASSETS] DB error on bulk create: {e}")
+        raise HTTPException(status_code=500, detail="Database error")
 
 
 @router.get("", response_model=AssetListResponse, dependencies=[Depends(require_capability("assets:read"))])
 def list_assets(
     q: Optional[str] = Query(None, min_length=1, max_length=200, description="Search query (name/address)"),
     limit: int = Query(50, ge=1, le=200, description="Max results (default 50, max 200)"),
-    offset: int = Query(0, ge=0, le=5000, description="Offset for pagination (default 0, max 5000)"),
+    offset: int = Query(0, ge=0, le=5000, deprecated=True, description="Offset for pagination (deprecated: use cursor)"),
+    cursor: Optional[str] = Query(None, max_length=200, description="next_cursor from the previous page"),
     ctx: AuthContext = Depends(require_auth_context),
-) -> AssetListResponse:
+) -> Response:
     """
     List assets for the authenticated account.
     
@@ -170,119 +387,88 @@ def list_assets(
     Args:
         q: Optional search query (name/address)
         limit: Max results (default 50, max 200)
-        offset: Pagination offset (default 0, max 5000)
+        offset: Pagination offset (deprecated; ignored when cursor is given)
+        cursor: Keyset cursor (next_cursor of the previous page)
         ctx: Authenticated context with account_id
     
     Returns:
-        AssetListResponse with list of assets
+        JSON Response shaped as AssetListResponse (items, total, has_more, next_cursor)
     
     Raises:
+        HTTPException(400): Invalid cursor
         HTTPException(403): Missing capability (handled by dependency)
         HTTPException(500): Database error
     """
-    conn = get_db()
+    # Keyset pagination: seek past the last (created_at, id) seen instead of
+    # walking and discarding OFFSET rows
+    keyset: Tuple = ()
+    if cursor:
+        keyset = _decode_cursor(cursor)
+        offset = 0
+    
+    # Long-lived per-thread read connection; not closed here
+    conn = get_ro_conn()
     cur = conn.cursor()
+    cur.row_factory = None  # plain tuples; unpacked by position below
     
     # Security: account_id from auth context ONLY
     account_id = ctx.account_id
     
     try:
-        # Build query with optional search filter
-        if q:
-            query_pattern = f"%{q}%"
-            cur.execute(
-                """
-                SELECT 
-                    id,
-                    name,
-                    address_line1,
-                    address_line2,
-                    city,
-                    state,
-                    postal_code,
-                    country,
-                    source,
-                    source_ref,
-                    property_data,
-                    created_at,
-                    updated_at
-                FROM assets
-                WHERE account_id = ?
-                  AND (
-                      name LIKE ? COLLATE NOCASE
-                      OR address_line1 LIKE ? COLLATE NOCASE
-                      OR city LIKE ? COLLATE NOCASE
-                  )
-                ORDER BY created_at DESC
-                LIMIT ? OFFSET ?
-                """,
-                (account_id, query_pattern, query_pattern, query_pattern, limit, offset)
-            )
-        else:
+        params = (account_id, *keyset)
+        # One extra row tells whether there is a next page
+        page = (limit + 1, offset)
+        
+        # Optional search filter (a None term disables it in the statement).
+        # Quote the term so user input cannot inject FTS query syntax
+        match_term = '"' + q.replace('"', '""') + '"*' if q else None
+        rows = None
+        try:
+            cur.execute(_SQL_LIST_ASSETS["fts", bool(keyset)], (*params, match_term, match_term, *page))
+            rows = cur.fetchall()
+        except sqlite3.OperationalError as e:
+            # assets_fts missing (migration not run, or no FTS5)
+            if IS_DEV:
+                print(f"[ASSETS] FTS query failed, falling back to LIKE: {e}")
+        
+        if rows is None:
+            query_pattern = None
+            if q:
+                # Escape LIKE wildcards so a literal % or _ in the input matches itself
+                query_pattern = "%" + q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
             cur.execute(
-                """
-                SELECT 
-                    id,
-                    name,
-                    address_line1,
-                    address_line2,
-                    city,
-                    state,
-                    postal_code,
-                    country,
-                    source,
-                    source_ref,
-                    property_data,
-                    created_at,
-                    updated_at
-                FROM assets
-                WHERE account_id = ?
-                ORDER BY created_at DESC
-                LIMIT ? OFFSET ?
-                """,
-                (account_id, limit, offset)
+                _SQL_LIST_ASSETS["like", bool(keyset)],
+                (*params, query_pattern, query_pattern, query_pattern, query_pattern, *page)
             )
+            rows = cur.fetchall()
         
-        rows = cur.fetchall()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = _encode_cursor(last[11] or "", last[0])
         
-        # Build asset list
-        items = []
-        for row in rows:
-            # Parse property_data JSON
-            try:
-                property_data = json.loads(row["property_data"]) if row.get("property_data") else {}
-            except (json.JSONDecodeError, TypeError):
-                property_data = {}
-            
-            asset = AssetResponse(
-                id=str(row["id"]),
-                name=row["name"] or "",
-                address_line1=row.get("address_line1"),
-                address_line2=row.get("address_line2"),
-                city=row.get("city"),
-                state=row.get("state"),
-                postal_code=row.get("postal_code"),
-                country=row.get("country", "US"),
-                source=row.get("source", "property_search"),
-                source_ref=row.get("source_ref"),
-                property_data=property_data,
-                created_at=row["created_at"] or "",
-                updated_at=row["updated_at"] or "",
-            )
-            items.append(asset)
+        items = _asset_row_dicts(rows)
         
         if IS_DEV:
             print(f"[ASSETS] List: account_id={account_id}, q={q!r}, results={len(items)}")
         
-        return AssetListResponse(items=items, total=len(items))
+        # Already AssetListResponse-shaped - encode once, skipping model
+        # construction and jsonable_encoder (response_model stays for the docs)
+        return Response(
+            content=json_codec.dumps({
+                "items": items,
+                "total": len(items),
+                "has_more": next_cursor is not None,
+                "next_cursor": next_cursor,
+            }),
+            media_type="application/json",
+        )
     
     except sqlite3.Error as e:
         if IS_DEV:
             print(f"[ASSETS] DB error on list: {e}")
         raise HTTPException(status_code=500, detail="Database error")
-    
-    finally:
-        conn.close()
 
 
 @router.get("/{asset_id}", response_model=AssetResponse, dependencies=[Depends(require_capability("assets:read"))])
@@ -310,7 +496,8 @@ def get_asset(
         HTTPException(404): Asset not found or access denied
         HTTPException(500): Database error
     """
-    conn = get_db()
+    # Long-lived per-thread read connection; not closed here
+    conn = get_ro_conn()
     cur = conn.cursor()
     
     # Security: account_id from auth context ONLY
@@ -319,24 +506,7 @@ def get_asset(
     try:
         # Query with account_id filter (tenant isolation)
         cur.execute(
-            """
-            SELECT 
-                id,
-                name,
-                address_line1,
-                address_line2,
-                city,
-                state,
-                postal_code,
-                country,
-                source,
-                source_ref,
-                property_data,
-                created_at,
-                updated_at
-            FROM assets
-            WHERE id = ? AND account_id = ?
-            """,
+            _SQL_GET_ASSET,
             (asset_id, account_id)
         )
         
@@ -346,27 +516,21 @@ def get_asset(
             # 404 whether asset doesn't exist or belongs to different account (no info leak)
             raise HTTPException(status_code=404, detail="Asset not found")
         
-        # Parse property_data JSON
-        try:
-            property_data = json.loads(row["property_data"]) if row.get("property_data") else {}
-        except (json.JSONDecodeError, TypeError):
-            property_data = {}
-        
         if IS_DEV:
             print(f"[ASSETS] Get: asset_id={asset_id}, account_id={account_id}")
         
         return AssetResponse(
             id=str(row["id"]),
             name=row["name"] or "",
-            address_line1=row.get("address_line1"),
-            address_line2=row.get("address_line2"),
-            city=row.get("city"),
-            state=row.get("state"),
-            postal_code=row.get("postal_code"),
-            country=row.get("country", "US"),
-            source=row.get("source", "property_search"),
-            source_ref=row.get("source_ref"),
-            property_data=property_data,
+            address_line1=row["address_line1"],
+            address_line2=row["address_line2"],
+            city=row["city"],
+            state=row["state"],
+            postal_code=row["postal_code"],
+            country=row["country"] or "US",
+            source=row["source"] or "property_search",
+            source_ref=row["source_ref"],
+            property_data=_parse_property_data(row["property_data"]),
             created_at=row["created_at"] or "",
             updated_at=row["updated_at"] or "",
         )
@@ -377,9 +541,6 @@ def get_asset(
         if IS_DEV:
             print(f"[ASSETS] DB error on get: {e}")
         raise HTTPException(status_code=500, detail="Database error")
-    
-    finally:
-        conn.close()
 
 
 @router.delete("/{asset_id}", status_code=204, dependencies=[Depends(require_capability("assets:manage"))])
@@ -407,27 +568,20 @@ def delete_asset(
         HTTPException(404): Asset not found or access denied
         HTTPException(500): Database error
     """
-    conn = get_db()
-    cur = conn.cursor()
-    
     # Security: account_id from auth context ONLY
     account_id = ctx.account_id
     
     try:
         # Delete with account_id filter (tenant isolation)
-        cur.execute(
-            """
-            DELETE FROM assets
-            WHERE id = ? AND account_id = ?
-            """,
-            (asset_id, account_id)
-        )
-        
-        if cur.rowcount == 0:
-            # 404 whether asset doesn't exist or belongs to different account (no info leak)
-            raise HTTPException(status_code=404, detail="Asset not found")
-        
-        conn.commit()
+        with get_rw_conn() as conn:
+            cur = conn.execute(
+                _SQL_DELETE_ASSET,
+                (asset_id, account_id)
+            )
+            
+            if cur.fetchone() is None:
+                # 404 whether asset doesn't exist or belongs to different account (no info leak)
+                raise HTTPException(status_code=404, detail="Asset not found")
         
         if IS_DEV:
             print(f"[ASSETS] Deleted: asset_id={asset_id}, account_id={account_id}")
@@ -441,6 +595,3 @@ def delete_asset(
         if IS_DEV:
             print(f"[ASSETS] DB error on delete: {e}")
         raise HTTPException(status_code=500, detail="Database error")
-    
-    finally:
-        conn.close()
@@ -13,22 +13,27 @@ Security guarantees:
 
 from __future__ import annotations
 
+import functools
 import sqlite3
-from typing import Any, Dict, List
+import string
+import time
+from typing import Any, Dict, List, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 
 # Import auth and capability dependencies
 try:
-    from backend.auth_context import AuthContext, require_auth_context, get_db
+    from backend.auth_context import AuthContext, require_auth_context, get_ro_conn
     from backend.dependencies import require_capability
-    from backend.schemas_assets import PropertySearchRequest, PropertySearchResponse, PropertySearchResult
+    from backend.schemas_assets import PropertySearchRequest, PropertySearchResponse
     from backend.config import IS_DEV
+    from backend import json_codec
 except ModuleNotFoundError:
-    from auth_context import AuthContext, require_auth_context, get_db
+    from auth_context import AuthContext, require_auth_context, get_ro_conn
     from dependencies import require_capability
-    from schemas_assets import PropertySearchRequest, PropertySearchResponse, PropertySearchResult
+    from schemas_assets import PropertySearchRequest, PropertySearchResponse
     from config import IS_DEV
+    import json_codec
 
 
 router = APIRouter(
@@ -38,11 +43,140 @@ router = APIRouter(
 )
 
 
+# Built once at import so the connection's statement cache (keyed by SQL
+# text) serves every request. Security: WHERE account_id = ? on both the base
+# table and the FTS subquery ensures tenant isolation.
+_SQL_SELECT_PROPERTY = """
+    SELECT 
+        id,
+        display_address,
+        address_line1,
+        city,
+        state,
+        postal_code,
+        country,
+        data
+    FROM property_index
+    WHERE account_id = ?
+"""
+_SQL_ORDER_PROPERTY = " ORDER BY created_at DESC LIMIT ?"
+
+_SQL_SEARCH_PROPERTY = _SQL_SELECT_PROPERTY + """
+      AND id IN (
+          SELECT property_id FROM property_fts
+          WHERE property_fts MATCH ? AND account_id = ?
+      )
+""" + _SQL_ORDER_PROPERTY
+
+# Fallback when property_fts is missing: partial match scan (LIKE is
+# case-insensitive for ASCII on its own)
+_SQL_SEARCH_PROPERTY_LIKE = _SQL_SELECT_PROPERTY + """
+      AND (
+          display_address LIKE ? ESCAPE '\\'
+          OR city LIKE ? ESCAPE '\\'
+          OR postal_code LIKE ? ESCAPE '\\'
+      )
+""" + _SQL_ORDER_PROPERTY
+
+
+# Autocomplete sends the same prefixes over and over, so results are cached
+# per (account_id, query, limit). property_index is only written outside the
+# API (migration/seed scripts), which this process cannot observe; the TTL
+# bucket in the key bounds how stale a cached result can get.
+_SEARCH_CACHE_TTL_SECONDS = 30
+
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+class _SearchQuery(str):
+    """
+    The query as typed, compared and hashed ignoring ASCII case.
+    
+    FTS (unicode61) folds all case but LIKE only folds ASCII, so queries that
+    differ only in ASCII case return the same rows and can share a cache
+    entry; anything else ("Émile" vs "émile") stays a separate key. The
+    search itself still runs on the text as typed.
+    """
+    
+    def _key(self) -> str:
+        return str.translate(self, _ASCII_LOWER)
+    
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, _SearchQuery):
+            return self._key() == other._key()
+        return NotImplemented
+    
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+
+@functools.lru_cache(maxsize=4096)
+def _search_property_results(
+    account_id: int, query: _SearchQuery, limit: int, ttl_bucket: int
+) -> Tuple[Dict[str, Any], ...]:
+    """
+    Run the property search for one tenant (cached; ttl_bucket is only a key).
+    
+    Returns PropertySearchResult-shaped dicts, shared between requests and
+    only ever read (encoded) by the handler.
+    
+    Raises:
+        sqlite3.Error: Database error (not cached)
+    """
+    # Long-lived per-thread read connection; not closed here
+    cur = get_ro_conn().cursor()
+    cur.row_factory = None  # plain tuples; unpacked by position below
+    
+    # Parameterized query (SQL injection safe)
+    # Prefix phrase match on the property_fts index; quote the term so user
+    # input cannot inject FTS query syntax. display_address includes the ZIP.
+    match_term = '"' + query.replace('"', '""') + '"*'
+    
+    rows = None
+    try:
+        cur.execute(_SQL_SEARCH_PROPERTY, (account_id, match_term, account_id, limit))
+        rows = cur.fetchall()
+    except sqlite3.OperationalError as e:
+        # property_fts missing (migration not run, or no FTS5)
+        if IS_DEV:
+            print(f"[PROPERTY_SEARCH] FTS query failed, falling back to LIKE: {e}")
+    
+    if rows is None:
+        # Escape LIKE wildcards so a literal % or _ in the input matches itself
+        query_pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        cur.execute(
+            _SQL_SEARCH_PROPERTY_LIKE,
+            (account_id, query_pattern, query_pattern, query_pattern, limit)
+        )
+        rows = cur.fetchall()
+    
+    results = []
+    for (id_, display_address, address_line1, city, state, postal_code,
+         country, data) in rows:
+        # Parse data JSON (default to empty dict if invalid)
+        try:
+            data = json_codec.loads(data) if data else {}
+        except (ValueError, TypeError):
+            data = {}
+        
+        results.append({
+            "source_ref": str(id_),  # Use property_index ID as source_ref
+            "display_address": display_address or "",
+            "address_line1": address_line1,
+            "city": city,
+            "state": state,
+            "postal_code": postal_code,
+            "country": country or "US",
+            "data": data,
+        })
+    return tuple(results)
+
+
 @router.post("", response_model=PropertySearchResponse)
 def search_properties(
     request: PropertySearchRequest,
     ctx: AuthContext = Depends(require_auth_context),
-) -> PropertySearchResponse:
+) -> Response:
     """
     Search property index for addresses matching query.
     
@@ -57,80 +191,35 @@ def search_properties(
         ctx: Authenticated context with account_id
     
     Returns:
-        PropertySearchResponse with matching properties
+        JSON Response shaped as PropertySearchResponse
     
     Raises:
         HTTPException(400): Invalid query (too short, etc.)
         HTTPException(403): Missing capability (handled by dependency)
     """
-    conn = get_db()
-    cur = conn.cursor()
-    
     # Security: account_id from auth context ONLY (never from client)
     account_id = ctx.account_id
     
-    # Parameterized query (SQL injection safe)
-    # Use LIKE with wildcards for case-insensitive partial match
-    query_pattern = f"%{request.query}%"
-    
     try:
-        # Query property_index table
-        # Security: WHERE account_id = ? ensures tenant isolation
-        cur.execute(
-            """
-            SELECT 
-                id,
-                display_address,
-                address_line1,
-                city,
-                state,
-                postal_code,
-                country,
-                data
-            FROM property_index
-            WHERE account_id = ?
-              AND (
-                  display_address LIKE ? COLLATE NOCASE
-                  OR city LIKE ? COLLATE NOCASE
-                  OR postal_code LIKE ? COLLATE NOCASE
-              )
-            ORDER BY created_at DESC
-            LIMIT ?
-            """,
-            (account_id, query_pattern, query_pattern, query_pattern, request.limit)
+        results = _search_property_results(
+            account_id,
+            _SearchQuery(request.query),
+            request.limit,
+            int(time.monotonic() // _SEARCH_CACHE_TTL_SECONDS),
         )
         
-        rows = cur.fetchall()
-        
-        # Build results
-        results = []
-        for row in rows:
-            # Parse data JSON (default to empty dict if invalid)
-            import json
-            try:
-                data = json.loads(row["data"]) if row.get("data") else {}
-            except (json.JSONDecodeError, TypeError):
-                data = {}
-            
-            result = PropertySearchResult(
-                source_ref=str(row["id"]),  # Use property_index ID as source_ref
-                display_address=row["display_address"] or "",
-                address_line1=row.get("address_line1"),
-                city=row.get("city"),
-                state=row.get("state"),
-                postal_code=row.get("postal_code"),
-                country=row.get("country", "US"),
-                data=data,
-            )
-            results.append(result)
-        
         if IS_DEV:
             print(f"[PROPERTY_SEARCH] account_id={account_id}, query={request.query!r}, results={len(results)}")
         
-        return PropertySearchResponse(
-            results=results,
-            query=request.query,
-            total=len(results),
+        # Already PropertySearchResponse-shaped - encode once, skipping model
+        # construction and jsonable_encoder (response_model stays for the docs)
+        return Response(
+            content=json_codec.dumps({
+                "results": results,
+                "query": request.query,
+                "total": len(results),
+            }),
+            media_type="application/json",
         )
     
     except sqlite3.Error as e:
@@ -138,6 +227,3 @@ def search_properties(
         if IS_DEV:
             print(f"[PROPERTY_SEARCH] DB error: {e}")
         raise HTTPException(status_code=500, detail="Database error")
-    
-    finally:
-        conn.close()
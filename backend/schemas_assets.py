@@ -8,14 +8,24 @@ Security-first: all schemas enforce validation and prevent injection.
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Dict, Optional
-from pydantic import BaseModel, Field, validator
+from typing import Annotated, Any, Dict, Optional
+from pydantic import BaseModel, Field, StringConstraints
+
+
+# Trimming and length checks run inside pydantic-core, so these fields need
+# no Python-level validators (a whitespace-only value fails min_length)
+AssetName = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=200)]
+SearchQuery = Annotated[str, StringConstraints(strip_whitespace=True, min_length=2, max_length=200)]
 
 
 # ========================================================================
 # ASSETS SCHEMAS
 # ========================================================================
 
+# Most assets accepted by one bulk create request (POST /api/assets/bulk and
+# main.py's /assets/create_bulk)
+MAX_BULK_ASSETS = 500
+
 class AssetCreateRequest(BaseModel):
     """Request schema for creating a new asset.
     
@@ -25,7 +35,7 @@ class AssetCreateRequest(BaseModel):
     - source_ref is optional external identifier
     - property_data is stored as JSONB (safe subset only; never store credentials)
     """
-    name: str = Field(..., min_length=1, max_length=200, description="Asset name (required, 1-200 chars)")
+    name: AssetName = Field(..., description="Asset name (required, 1-200 chars, trimmed)")
     address_line1: Optional[str] = Field(None, max_length=200, description="Address line 1")
     address_line2: Optional[str] = Field(None, max_length=200, description="Address line 2")
     city: Optional[str] = Field(None, max_length=100, description="City")
@@ -35,20 +45,6 @@ class AssetCreateRequest(BaseModel):
     source_ref: Optional[str] = Field(None, max_length=200, description="External/property identifier")
     property_data: Dict[str, Any] = Field(default_factory=dict, description="Structured property data (safe subset)")
 
-    @validator("name", pre=True)
-    def trim_name(cls, v):
-        """Trim whitespace from name."""
-        if isinstance(v, str):
-            return v.strip()
-        return v
-
-    @validator("name")
-    def validate_name_non_empty(cls, v):
-        """Ensure name is not empty after trimming."""
-        if not v or not v.strip():
-            raise ValueError("name must not be empty")
-        return v
-
 
 class AssetResponse(BaseModel):
     """Response schema for asset data.
@@ -77,7 +73,18 @@ class AssetResponse(BaseModel):
 class AssetListResponse(BaseModel):
     """Response schema for asset list."""
     items: list[AssetResponse] = Field(default_factory=list, description="List of assets")
-    total: int = Field(0, description="Total count (for future pagination)")
+    # Not a COUNT(*) of the whole result set: with keyset paging clients
+    # follow next_cursor/has_more, and a full count would cost a scan per page
+    total: int = Field(0, description="Number of items in this page")
+    has_more: bool = Field(False, description="Whether another page follows")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (null on the last page)")
+
+
+class AssetBulkCreateResponse(BaseModel):
+    """Response schema for bulk asset creation."""
+    created: int = Field(0, description="Number of assets created")
+    first_id: Optional[str] = Field(None, description="ID of the first created asset (null if none)")
+    last_id: Optional[str] = Field(None, description="ID of the last created asset (null if none)")
 
 
 # ========================================================================
@@ -92,25 +99,9 @@ class PropertySearchRequest(BaseModel):
     - limit is capped at 50 (prevents abuse)
     - Results are tenant-scoped on backend
     """
-    query: str = Field(..., min_length=2, max_length=200, description="Search query (min 2 chars)")
+    query: SearchQuery = Field(..., description="Search query (min 2 chars, trimmed)")
     limit: int = Field(25, ge=1, le=50, description="Max results (default 25, max 50)")
 
-    @validator("query", pre=True)
-    def trim_query(cls, v):
-        """Trim whitespace from query."""
-        if isinstance(v, str):
-            return v.strip()
-        return v
-
-    @validator("query")
-    def validate_query_non_empty(cls, v):
-        """Ensure query is not empty after trimming."""
-        if not v or not v.strip():
-            raise ValueError("query must not be empty")
-        if len(v) < 2:
-            raise ValueError("query must be at least 2 characters")
-        return v
-
 
 class PropertySearchResult(BaseModel):
     """Single property search result.
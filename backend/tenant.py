@@ -12,10 +12,14 @@ This module provides centralized tenant scoping to prevent accidental data leaka
 
 from __future__ import annotations
 
+import functools
 import os
+import re
 import sqlite3
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Union
+from itertools import islice, repeat
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Union
 
 from fastapi import HTTPException
 
@@ -30,7 +34,7 @@ except ImportError:
     IS_PROD = (ENV == "prod")
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TenantContext:
     """
     Immutable tenant context for request scoping.
@@ -61,6 +65,9 @@ def require_account_id(account_id: Optional[int]) -> int:
     Raises:
         HTTPException: If account_id is missing in non-dev environments
     """
+    # The valid-id path is this one comparison; IS_DEV is only consulted on
+    # the failure path, and is read at call time (not bound into per-env
+    # variants at import) so patching tenant.IS_DEV in tests takes effect
     if not account_id or account_id < 1:
         error_msg = f"[TENANT] Missing or invalid account_id: {account_id}"
         
@@ -89,6 +96,11 @@ def assert_rows_scoped(
     
     This prevents accidental data leakage when queries are missing account_id filters.
     
+    Every row is checked, in every environment. The queries already filter on
+    account_id in SQL; this is the backstop for when one of them is wrong, and
+    a mis-parenthesized OR can leak rows anywhere in the set, so sampling
+    (first/last row) would miss it.
+    
     - In DEV: warns about mismatched account_ids
     - In STAGING/PROD: fails fast with HTTP 500
     
@@ -103,43 +115,51 @@ def assert_rows_scoped(
     if not rows:
         return  # Empty result set is fine
     
-    mismatches = []
+    # Rows in one result set share a type and column layout, so resolve how
+    # to read account_id once from the first row instead of per row
+    first = rows[0]
+    if isinstance(first, dict):
+        row_account_ids = map(dict.get, rows, repeat("account_id"))
+    else:
+        try:
+            idx = first.keys().index("account_id")
+        except (AttributeError, ValueError) as e:
+            # account_id column missing from SELECT - this is a bug
+            error_msg = f"[TENANT] Query missing account_id in SELECT for {label or 'unknown endpoint'}"
+            detail_msg = f"Row at index 0 does not have account_id column. Error: {type(e).__name__}: {e}"
+            print(f"ERROR: {error_msg} - {detail_msg}")
+            raise RuntimeError(f"{error_msg}. {detail_msg}")
+        # Integer indexing skips the per-row column-name lookup
+        row_account_ids = map(itemgetter(idx), rows)
     
-    for i, row in enumerate(rows):
-        # Extract account_id from row (handle both sqlite3.Row and dict)
-        if isinstance(row, dict):
-            row_account_id = row.get("account_id")
-        else:
-            try:
-                row_account_id = row["account_id"]
-            except (KeyError, TypeError, IndexError) as e:
-                # account_id column missing from SELECT - this is a bug
-                error_msg = f"[TENANT] Query missing account_id in SELECT for {label or 'unknown endpoint'}"
-                detail_msg = f"Row at index {i} does not have account_id column. Error: {type(e).__name__}: {e}"
-                print(f"ERROR: {error_msg} - {detail_msg}")
-                raise RuntimeError(f"{error_msg}. {detail_msg}")
-        
-        # Check for mismatch
-        if row_account_id is not None and row_account_id != account_id:
-            mismatches.append({
-                "index": i,
-                "expected": account_id,
-                "found": row_account_id
-            })
+    # Lazy: nothing is allocated for matching rows, and outside dev the scan
+    # stops at the first mismatch
+    mismatches = (
+        {
+            "index": i,
+            "expected": account_id,
+            "found": row_account_id
+        }
+        for i, row_account_id in enumerate(row_account_ids)
+        if row_account_id is not None and row_account_id != account_id
+    )
+    first_mismatch = next(mismatches, None)
+    if first_mismatch is None:
+        return
     
-    if mismatches:
-        error_msg = f"[TENANT] Tenant isolation violation{f' in {label}' if label else ''}"
-        detail_msg = f"Found {len(mismatches)} row(s) with mismatched account_id"
-        
-        if IS_DEV:
-            print(f"{error_msg}: {detail_msg}")
-            print(f"[TENANT][DEV] Expected account_id={account_id}, found mismatches: {mismatches[:3]}")  # Show first 3
-        else:
-            print(f"{error_msg}: {detail_msg} (PRODUCTION - failing fast)")
-            raise HTTPException(
-                status_code=500,
-                detail="Tenant isolation violation detected - this is a server error"
-            )
+    error_msg = f"[TENANT] Tenant isolation violation{f' in {label}' if label else ''}"
+    
+    if IS_DEV:
+        shown = [first_mismatch, *islice(mismatches, 2)]  # Show first 3
+        count = len(shown) + sum(1 for _ in mismatches)
+        print(f"{error_msg}: Found {count} row(s) with mismatched account_id")
+        print(f"[TENANT][DEV] Expected account_id={account_id}, found mismatches: {shown}")
+    else:
+        print(f"{error_msg}: Found mismatched account_id at row {first_mismatch['index']} (PRODUCTION - failing fast)")
+        raise HTTPException(
+            status_code=500,
+            detail="Tenant isolation violation detected - this is a server error"
+        )
 
 
 def assert_row_scoped(
@@ -169,21 +189,67 @@ def assert_row_scoped(
     else:
         try:
             row_account_id = row["account_id"]
-        except (KeyError, TypeError):
+        except (KeyError, TypeError, IndexError):
+            # sqlite3.Row raises IndexError for a column not in the SELECT
             row_account_id = None
     
-    # Check for mismatch
-    if row_account_id is not None and row_account_id != account_id:
-        error_msg = f"[TENANT] Tenant isolation violation{f' in {label}' if label else ''}"
-        detail_msg = f"Expected account_id={account_id}, found={row_account_id}"
+    # Hot path: nothing below runs unless the row belongs to another account
+    if row_account_id is None or row_account_id == account_id:
+        return
+    
+    error_msg = f"[TENANT] Tenant isolation violation{f' in {label}' if label else ''}"
+    detail_msg = f"Expected account_id={account_id}, found={row_account_id}"
+    
+    if IS_DEV:
+        print(f"{error_msg}: {detail_msg} (DEV warning)")
+    else:
+        print(f"{error_msg}: {detail_msg} (PRODUCTION - failing fast)")
+        raise HTTPException(
+            status_code=500,
+            detail="Tenant isolation violation detected - this is a server error"
+        )
+
+
+# One case-insensitive pass finds every keyword the execute_scoped heuristic
+# looks at (plain substrings, like the per-keyword `in` checks it replaces)
+_TENANT_TABLES = ("saved_properties", "trashed_properties", "scenarios", "account_memberships")
+_SQL_TOKENS_RE = re.compile(
+    "|".join(("select", "update", "delete", *_TENANT_TABLES, "account_id")),
+    re.IGNORECASE,
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def _sql_missing_account_id(sql: str) -> bool:
+    """
+    True if sql reads or writes a tenant-owned table without mentioning account_id.
+    
+    Cached per SQL text: call sites pass module-level constants, so each
+    statement is scanned once per process, not once per query.
+    """
+    tokens = {m.group(0).lower() for m in _SQL_TOKENS_RE.finditer(sql)}
+    is_dml = not tokens.isdisjoint(("select", "update", "delete"))
+    is_tenant_query = not tokens.isdisjoint(_TENANT_TABLES)
+    return is_tenant_query and is_dml and "account_id" not in tokens
+
+
+def _check_sql_scoped(sql: str, label: str) -> None:
+    """
+    Warn (DEV) or fail fast (STAGING/PROD) if sql looks like an unscoped tenant query.
+    
+    Best-effort detection - see _sql_missing_account_id.
+    """
+    if _sql_missing_account_id(sql):
+        warning_msg = f"[TENANT][DEV] Query missing 'account_id' filter{f' in {label}' if label else ''}"
         
         if IS_DEV:
-            print(f"{error_msg}: {detail_msg} (DEV warning)")
+            print(warning_msg)
+            print(f"[TENANT][DEV] SQL: {sql[:100]}...")  # Show first 100 chars
         else:
-            print(f"{error_msg}: {detail_msg} (PRODUCTION - failing fast)")
+            print(f"{warning_msg} (PRODUCTION - failing fast)")
             raise HTTPException(
                 status_code=500,
-                detail="Tenant isolation violation detected - this is a server error"
+                detail="Unsafe tenant query detected - missing account_id filter"
             )
 
 
@@ -199,6 +265,9 @@ def execute_scoped(
     
     Ensures account_id is present and optionally checks if the SQL includes account_id filter.
     
+    The SQL is never rewritten to add a missing filter: the call site is
+    wrong and should fail loudly (outside dev), not be patched at runtime.
+    
     Args:
         conn: Database connection
         sql: SQL query string
@@ -216,30 +285,7 @@ def execute_scoped(
     require_account_id(account_id)
     
     # TASK D: DEV-only check for account_id in SQL
-    # (Best-effort detection - simple substring check)
-    sql_lower = sql.lower()
-    is_select = "select" in sql_lower
-    is_update = "update" in sql_lower
-    is_delete = "delete" in sql_lower
-    
-    # Check if this is a query on a tenant-owned table
-    tenant_tables = ["saved_properties", "trashed_properties", "scenarios", "account_memberships"]
-    is_tenant_query = any(table in sql_lower for table in tenant_tables)
-    
-    if is_tenant_query and (is_select or is_update or is_delete):
-        # Check if account_id appears in the SQL
-        if "account_id" not in sql_lower:
-            warning_msg = f"[TENANT][DEV] Query missing 'account_id' filter{f' in {label}' if label else ''}"
-            
-            if IS_DEV:
-                print(warning_msg)
-                print(f"[TENANT][DEV] SQL: {sql[:100]}...")  # Show first 100 chars
-            else:
-                print(f"{warning_msg} (PRODUCTION - failing fast)")
-                raise HTTPException(
-                    status_code=500,
-                    detail="Unsafe tenant query detected - missing account_id filter"
-                )
+    _check_sql_scoped(sql, label)
     
     # Execute the query
     cur = conn.cursor()
@@ -248,6 +294,39 @@ def execute_scoped(
     return cur
 
 
+def execute_scoped_many(
+    conn: sqlite3.Connection,
+    sql: str,
+    seq_of_params: Iterable[tuple],
+    account_id: int,
+    label: str = ""
+) -> sqlite3.Cursor:
+    """
+    Guardrail: executemany() a tenant-scoped DML statement.
+    
+    Same checks as execute_scoped, run once for the whole batch, and the
+    statement is prepared once for every parameter set. For INSERT/UPDATE/
+    DELETE only - executemany() does not return rows.
+    
+    Args:
+        conn: Database connection
+        sql: SQL statement
+        seq_of_params: One parameter tuple per execution
+        account_id: Required account_id for tenant scoping
+        label: Identifier for logging (e.g., endpoint name)
+        
+    Returns:
+        Cursor (rowcount is the total across the batch)
+        
+    Raises:
+        HTTPException: If account_id is missing or the statement appears unsafe
+    """
+    require_account_id(account_id)
+    _check_sql_scoped(sql, label)
+    
+    return conn.executemany(sql, seq_of_params)
+
+
 def get_tenant_context(account_id: int, user_id: Optional[int] = None) -> TenantContext:
     """
     Create a validated TenantContext.
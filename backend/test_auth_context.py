@@ -0,0 +1,61 @@
+"""
+backend/test_auth_context.py
+
+Shared connection pool behavior (get_rw_conn transaction handling).
+
+Run: pytest backend/test_auth_context.py -v
+"""
+
+import sqlite3
+
+import pytest
+
+from backend import auth_context
+
+
+@pytest.fixture
+def rw_db(tmp_path, monkeypatch):
+    """Point the shared connections at a fresh database file for one test."""
+    auth_context.close_shared_connections()
+    monkeypatch.setattr(auth_context, "DB_PATH", str(tmp_path / "rw.db"))
+    with auth_context.get_rw_conn() as conn:
+        conn.execute("CREATE TABLE parent (id INTEGER PRIMARY KEY)")
+        conn.execute("""
+            CREATE TABLE child (
+                id INTEGER PRIMARY KEY,
+                parent_id INTEGER REFERENCES parent(id) DEFERRABLE INITIALLY DEFERRED
+            )
+        """)
+    # Outside any transaction, so the pragma takes effect
+    auth_context._rw_conn.execute("PRAGMA foreign_keys=ON")
+    yield
+    auth_context.close_shared_connections()
+
+
+class TestRwConnTransactions:
+    """get_rw_conn must never leave the shared writer inside a transaction."""
+
+    def test_body_error_rolls_back(self, rw_db):
+        with pytest.raises(RuntimeError):
+            with auth_context.get_rw_conn() as conn:
+                conn.execute("INSERT INTO parent (id) VALUES (1)")
+                raise RuntimeError("boom")
+
+        with auth_context.get_rw_conn() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM parent").fetchone()[0] == 0
+
+    def test_failed_commit_does_not_wedge_writer(self, rw_db):
+        # Deferred FK: the violation is only reported by COMMIT
+        with pytest.raises(sqlite3.IntegrityError):
+            with auth_context.get_rw_conn() as conn:
+                conn.execute("INSERT INTO child (id, parent_id) VALUES (1, 99)")
+
+        assert not auth_context._rw_conn.in_transaction
+
+        # The next writer can start its own transaction
+        with auth_context.get_rw_conn() as conn:
+            conn.execute("INSERT INTO parent (id) VALUES (1)")
+            conn.execute("INSERT INTO child (id, parent_id) VALUES (1, 1)")
+
+        with auth_context.get_rw_conn() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM child").fetchone()[0] == 1
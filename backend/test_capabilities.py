@@ -290,6 +290,37 @@ class TestCapabilityEnforcement:
             print("✓ Analyze endpoint works with valid capabilities")
 
 
+class TestRoleHierarchy:
+    """Test the role hierarchy shared by authz and rbac."""
+    
+    def test_role_at_least(self):
+        """Higher roles satisfy lower requirements, not the other way round."""
+        from backend.authz import role_at_least
+        
+        assert role_at_least("owner", "admin")
+        assert role_at_least("member", "member")
+        assert not role_at_least("member", "admin")
+        assert not role_at_least("read_only", "member")
+    
+    def test_role_names_case_insensitive(self):
+        """Role names match regardless of case; unknown roles rank lowest."""
+        from backend.authz import role_at_least, role_level
+        
+        assert role_level("Admin") == role_level("admin") == 3
+        assert role_at_least("OWNER", "admin")
+        assert role_level("superuser") == 0
+        assert role_level("") == 0
+        assert not role_at_least("superuser", "read_only")
+    
+    def test_rbac_reexports_authz_helpers(self):
+        """rbac exposes the same role helpers as authz, not a second copy."""
+        from backend import authz, rbac
+        
+        assert rbac.role_at_least is authz.role_at_least
+        assert rbac.role_level is authz.role_level
+        assert rbac.ROLE_HIERARCHY is authz.ROLE_HIERARCHY
+
+
 class TestSqlite3RowStability:
     """Test that sqlite3.Row handling is stable (no .get() calls)."""
     
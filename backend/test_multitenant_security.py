@@ -33,7 +33,7 @@ def setup_test_accounts():
     
     # Clean up any existing test data
     cur.execute("DELETE FROM saved_properties WHERE property_name LIKE 'TEST_%'")
-    cur.execute("DELETE FROM trashed_properties WHERE saved_row_json LIKE '%TEST_%'")
+    cur.execute("DELETE FROM trashed_properties WHERE property_name LIKE 'TEST_%'")
     cur.execute("DELETE FROM users WHERE email LIKE 'test_%@test.com'")
     cur.execute("DELETE FROM accounts WHERE name LIKE 'Test Account %'")
     conn.commit()
@@ -76,7 +76,7 @@ def setup_test_accounts():
     conn = get_db()
     cur = conn.cursor()
     cur.execute("DELETE FROM saved_properties WHERE property_name LIKE 'TEST_%'")
-    cur.execute("DELETE FROM trashed_properties WHERE saved_row_json LIKE '%TEST_%'")
+    cur.execute("DELETE FROM trashed_properties WHERE property_name LIKE 'TEST_%'")
     cur.execute("DELETE FROM users WHERE email LIKE 'test_%@test.com'")
     cur.execute("DELETE FROM accounts WHERE name LIKE 'Test Account %'")
     conn.commit()
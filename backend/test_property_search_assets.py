@@ -39,24 +39,39 @@ test_db.close()
 # Patch DATABASE_PATH before importing main
 config_module.DATABASE_PATH = test_db_path
 
-from backend.main import app, init_db, get_db
-from backend.auth_context import AuthContext
-from backend.authz import Capability
+from fastapi import FastAPI
+
+from backend import auth_context, migrate_property_search_assets, routes_assets, routes_property_search
+from backend.auth_context import AuthContext, require_auth_context
+from backend.db import invalidate_table_columns
+from backend.main import init_db, get_db
 
 # ========================================================================
 # FIXTURES
 # ========================================================================
 
 @pytest.fixture(scope="function")
-def db():
+def db(tmp_path, monkeypatch):
     """Create a fresh test database for each test."""
-    # Initialize DB
+    # main may already have been imported (and bound DB_PATH) by another test
+    # module, so point the shared connections and the migration here directly
+    auth_context.close_shared_connections()
+    db_path = str(tmp_path / "test.db")
+    monkeypatch.setattr(auth_context, "DB_PATH", db_path)
+    monkeypatch.setattr(migrate_property_search_assets, "DATABASE_PATH", db_path)
+    
+    # Base schema, then the property search + assets migration (property_index,
+    # FTS tables and triggers)
     init_db()
+    migrate_property_search_assets.migrate()
     
     # Seed test data
     conn = get_db()
     cur = conn.cursor()
     
+    # The migration seeds dev sample properties; each test seeds its own
+    cur.execute("DELETE FROM property_index")
+    
     # Create test accounts
     cur.execute("INSERT INTO accounts (id, name, owner_id) VALUES (1, 'Test Account A', 1)")
     cur.execute("INSERT INTO accounts (id, name, owner_id) VALUES (2, 'Test Account B', 2)")
@@ -80,18 +95,18 @@ def db():
         VALUES (2, 2, 'active', datetime('now'), datetime('now', '+30 days'))
     """)
     
-    # Seed property_index for testing (tenant A and B)
+    # Seed property_index for testing (tenant A and B); ids are per tenant
     cur.execute("""
-        INSERT INTO property_index (account_id, address_line1, city, state, postal_code, country, display_address, data)
-        VALUES (1, '123 Main St', 'Atlanta', 'GA', '30301', 'US', '123 Main St, Atlanta, GA 30301', '{"beds": 3}')
+        INSERT INTO property_index (id, account_id, address_line1, city, state, postal_code, country, display_address, data)
+        VALUES (1, 1, '123 Main St', 'Atlanta', 'GA', '30301', 'US', '123 Main St, Atlanta, GA 30301', '{"beds": 3}')
     """)
     cur.execute("""
-        INSERT INTO property_index (account_id, address_line1, city, state, postal_code, country, display_address, data)
-        VALUES (1, '456 Oak Ave', 'Decatur', 'GA', '30030', 'US', '456 Oak Ave, Decatur, GA 30030', '{"beds": 4}')
+        INSERT INTO property_index (id, account_id, address_line1, city, state, postal_code, country, display_address, data)
+        VALUES (2, 1, '456 Oak Ave', 'Decatur', 'GA', '30030', 'US', '456 Oak Ave, Decatur, GA 30030', '{"beds": 4}')
     """)
     cur.execute("""
-        INSERT INTO property_index (account_id, address_line1, city, state, postal_code, country, display_address, data)
-        VALUES (2, '789 Pine Rd', 'Atlanta', 'GA', '30302', 'US', '789 Pine Rd, Atlanta, GA 30302', '{"beds": 2}')
+        INSERT INTO property_index (id, account_id, address_line1, city, state, postal_code, country, display_address, data)
+        VALUES (1, 2, '789 Pine Rd', 'Atlanta', 'GA', '30302', 'US', '789 Pine Rd, Atlanta, GA 30302', '{"beds": 2}')
     """)
     
     # Seed assets for testing (tenant A only)
@@ -103,25 +118,30 @@ def db():
     conn.commit()
     conn.close()
     
+    # Search results are cached per account; don't serve a previous test's rows
+    routes_property_search._search_property_results.cache_clear()
+    
     yield
     
-    # Cleanup (delete temp DB)
-    try:
-        FsPath(test_db_path).unlink()
-    except Exception:
-        pass
+    # Cleanup: release the shared connections (tmp_path removes the file)
+    auth_context.close_shared_connections()
+    invalidate_table_columns()
 
 
 @pytest.fixture
 def client():
-    """FastAPI test client."""
-    return TestClient(app)
+    """FastAPI test client over the property search and assets routers."""
+    test_app = FastAPI()
+    test_app.include_router(routes_property_search.router)
+    test_app.include_router(routes_assets.router)
+    return TestClient(test_app)
 
 
 def mock_auth_context(account_id: int, user_id: int, capabilities: list[str]) -> AuthContext:
     """Create mock auth context for testing."""
     return AuthContext(
         user_id=user_id,
+        email=f"user_{user_id}@test.com",
         account_id=account_id,
         role="owner",
         subscription_status="active",
@@ -131,6 +151,12 @@ def mock_auth_context(account_id: int, user_id: int, capabilities: list[str]) ->
     )
 
 
+def as_user(client: TestClient, account_id: int, user_id: int, capabilities: list[str]) -> None:
+    """Authenticate the client's following requests as the given user."""
+    ctx = mock_auth_context(account_id, user_id, capabilities)
+    client.app.dependency_overrides[require_auth_context] = lambda: ctx
+
+
 # ========================================================================
 # PROPERTY SEARCH TESTS
 # ========================================================================
@@ -143,24 +169,18 @@ class TestPropertySearch:
         resp = client.post("/api/property-search", json={"query": "atlanta", "limit": 25})
         assert resp.status_code in [401, 403], "Should require auth"
     
-    def test_search_requires_capability(self, client, db, monkeypatch):
+    def test_search_requires_capability(self, client, db):
         """Property search should require 'property_search:read' capability."""
         # Mock auth context WITHOUT property_search:read capability
-        def mock_require_auth():
-            return mock_auth_context(1, 1, ["assets:read"])  # Missing property_search:read
-        
-        monkeypatch.setattr("backend.routes_property_search.require_auth_context", lambda: mock_require_auth())
+        as_user(client, 1, 1, ["assets:read"])  # Missing property_search:read
         
         resp = client.post("/api/property-search", json={"query": "atlanta", "limit": 25})
         assert resp.status_code == 403, "Should deny without property_search:read capability"
     
-    def test_search_tenant_isolation(self, client, db, monkeypatch):
+    def test_search_tenant_isolation(self, client, db):
         """Property search should only return results for authenticated account."""
         # Mock auth context for account 1
-        def mock_require_auth_account_1():
-            return mock_auth_context(1, 1, ["property_search:read"])
-        
-        monkeypatch.setattr("backend.routes_property_search.require_auth_context", lambda: mock_require_auth_account_1())
+        as_user(client, 1, 1, ["property_search:read"])
         
         resp = client.post("/api/property-search", json={"query": "atlanta", "limit": 25})
         assert resp.status_code == 200
@@ -174,12 +194,9 @@ class TestPropertySearch:
         assert "123 Main St, Atlanta, GA 30301" in addresses
         assert "789 Pine Rd, Atlanta, GA 30302" not in addresses, "Should not leak account 2's data"
     
-    def test_search_input_validation(self, client, db, monkeypatch):
+    def test_search_input_validation(self, client, db):
         """Property search should validate input (min length, max limit)."""
-        def mock_require_auth():
-            return mock_auth_context(1, 1, ["property_search:read"])
-        
-        monkeypatch.setattr("backend.routes_property_search.require_auth_context", lambda: mock_require_auth())
+        as_user(client, 1, 1, ["property_search:read"])
         
         # Test query too short
         resp = client.post("/api/property-search", json={"query": "a", "limit": 25})
@@ -189,12 +206,9 @@ class TestPropertySearch:
         resp = client.post("/api/property-search", json={"query": "atlanta", "limit": 999})
         assert resp.status_code == 422 or resp.status_code == 400, "Should reject limit > 50"
     
-    def test_search_sql_injection_safe(self, client, db, monkeypatch):
+    def test_search_sql_injection_safe(self, client, db):
         """Property search should be safe from SQL injection."""
-        def mock_require_auth():
-            return mock_auth_context(1, 1, ["property_search:read"])
-        
-        monkeypatch.setattr("backend.routes_property_search.require_auth_context", lambda: mock_require_auth())
+        as_user(client, 1, 1, ["property_search:read"])
         
         # Try SQL injection payload
         malicious_query = "atlanta' OR '1'='1"
@@ -205,6 +219,42 @@ class TestPropertySearch:
         data = resp.json()
         # Should not return all properties; should be filtered safely
         assert len(data.get("results", [])) <= 2, "Should not leak all properties via injection"
+    
+    def test_search_like_fallback_keeps_query_case(self, client, db):
+        """Without property_fts the LIKE scan gets the query as typed (LIKE only folds ASCII)."""
+        conn = get_db()
+        conn.execute("""
+            INSERT INTO property_index (id, account_id, address_line1, city, state, postal_code, country, display_address, data)
+            VALUES (3, 1, '12 Émile Pl', 'Atlanta', 'GA', '30305', 'US', '12 Émile Pl, Atlanta, GA 30305', '{}')
+        """)
+        for trigger in ("property_index_fts_insert", "property_index_fts_delete", "property_index_fts_update"):
+            conn.execute(f"DROP TRIGGER {trigger}")
+        conn.execute("DROP TABLE property_fts")
+        conn.commit()
+        conn.close()
+        
+        as_user(client, 1, 1, ["property_search:read"])
+        
+        resp = client.post("/api/property-search", json={"query": "Émile", "limit": 25})
+        assert resp.status_code == 200
+        assert [r["display_address"] for r in resp.json()["results"]] == ["12 Émile Pl, Atlanta, GA 30305"]
+    
+    def test_search_cache_shared_across_ascii_case(self, client, db):
+        """Queries differing only in ASCII case share one cache entry."""
+        as_user(client, 1, 1, ["property_search:read"])
+        
+        first = client.post("/api/property-search", json={"query": "ATLANTA", "limit": 25}).json()
+        hits = routes_property_search._search_property_results.cache_info().hits
+        second = client.post("/api/property-search", json={"query": "atlanta", "limit": 25}).json()
+        
+        assert routes_property_search._search_property_results.cache_info().hits == hits + 1
+        assert second["results"] == first["results"]
+        assert second["query"] == "atlanta"
+        
+        # Non-ASCII case is not folded by LIKE, so it is a separate entry
+        client.post("/api/property-search", json={"query": "ÉMILE", "limit": 25})
+        client.post("/api/property-search", json={"query": "émile", "limit": 25})
+        assert routes_property_search._search_property_results.cache_info().hits == hits + 1
 
 
 # ========================================================================
@@ -219,22 +269,16 @@ class TestAssetsCreate:
         resp = client.post("/api/assets", json={"name": "Test Asset"})
         assert resp.status_code in [401, 403], "Should require auth"
     
-    def test_create_requires_capability(self, client, db, monkeypatch):
+    def test_create_requires_capability(self, client, db):
         """Asset creation should require 'assets:manage' capability."""
-        def mock_require_auth():
-            return mock_auth_context(1, 1, ["assets:read"])  # Missing assets:manage
-        
-        monkeypatch.setattr("backend.routes_assets.require_auth_context", lambda: mock_require_auth())
+        as_user(client, 1, 1, ["assets:read"])  # Missing assets:manage
         
         resp = client.post("/api/assets", json={"name": "Test Asset"})
         assert resp.status_code == 403, "Should deny without assets:manage capability"
     
-    def test_create_name_validation(self, client, db, monkeypatch):
+    def test_create_name_validation(self, client, db):
         """Asset creation should validate name (non-empty, max length)."""
-        def mock_require_auth():
-            return mock_auth_context(1, 1, ["assets:manage"])
-        
-        monkeypatch.setattr("backend.routes_assets.require_auth_context", lambda: mock_require_auth())
+        as_user(client, 1, 1, ["assets:manage"])
         
         # Test empty name
         resp = client.post("/api/assets", json={"name": ""})
@@ -244,12 +288,9 @@ class TestAssetsCreate:
         resp = client.post("/api/assets", json={"name": "x" * 250})
         assert resp.status_code == 422 or resp.status_code == 400, "Should reject name > 200 chars"
     
-    def test_create_tenant_scoped(self, client, db, monkeypatch):
+    def test_create_tenant_scoped(self, client, db):
         """Asset creation should use account_id from auth context."""
-        def mock_require_auth():
-            return mock_auth_context(2, 2, ["assets:manage"])  # Account 2
-        
-        monkeypatch.setattr("backend.routes_assets.require_auth_context", lambda: mock_require_auth())
+        as_user(client, 2, 2, ["assets:manage"])  # Account 2
         
         resp = client.post("/api/assets", json={
             "name": "Account 2 Asset",
@@ -278,23 +319,17 @@ class TestAssetsList:
         resp = client.get("/api/assets")
         assert resp.status_code in [401, 403], "Should require auth"
     
-    def test_list_requires_capability(self, client, db, monkeypatch):
+    def test_list_requires_capability(self, client, db):
         """Assets list should require 'assets:read' capability."""
-        def mock_require_auth():
-            return mock_auth_context(1, 1, [])  # No capabilities
-        
-        monkeypatch.setattr("backend.routes_assets.require_auth_context", lambda: mock_require_auth())
+        as_user(client, 1, 1, [])  # No capabilities
         
         resp = client.get("/api/assets")
         assert resp.status_code == 403, "Should deny without assets:read capability"
     
-    def test_list_tenant_isolation(self, client, db, monkeypatch):
+    def test_list_tenant_isolation(self, client, db):
         """Assets list should only return assets for authenticated account."""
         # Account 1 should see only their asset (Test Asset A)
-        def mock_require_auth_account_1():
-            return mock_auth_context(1, 1, ["assets:read"])
-        
-        monkeypatch.setattr("backend.routes_assets.require_auth_context", lambda: mock_require_auth_account_1())
+        as_user(client, 1, 1, ["assets:read"])
         
         resp = client.get("/api/assets")
         assert resp.status_code == 200
@@ -305,10 +340,7 @@ class TestAssetsList:
         assert items[0]["name"] == "Test Asset A"
         
         # Account 2 should see no assets (none created yet)
-        def mock_require_auth_account_2():
-            return mock_auth_context(2, 2, ["assets:read"])
-        
-        monkeypatch.setattr("backend.routes_assets.require_auth_context", lambda: mock_require_auth_account_2())
+        as_user(client, 2, 2, ["assets:read"])
         
         resp = client.get("/api/assets")
         assert resp.status_code == 200
@@ -317,12 +349,9 @@ class TestAssetsList:
         items = data.get("items", [])
         assert len(items) == 0, "Account 2 should see no assets"
     
-    def test_list_search_query(self, client, db, monkeypatch):
+    def test_list_search_query(self, client, db):
         """Assets list should support optional search query."""
-        def mock_require_auth():
-            return mock_auth_context(1, 1, ["assets:read"])
-        
-        monkeypatch.setattr("backend.routes_assets.require_auth_context", lambda: mock_require_auth())
+        as_user(client, 1, 1, ["assets:read"])
         
         # Search by name
         resp = client.get("/api/assets?q=Test")
@@ -335,6 +364,150 @@ class TestAssetsList:
         assert resp.status_code == 200
         data = resp.json()
         assert len(data.get("items", [])) == 0
+    
+    def test_list_search_query_like_fallback(self, client, db):
+        """Without assets_fts the search falls back to the LIKE scan."""
+        conn = get_db()
+        for trigger in ("assets_fts_insert", "assets_fts_delete", "assets_fts_update"):
+            conn.execute(f"DROP TRIGGER {trigger}")
+        conn.execute("DROP TABLE assets_fts")
+        conn.commit()
+        conn.close()
+        
+        as_user(client, 1, 1, ["assets:read"])
+        
+        # Substring match, case-insensitive
+        resp = client.get("/api/assets?q=est ass")
+        assert resp.status_code == 200
+        assert [i["name"] for i in resp.json()["items"]] == ["Test Asset A"]
+        
+        # LIKE wildcards in the input match themselves only
+        resp = client.get("/api/assets?q=%25")
+        assert resp.status_code == 200
+        assert resp.json()["items"] == []
+    
+    def test_list_search_query_fts_prefix(self, client, db):
+        """The FTS path matches word prefixes across name, address and city."""
+        as_user(client, 1, 1, ["assets:read"])
+        
+        for q in ("asse", "100 test", "atl"):
+            resp = client.get("/api/assets", params={"q": q})
+            assert resp.status_code == 200
+            assert [i["name"] for i in resp.json()["items"]] == ["Test Asset A"], q
+        
+        # FTS syntax in the input is matched as text, not parsed
+        resp = client.get("/api/assets", params={"q": 'asset" OR "x'})
+        assert resp.status_code == 200
+        assert resp.json()["items"] == []
+
+
+class TestAssetsBulkCreate:
+    """Test suite for the bulk asset creation endpoint (POST /api/assets/bulk)."""
+    
+    def test_bulk_requires_capability(self, client, db):
+        """Bulk creation should require 'assets:manage' capability."""
+        as_user(client, 1, 1, ["assets:read"])
+        
+        resp = client.post("/api/assets/bulk", json=[{"name": "Bulk Asset"}])
+        assert resp.status_code == 403
+    
+    def test_bulk_cap(self, client, db):
+        """More than MAX_BULK_ASSETS items is a 400 and writes nothing."""
+        as_user(client, 1, 1, ["assets:manage"])
+        
+        items = [{"name": f"Bulk {n}"} for n in range(routes_assets.MAX_BULK_ASSETS + 1)]
+        resp = client.post("/api/assets/bulk", json=items)
+        assert resp.status_code == 400
+        
+        conn = get_db()
+        count = conn.execute("SELECT COUNT(*) FROM assets").fetchone()[0]
+        conn.close()
+        assert count == 1, "Only the seeded asset should exist"
+    
+    def test_bulk_empty(self, client, db):
+        """An empty list creates nothing."""
+        as_user(client, 1, 1, ["assets:manage"])
+        
+        resp = client.post("/api/assets/bulk", json=[])
+        assert resp.status_code == 200
+        assert resp.json()["created"] == 0
+    
+    def test_bulk_id_range_and_tenant(self, client, db):
+        """first_id..last_id are the stored rows, owned by the auth context's account and user."""
+        as_user(client, 2, 2, ["assets:manage"])
+        
+        # Client-supplied account_id / created_by are not part of the schema
+        items = [
+            {"name": f"Bulk {n}", "city": "Macon", "account_id": 1, "created_by": 1}
+            for n in range(3)
+        ]
+        resp = client.post("/api/assets/bulk", json=items)
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["created"] == 3
+        
+        conn = get_db()
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT id, name, account_id, created_by FROM assets WHERE id BETWEEN ? AND ? ORDER BY id",
+            (int(data["first_id"]), int(data["last_id"])),
+        )
+        rows = cur.fetchall()
+        conn.close()
+        
+        assert [r["name"] for r in rows] == ["Bulk 0", "Bulk 1", "Bulk 2"]
+        assert all(r["account_id"] == 2 and r["created_by"] == 2 for r in rows)
+
+
+class TestMainAssetsBulkCreate:
+    """Test suite for main.py's POST /assets/create_bulk."""
+    
+    @pytest.fixture
+    def main_client(self):
+        from backend.main import app
+        
+        yield TestClient(app)
+        app.dependency_overrides.pop(require_auth_context, None)
+    
+    def test_bulk_cap(self, main_client, db):
+        """More than MAX_BULK_ASSETS items is a 400 and writes nothing."""
+        from backend.main import MAX_BULK_ASSETS
+        
+        as_user(main_client, 1, 1, ["asset:manage"])
+        
+        resp = main_client.post("/assets/create_bulk", json=[{"name": "x"}] * (MAX_BULK_ASSETS + 1))
+        assert resp.status_code == 400
+        
+        conn = get_db()
+        count = conn.execute("SELECT COUNT(*) FROM assets").fetchone()[0]
+        conn.close()
+        assert count == 1, "Only the seeded asset should exist"
+    
+    def test_bulk_empty(self, main_client, db):
+        """An empty list creates nothing."""
+        as_user(main_client, 1, 1, ["asset:manage"])
+        
+        resp = main_client.post("/assets/create_bulk", json=[])
+        assert resp.status_code == 200
+        assert resp.json()["created"] == 0
+    
+    def test_bulk_rows_scoped_to_account(self, main_client, db):
+        """Rows are stored under the auth context's account, not a client-supplied one."""
+        as_user(main_client, 2, 2, ["asset:manage"])
+        
+        items = [{"name": f"Legacy Bulk {n}", "zip_code": "31201", "account_id": 1} for n in range(3)]
+        resp = main_client.post("/assets/create_bulk", json=items)
+        assert resp.status_code == 200
+        assert resp.json()["created"] == 3
+        
+        conn = get_db()
+        cur = conn.cursor()
+        cur.execute("SELECT name, account_id, zip_code FROM assets WHERE name LIKE 'Legacy Bulk %' ORDER BY id")
+        rows = cur.fetchall()
+        conn.close()
+        
+        assert [r["name"] for r in rows] == ["Legacy Bulk 0", "Legacy Bulk 1", "Legacy Bulk 2"]
+        assert all(r["account_id"] == 2 and r["zip_code"] == "31201" for r in rows)
 
 
 class TestAssetsGet:
@@ -345,32 +518,23 @@ class TestAssetsGet:
         resp = client.get("/api/assets/1")
         assert resp.status_code in [401, 403], "Should require auth"
     
-    def test_get_requires_capability(self, client, db, monkeypatch):
+    def test_get_requires_capability(self, client, db):
         """Asset get should require 'assets:read' capability."""
-        def mock_require_auth():
-            return mock_auth_context(1, 1, [])  # No capabilities
-        
-        monkeypatch.setattr("backend.routes_assets.require_auth_context", lambda: mock_require_auth())
+        as_user(client, 1, 1, [])  # No capabilities
         
         resp = client.get("/api/assets/1")
         assert resp.status_code == 403, "Should deny without assets:read capability"
     
-    def test_get_tenant_isolation(self, client, db, monkeypatch):
+    def test_get_tenant_isolation(self, client, db):
         """Asset get should enforce tenant isolation (404 for other account's assets)."""
         # Account 1 can access their own asset
-        def mock_require_auth_account_1():
-            return mock_auth_context(1, 1, ["assets:read"])
-        
-        monkeypatch.setattr("backend.routes_assets.require_auth_context", lambda: mock_require_auth_account_1())
+        as_user(client, 1, 1, ["assets:read"])
         
         resp = client.get("/api/assets/1")  # Asset 1 belongs to account 1
         assert resp.status_code == 200
         
         # Account 2 CANNOT access account 1's asset (should get 404, not 403 to avoid info leak)
-        def mock_require_auth_account_2():
-            return mock_auth_context(2, 2, ["assets:read"])
-        
-        monkeypatch.setattr("backend.routes_assets.require_auth_context", lambda: mock_require_auth_account_2())
+        as_user(client, 2, 2, ["assets:read"])
         
         resp = client.get("/api/assets/1")  # Asset 1 belongs to account 1
         assert resp.status_code == 404, "Should return 404 (not 403) to avoid info leak"
@@ -384,23 +548,17 @@ class TestAssetsDelete:
         resp = client.delete("/api/assets/1")
         assert resp.status_code in [401, 403], "Should require auth"
     
-    def test_delete_requires_capability(self, client, db, monkeypatch):
+    def test_delete_requires_capability(self, client, db):
         """Asset deletion should require 'assets:manage' capability."""
-        def mock_require_auth():
-            return mock_auth_context(1, 1, ["assets:read"])  # Missing assets:manage
-        
-        monkeypatch.setattr("backend.routes_assets.require_auth_context", lambda: mock_require_auth())
+        as_user(client, 1, 1, ["assets:read"])  # Missing assets:manage
         
         resp = client.delete("/api/assets/1")
         assert resp.status_code == 403, "Should deny without assets:manage capability"
     
-    def test_delete_tenant_isolation(self, client, db, monkeypatch):
+    def test_delete_tenant_isolation(self, client, db):
         """Asset deletion should enforce tenant isolation (404 for other account's assets)."""
         # Account 2 CANNOT delete account 1's asset
-        def mock_require_auth_account_2():
-            return mock_auth_context(2, 2, ["assets:manage"])
-        
-        monkeypatch.setattr("backend.routes_assets.require_auth_context", lambda: mock_require_auth_account_2())
+        as_user(client, 2, 2, ["assets:manage"])
         
         resp = client.delete("/api/assets/1")  # Asset 1 belongs to account 1
         assert resp.status_code == 404, "Should return 404 (not 403) to avoid info leak"
@@ -413,8 +571,212 @@ class TestAssetsDelete:
         conn.close()
         
         assert row is not None, "Asset should not be deleted by wrong account"
+    
+    def test_delete_own_asset(self, client, db):
+        """Deleting an owned asset is a 204; a second delete is a 404."""
+        as_user(client, 1, 1, ["assets:manage", "assets:read"])
+        
+        resp = client.delete("/api/assets/1")
+        assert resp.status_code == 204
+        
+        resp = client.get("/api/assets/1")
+        assert resp.status_code == 404
+        
+        resp = client.delete("/api/assets/1")
+        assert resp.status_code == 404
+
+
+class TestAssetsCursor:
+    """Test suite for the list_assets keyset cursor."""
+    
+    def test_cursor_round_trip(self):
+        """A cursor decodes to the (created_at, id) it was built from."""
+        from backend.routes_assets import _encode_cursor, _decode_cursor
+        
+        cursor = _encode_cursor("2024-01-02T03:04:05.000006Z", 42)
+        assert _decode_cursor(cursor) == ("2024-01-02T03:04:05.000006Z", 42)
+    
+    def test_malformed_cursor_rejected(self):
+        """Malformed cursors should be a 400, not a 500."""
+        from fastapi import HTTPException
+        from backend.routes_assets import _decode_cursor
+        
+        for cursor in ["!!not-base64", "Zm9v", ""]:
+            with pytest.raises(HTTPException) as exc_info:
+                _decode_cursor(cursor)
+            assert exc_info.value.status_code == 400
 
 
+class TestAssetsPaging:
+    """Test suite for paging through the assets list endpoint."""
+    
+    def _create_assets(self, client, count: int) -> list:
+        ids = []
+        for n in range(count):
+            resp = client.post("/api/assets", json={"name": f"Paged Asset {n}"})
+            assert resp.status_code == 200
+            ids.append(int(resp.json()["id"]))
+        return ids
+    
+    def test_cursor_pages_cover_every_asset_once(self, client, db):
+        """Following next_cursor visits every asset once, newest first."""
+        as_user(client, 1, 1, ["assets:manage", "assets:read"])
+        created = self._create_assets(client, 5)
+        
+        seen = []
+        cursor = None
+        pages = 0
+        while True:
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            resp = client.get("/api/assets", params=params)
+            assert resp.status_code == 200
+            data = resp.json()
+            pages += 1
+            seen += [int(i["id"]) for i in data["items"]]
+            assert data["has_more"] == (data["next_cursor"] is not None)
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+        
+        # 5 created + the seeded asset (id 1, the oldest)
+        assert pages == 3
+        assert seen == list(reversed(created)) + [1]
+    
+    def test_last_full_page_has_no_next_cursor(self, client, db):
+        """A page that ends exactly at the last asset reports has_more=False."""
+        as_user(client, 1, 1, ["assets:manage", "assets:read"])
+        self._create_assets(client, 1)
+        
+        resp = client.get("/api/assets", params={"limit": 2})
+        data = resp.json()
+        assert len(data["items"]) == 2
+        assert data["has_more"] is False
+        assert data["next_cursor"] is None
+    
+    def test_cursor_overrides_offset(self, client, db):
+        """With a cursor, offset is ignored."""
+        as_user(client, 1, 1, ["assets:manage", "assets:read"])
+        self._create_assets(client, 3)
+        
+        first = client.get("/api/assets", params={"limit": 2}).json()
+        cursor = first["next_cursor"]
+        
+        with_cursor = client.get("/api/assets", params={"limit": 2, "cursor": cursor}).json()
+        with_both = client.get("/api/assets", params={"limit": 2, "cursor": cursor, "offset": 1}).json()
+        
+        assert with_both["items"] == with_cursor["items"]
+        assert len(with_cursor["items"]) == 2
+        assert not {i["id"] for i in with_cursor["items"]} & {i["id"] for i in first["items"]}
+    
+    def test_cursor_pages_with_search(self, client, db):
+        """Cursor paging keeps the q filter on every page."""
+        as_user(client, 1, 1, ["assets:manage", "assets:read"])
+        created = self._create_assets(client, 3)
+        
+        first = client.get("/api/assets", params={"q": "paged", "limit": 2}).json()
+        second = client.get("/api/assets", params={"q": "paged", "limit": 2, "cursor": first["next_cursor"]}).json()
+        
+        assert [int(i["id"]) for i in first["items"] + second["items"]] == list(reversed(created))
+        assert second["has_more"] is False
+
+
+class TestAssetsTimestamps:
+    """Test suite for asset timestamp formatting."""
+    
+    def test_utc_now_iso_format(self):
+        """Timestamps are UTC ISO-8601 with six fraction digits and a Z suffix."""
+        import re
+        from datetime import datetime, timedelta
+        from backend.routes_assets import _utc_now_iso
+        
+        before = datetime.utcnow() - timedelta(seconds=1)
+        stamp = _utc_now_iso()
+        after = datetime.utcnow() + timedelta(seconds=1)
+        
+        assert re.fullmatch(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{6}Z", stamp)
+        assert before <= datetime.fromisoformat(stamp[:-1]) <= after
+
+
+class TestPropertyFtsTriggers:
+    """Test suite for keeping property_fts in sync with property_index."""
+    
+    def _fts_keys(self):
+        conn = get_db()
+        fts = conn.execute("SELECT rowid, account_id, property_id FROM property_fts ORDER BY rowid").fetchall()
+        mapped = conn.execute("SELECT fts_rowid, account_id, property_id FROM property_fts_rowid ORDER BY fts_rowid").fetchall()
+        conn.close()
+        return [tuple(r) for r in fts], [tuple(r) for r in mapped]
+    
+    def test_update_and_delete_follow_the_rowid_map(self, client, db):
+        """Each property has one FTS row, found through property_fts_rowid."""
+        conn = get_db()
+        conn.execute("UPDATE property_index SET display_address = '9 Cherry Ln, Macon, GA 31201' WHERE account_id = 1 AND id = 1")
+        conn.execute("DELETE FROM property_index WHERE account_id = 1 AND id = 2")
+        conn.commit()
+        conn.close()
+        
+        fts, mapped = self._fts_keys()
+        assert fts == mapped
+        assert sorted((a, p) for _, a, p in fts) == [(1, 1), (2, 1)]
+        
+        as_user(client, 1, 1, ["property_search:read"])
+        results = client.post("/api/property-search", json={"query": "cherry", "limit": 25}).json()["results"]
+        assert [r["source_ref"] for r in results] == ["1"]
+        results = client.post("/api/property-search", json={"query": "oak ave", "limit": 25}).json()["results"]
+        assert results == []
+        results = client.post("/api/property-search", json={"query": "main st", "limit": 25}).json()["results"]
+        assert results == []
+        
+        # Same id in another tenant is untouched
+        as_user(client, 2, 2, ["property_search:read"])
+        results = client.post("/api/property-search", json={"query": "pine", "limit": 25}).json()["results"]
+        assert [r["source_ref"] for r in results] == ["1"]
+
+
+class TestNocaseRebuild:
+    """Test suite for the migration's COLLATE NOCASE table rebuild."""
+
+    def test_rebuild_keeps_autoincrement_sequence(self):
+        """Ids of deleted rows are not handed out again after the rebuild."""
+        from backend.migrate_property_search_assets import _ensure_nocase_columns
+
+        conn = sqlite3.connect(":memory:")
+        cur = conn.cursor()
+        cur.execute("CREATE TABLE assets (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT)")
+        cur.executemany("INSERT INTO assets (name) VALUES (?)", [("a",), ("b",), ("c",)])
+        cur.execute("DELETE FROM assets WHERE id = 3")
+
+        _ensure_nocase_columns(cur, "assets", ("name",))
+        cur.execute("INSERT INTO assets (name) VALUES ('d')")
+
+        assert cur.lastrowid == 4
+        cur.execute("SELECT sql FROM sqlite_master WHERE name = 'assets'")
+        assert "COLLATE NOCASE" in cur.fetchone()[0]
+        conn.close()
+
+
+class TestCompressScenarioMetrics:
+    """Test suite for the migration's metrics_blob backfill."""
+
+    def test_backfill_keeps_metrics_json(self):
+        """metrics_blob is filled from metrics_json, which is left as it was."""
+        from backend import json_codec
+        from backend.migrate_property_search_assets import _compress_scenario_metrics
+
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE scenarios (id INTEGER PRIMARY KEY, metrics_json TEXT NOT NULL, metrics_blob BLOB)")
+        conn.execute("""INSERT INTO scenarios (metrics_json) VALUES ('{"irr": 0.12}')""")
+        conn.commit()
+
+        _compress_scenario_metrics(conn)
+
+        metrics_json, metrics_blob = conn.execute("SELECT metrics_json, metrics_blob FROM scenarios").fetchone()
+        assert metrics_json == '{"irr": 0.12}'
+        assert json_codec.loads_compressed(metrics_blob) == {"irr": 0.12}
+        conn.close()
+
 # ========================================================================
 # RUN TESTS
 # ========================================================================
@@ -205,6 +205,19 @@ def test_entitlements_read_only_active_pro(test_db):
     assert Capability.EXPORT_CSV not in caps  # Read-only can't export
 
 
+def test_entitlements_cached_and_immutable(test_db):
+    """Test that repeated lookups share one frozen capability set."""
+    sub = get_subscription(test_db, account_id=1)
+    caps = get_entitlements(role="owner", subscription=sub)
+
+    assert isinstance(caps, frozenset)
+    assert get_entitlements(role="owner", subscription=sub) is caps
+
+    # A status change must select a different cached entry, not reuse the pro one
+    sub.status = "past_due"
+    assert Capability.EXPORT_CSV not in get_entitlements(role="owner", subscription=sub)
+
+
 # ============================================================================
 # Test: Entitlements with Past Due Subscription
 # ============================================================================
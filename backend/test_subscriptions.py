@@ -0,0 +1,131 @@
+"""
+backend/test_subscriptions.py
+
+Subscription system scenarios (formerly the manual_test_subscriptions script).
+Each test gets its own fresh in-memory database, so tests are independent
+and safe to run in parallel.
+
+Run: pytest backend/test_subscriptions.py -v
+"""
+
+import sqlite3
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+# Add backend to path
+backend_path = Path(__file__).parent
+sys.path.insert(0, str(backend_path))
+
+from entitlements import (
+    get_subscription,
+    get_effective_plan,
+    get_entitlements,
+    update_subscription_status,
+    update_subscription_plan,
+)
+from authz import Capability
+
+
+def _build_template() -> sqlite3.Connection:
+    """Build the schema + seed data once; each test gets a page-level copy."""
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    cur = conn.cursor()
+    
+    # Create tables
+    cur.execute("""
+        CREATE TABLE accounts (
+            id INTEGER PRIMARY KEY,
+            name TEXT,
+            plan TEXT DEFAULT 'free'
+        )
+    """)
+    
+    cur.execute("""
+        CREATE TABLE subscriptions (
+            id INTEGER PRIMARY KEY,
+            account_id INTEGER UNIQUE NOT NULL,
+            status TEXT DEFAULT 'active',
+            plan_name TEXT DEFAULT 'free',
+            provider TEXT DEFAULT 'manual',
+            provider_customer_id TEXT,
+            provider_subscription_id TEXT,
+            current_period_end TEXT,
+            cancel_at_period_end INTEGER DEFAULT 0,
+            created_at TEXT,
+            updated_at TEXT
+        )
+    """)
+    
+    # Insert test data
+    cur.execute("INSERT INTO accounts (id, name, plan) VALUES (1, 'Test Account', 'pro')")
+    now = datetime.now(timezone.utc)
+    cur.execute(
+        """
+        INSERT INTO subscriptions (
+            account_id, status, plan_name, provider, 
+            current_period_end, created_at
+        ) VALUES (1, 'active', 'pro', 'manual', ?, ?)
+        """,
+        ((now + timedelta(days=30)).isoformat(), now.isoformat())
+    )
+    
+    conn.commit()
+    return conn
+
+
+_TEMPLATE = _build_template()
+
+
+@pytest.fixture
+def conn():
+    """Fresh test database with one account on an active pro subscription."""
+    # Autocommit: the update helpers' commit() calls become no-ops
+    conn = sqlite3.connect(":memory:", isolation_level=None)
+    _TEMPLATE.backup(conn)
+    conn.row_factory = sqlite3.Row
+    yield conn
+    conn.close()
+
+
+# (role, status, plan, expected effective plan, must have, must not have)
+CASES = [
+    ("owner", "active", "pro", "pro", {Capability.EXPORT_CSV}, set()),
+    ("owner", "past_due", "pro", "free", {Capability.PROJECT_VIEW}, {Capability.EXPORT_CSV}),
+    ("member", "canceled", "pro", "free", set(), {Capability.EXPORT_CSV}),
+    ("read_only", "active", "pro", "pro", {Capability.PROJECT_VIEW},
+     {Capability.ASSET_MANAGE, Capability.EXPORT_CSV}),
+    ("owner", "trialing", "pro", "pro", {Capability.EXPORT_CSV}, set()),
+    ("owner", "active", "free", "free", set(), {Capability.EXPORT_CSV}),
+]
+
+
+@pytest.mark.parametrize(
+    "role, status, plan, effective, must_have, must_not_have",
+    CASES,
+    ids=[f"{role}-{status}-{plan}" for role, status, plan, *_ in CASES],
+)
+def test_entitlements(conn, role, status, plan, effective, must_have, must_not_have):
+    """Effective plan and capabilities for each (role, status, plan) combination."""
+    update_subscription_plan(conn, account_id=1, plan_name=plan)
+    update_subscription_status(conn, account_id=1, status=status)
+    
+    sub = get_subscription(conn, account_id=1)
+    caps = get_entitlements(role, sub)
+    
+    assert sub.plan_name == plan, "Status changes must not touch the subscribed plan"
+    assert get_effective_plan(sub) == effective
+    assert must_have <= caps
+    assert not (must_not_have & caps)
+
+
+def test_plan_update_reactivates(conn):
+    """Changing plan sets the subscription back to active."""
+    update_subscription_status(conn, account_id=1, status="past_due")
+    update_subscription_plan(conn, account_id=1, plan_name="pro")
+    
+    sub = get_subscription(conn, account_id=1)
+    
+    assert sub.status == "active", "Upgrade should set status to active"